@@ -1,39 +1,11 @@
 """
-CCB Dataset Transformer 설정 파일 (EXAONE 전용)
-- 모델 경로 및 출력 디렉토리 설정
+CCB Dataset Transformer 설정 파일 (A.X 4.0 API 전용)
+- 출력 디렉토리 설정
 - 메모리 임계값 및 시스템 설정
 """
 
 from pathlib import Path
 
-# === 모델 설정 ===
-# MLX 모델 사용 (EXAONE-4.0-32B)
-MODEL_REPO = "lmstudio-community/EXAONE-4.0-32B-MLX-4bit"
-MODEL_CACHE_DIR = Path.home() / ".cache" / "huggingface" / "hub"  # HuggingFace 표준 캐시
-
-# MLX 모델로 로드
-MODEL_TYPE = "MLX"  # MLX 모델 사용
-MODEL_NAME = "lmstudio-community/EXAONE-4.0-32B-MLX-4bit"
-
-# 사용 가능한 모델 버전 (MLX 단일 모델)
-AVAILABLE_MODELS = {
-    "mlx": MODEL_NAME,
-    "auto": MODEL_NAME,
-}
-
-# === 모델 다운로드 설정 ===
-AUTO_DOWNLOAD_MODEL = True
-# MLX 모델 사용
-DEFAULT_MODEL_VARIANT = "mlx" 
-
-# --- 내부 사용 ---
-# MLX 모델은 모델명으로 직접 로드
-_model_variant = DEFAULT_MODEL_VARIANT if DEFAULT_MODEL_VARIANT in AVAILABLE_MODELS else "auto"
-SELECTED_MODEL_NAME = AVAILABLE_MODELS[_model_variant]
-
-# --- 호환성을 위한 기존 변수 유지 ---
-MODEL_PATHS = {"exaone": SELECTED_MODEL_NAME}
-
 # === 출력 디렉토리 설정 ===
 FINAL_OUTPUT_DIR = Path("final_output").resolve()
 DATA_DIR = Path("data").resolve()
@@ -50,31 +22,194 @@ MEMORY_CRITICAL_THRESHOLD = MEMORY_CRITICAL_THRESHOLD_GB
 MEMORY_WARNING_THRESHOLD  = MEMORY_WARNING_THRESHOLD_GB
 MEMORY_SAFE_THRESHOLD     = MEMORY_SAFE_THRESHOLD_GB
 
-# MLX 메모리 설정
-MLX_MAX_MEMORY_GB = 20
-MLX_CONTEXT_LENGTH = 4096
-
-# === 생성 속도 최적화 설정 ===
-# 토큰 수 제한 (80개 Q&A 생성을 위해 충분한 크기로 증가)
-FAST_MAX_TOKENS = 12288     # 빠른 생성용 (80개 Q&A를 위해 대폭 증가)
-NORMAL_MAX_TOKENS = 16384   # 일반 생성용 (더 여유있게)
-
-# 빠른 생성을 위한 샘플링 설정
-FAST_TEMPERATURE = 0.6      # 약간 올려서 다양성 확보 (기본: 0.7)
-FAST_TOP_P = 0.85          # 약간 올려서 완전성 확보 (기본: 0.9)
+# === 생성 프로필 설정 ===
+# 배치 계획/동시성/토큰 크기/샘플링/타임아웃/재시도 정책은 profiles/<이름>.json에서 정의 (--gen-profile)
+GENERATION_PROFILES_DIR = Path("profiles").resolve()
+DEFAULT_GENERATION_PROFILE = "fast"   # --fast / --precise는 fast / precise 프로필 선택
+REQUEST_TIMEOUT_SECONDS = 60.0        # 프로필에 request_timeout이 없을 때 API 요청 타임아웃 (초)
 
 # === 처리 설정 ===
 # 파일 대기 시간 (초)
 FILE_WAIT_TIMEOUT = 300   # 5분
 FILE_CHECK_INTERVAL = 5   # 5초 간격
 
-# 모델 처리 재시도 횟수
+# 감시 모드 (--watch) 설정
+WATCH_POLL_INTERVAL = 2.0      # data 디렉토리 스캔 간격 (초)
+WATCH_DEBOUNCE_SECONDS = 2.0   # mtime/size가 이 시간 동안 변하지 않으면 쓰기 완료로 판단
+
+# === 단계별 파이프라인 설정 ===
+# ingest → normalize → prompt → generate → parse → validate → persist
+PIPELINE_ENABLED = True
+PIPELINE_STAGE_WORKERS = {   # 단계별 작업자 수
+    "ingest": 1,
+    "normalize": 2,
+    "prompt": 2,
+    "generate": 4,           # 동시 API 요청 수
+    "parse": 2,
+    "validate": 1,
+    "persist": 1,
+}
+PIPELINE_QUEUE_SIZES = {     # 단계별 입력 큐 크기 (가득 차면 이전 단계 대기)
+    "ingest": 16,
+    "normalize": 64,
+    "prompt": 8,
+    "generate": 32,
+    "parse": 32,
+    "validate": 32,
+    "persist": 16,
+}
+PIPELINE_MIN_REQUEST_INTERVAL = 0.5  # API 요청 시작 간 최소 간격 (초)
+PIPELINE_MONITOR_INTERVAL = 10.0     # 큐 깊이 로그 간격 (초, 0이면 끔)
+
+# 자원 감시 / 동시성 조절 (MEMORY_*_THRESHOLD_GB 기준)
+# critical이면 최소로, warning이면 한 단계씩 줄이고, safe이고 CPU 여유가 있으면 밀린 단계부터 늘림
+RESOURCE_MONITOR_ENABLED = True
+RESOURCE_MONITOR_INTERVAL = 2.0      # 메모리/CPU 샘플링 간격 (초)
+RESOURCE_CPU_HIGH_PERCENT = 90.0     # CPU 사용률이 이 이상이면 동시성을 늘리지 않음
+GOVERNOR_STAGE_LIMITS = {            # 조절 대상 단계 → (최소, 최대) 작업자 수 (시작 값은 PIPELINE_STAGE_WORKERS)
+    "normalize": (1, 4),
+    "prompt": (1, 4),
+    "generate": (1, 8),
+    "parse": (1, 4),
+}
+GOVERNOR_QUEUE_SCALE = (0.25, 2.0)   # PIPELINE_QUEUE_SIZES 대비 (최소, 최대) 큐 크기 배율
+
+# 파싱/검증 프로세스 풀 (동시 요청이 많을 때 CPU 코어 수 정도로 설정, 0이면 사용 안 함 - parse 단계 작업자 수도 이 값 이상으로 맞춤)
+PARSE_POOL_WORKERS = 0
+PARSE_DEBUG_OUTPUT = True   # 파싱 디버그 출력/미리보기 (프로세스 풀 사용 시 항상 끔)
+
+# === 공유 작업 큐 (--queue, 여러 호스트 분산 처리) ===
+JOB_QUEUE_LEASE_SECONDS = 600       # 작업 임대 시간 (하트비트가 없으면 만료 후 다른 노드가 가져감)
+JOB_QUEUE_HEARTBEAT_INTERVAL = 60   # 임대 연장 간격 (초, 임대 시간보다 충분히 짧게)
+JOB_QUEUE_MAX_ATTEMPTS = 3          # 작품별 최대 임대 횟수 (초과 시 failed)
+JOB_QUEUE_MAX_LEASED = 4            # 노드당 동시에 보유할 작품 수
+JOB_QUEUE_POLL_INTERVAL = 5.0       # 빈 큐 재확인 간격 (초)
+
+# === 회로 차단기 (A.X 엔드포인트 장애 시 전체 일시 중지) ===
+CIRCUIT_WINDOW_SECONDS = 60.0       # 오류율 계산 구간 (초)
+CIRCUIT_MIN_REQUESTS = 4            # 오류율 판단에 필요한 최소 요청 수
+CIRCUIT_ERROR_RATE = 0.5            # 이 비율 이상 실패하면 open
+CIRCUIT_CONSECUTIVE_FAILURES = 3    # 연속 실패 횟수 기준 open
+CIRCUIT_OPEN_SECONDS = 30.0         # open 후 시험 요청까지 대기 (시험 실패 시 두 배)
+CIRCUIT_MAX_OPEN_SECONDS = 300.0    # 최대 대기 시간
+
+# === 헤지 요청 (느린 응답의 꼬리 지연 단축) ===
+# 요청이 최근 지연 시간의 백분위를 넘기면 같은 요청을 한 번 더 보내고 먼저 온 응답 사용
+# (대체 엔드포인트: 환경 변수 AX4_HEDGE_BASE_URL / AX4_HEDGE_API_KEY)
+HEDGE_ENABLED = False
+HEDGE_PERCENTILE = 95.0         # 이 백분위 지연을 넘기면 헤지 요청 전송
+HEDGE_MIN_SAMPLES = 20          # 백분위 계산에 필요한 최소 표본 수 (부족하면 헤지 없음)
+HEDGE_LATENCY_WINDOW = 200      # 최근 지연 시간 표본 수
+HEDGE_BUDGET_RATIO = 0.05       # 전체 요청 대비 헤지 요청 상한 (추가 비용 제한)
+HEDGE_BUDGET_BURST = 2          # 요청 수가 적을 때 허용하는 여유 헤지 수
+STREAM_INCLUDE_USAGE = True     # 스트리밍 요청의 마지막 청크로 usage 받기 (stream_options 미지원 엔드포인트는 False - 토큰 수 추정)
+
+# === 다중 응답 요청 (--multi-choice) ===
+# 같은 프롬프트를 반복하는 관점 배치(관람객 1~3차, 큐레이터 작품 1~3차 등)를 응답 n개(choices) 요청 하나로 받아
+# 입력 토큰 처리와 왕복 수를 줄임 - 엔드포인트가 n을 거부하거나 무시하면 실행 중 배치별 개별 요청으로 전환
+MULTI_CHOICE_ENABLED = False
+MULTI_CHOICE_MAX_N = 3          # 요청 하나에 받을 최대 응답 수 (같은 관점/크기의 연속 배치만 묶음)
+
+# 작품 처리 최대 시도 횟수 (작품 전체 재생성 포함, 재시도 예산 안에서만)
 MAX_MODEL_ATTEMPTS = 3
 
+# === 재시도 정책 (요청/배치/작품 재시도가 같은 예산을 사용) ===
+# 작품당 최악의 요청 수 = 배치 수(8) + RETRY_ARTWORK_BUDGET
+RETRY_MAX_REQUEST_ATTEMPTS = 3   # 같은 요청의 최대 시도 횟수 (타임아웃/429/5xx)
+RETRY_ARTWORK_BUDGET = 8         # 작품당 재시도 요청 수 (작품 전체 재생성은 배치 수만큼 사용)
+RETRY_RUN_BUDGET = 500           # 실행 전체 재시도 요청 수
+RETRY_BASE_DELAY = 2.0           # 지수 백오프 기준 (초, 지터 포함)
+RETRY_MAX_DELAY = 30.0           # 백오프 상한 (초)
+
+# === 실행 예산 (--time-budget / --request-budget / --token-budget) ===
+# 설정하면 부족분이 큰 작품부터 처리하고, 남은 예산으로 끝낼 수 없는 작품은 시작하지 않음
+RUN_TIME_BUDGET_SECONDS = None      # 실행 시간 상한 (초, None이면 제한 없음)
+RUN_REQUEST_BUDGET = None           # API 요청 수 상한 (재시도 포함)
+RUN_TOKEN_BUDGET = None             # 토큰 수 상한 (입력+출력, usage가 없으면 문자 수로 추정)
+RUN_ARTWORK_TOKEN_ESTIMATE = 30000  # 실제 사용량이 쌓이기 전 작품당 예상 토큰 수
+RUN_CHECKPOINT_PATH = FINAL_OUTPUT_DIR / ".run_checkpoint.json"   # 예산 실행 종료 상태 기록
+
+# === 토큰 사용량 / 비용 집계 ===
+# 요청별 response.usage를 배치/작품/관점/모드/실행 단위로 합산하여 실행 종료 시 보고서로 저장
+USAGE_COST_PER_1K_PROMPT_TOKENS = 0.0       # 입력 1천 토큰당 단가 (0이면 비용 미표시)
+USAGE_COST_PER_1K_COMPLETION_TOKENS = 0.0   # 출력 1천 토큰당 단가
+USAGE_COST_CURRENCY = "KRW"
+USAGE_REPORT_DIR = FINAL_OUTPUT_DIR / "reports"   # 실행별 사용량 보고서 (usage_<시작 시각>.json)
+USAGE_IN_OUTPUT_METADATA = False            # 작품별 사용량을 매니페스트 항목에도 기록
+
+# === 지표 / 로그 ===
+# 요청 지연, 첫 토큰 시간, 재시도, 파싱 단계, 호출당 항목 수, 검증 탈락, 큐 깊이
+METRICS_TEXTFILE_PATH = None                       # Prometheus textfile 경로 (node_exporter textfile 디렉토리, None이면 끔)
+METRICS_JSON_PATH = USAGE_REPORT_DIR / "metrics.json"   # JSON 지표 (None이면 끔)
+METRICS_EXPORT_INTERVAL = 15.0                     # 실행 중 지표 파일 갱신 간격 (초, 0이면 종료 시에만)
+LOG_FORMAT = "text"     # text / json (한 줄에 하나의 JSON 객체)
+LOG_LEVEL = "INFO"      # DEBUG면 요청 시도/프롬프트 길이 등 상세 로그 출력
+
+# === 프로파일링 (--profile) ===
+PROFILE_DIR = USAGE_REPORT_DIR / "profiles"   # 실행별 프로파일 보고서 (생성 프로필 정의 디렉토리와 분리)
+PROFILE_SAMPLE_INTERVAL = 0.05   # 스택 샘플링 간격 (초, 0이면 끔)
+PROFILE_TOP_N = 30               # 보고서 순위 항목 수
+
+# === 드라이런 (--dry-run) ===
+# API 호출 없이 남은 작품의 프롬프트를 렌더링하고 요청 수/토큰/소요 시간을 추정
+DRY_RUN_DIR = FINAL_OUTPUT_DIR.parent / "dry_run"   # 실행별 계획 (dry_run/<시각>/plan.json + prompts/)
+DRY_RUN_DEFAULT_LATENCY_SECONDS = 30.0       # 지표 기록(METRICS_JSON_PATH)이 없을 때 요청당 예상 지연 (초)
+DRY_RUN_COMPLETION_TOKENS_PER_ITEM = 150     # 사용량 보고서가 없을 때 Q&A 1개당 예상 출력 토큰
+
 # 파싱 결과 검증 설정
 MIN_PARSED_QA_COUNT = 30  # 최소 파싱된 Q&A 개수
 MAX_REGENERATION_ATTEMPTS = 2  # 최대 재생성 시도 횟수
 
+# Q&A 규칙 검증 (utils/qna_rules.py) - 프롬프트의 필수 규칙을 항목별로 확인
+QNA_MIN_INSTRUCTION_CHARS = 5      # 질문 최소 길이
+QNA_MAX_INSTRUCTION_CHARS = 300    # 질문 최대 길이
+QNA_MIN_OUTPUT_CHARS = 10          # 답변 최소 길이
+QNA_MAX_OUTPUT_CHARS = 1500        # 답변 최대 길이
+QNA_TITLE_REQUIRED_PERSPECTIVES = ("visitor", "curator_artwork")   # 작품명까지 필요한 관점 (작가 관점은 작가명만)
+
+# 규칙 위반 항목 수정 요청 (작품마다 한 번, 위반 항목만 모아 prompts/repair_items.md로 요청)
+REPAIR_ENABLED = True
+REPAIR_MAX_ITEMS = 20              # 한 번에 수정 요청할 최대 항목 수
+REPAIR_MAX_TOKENS_PER_ITEM = 400   # 수정 요청 max_tokens = 항목 수 x 이 값
+REPAIR_TEMPERATURE = 0.3           # 내용을 유지하도록 낮게
+
+# 관점별 목표 Q&A 개수 (총 80개 = 30+30+20)
+PERSPECTIVE_QUOTAS = {
+    "visitor": 30,           # 일반 관람객 관점
+    "curator_artwork": 30,   # 큐레이터 작품 관점
+    "curator_artist": 20,    # 큐레이터 작가 관점
+}
+TARGET_QA_COUNT = sum(PERSPECTIVE_QUOTAS.values())
+
+# === Q&A 저장소 (SQLite) 설정 ===
+# 활성화 시 검증된 Q&A를 인덱스된 SQLite DB에도 기록 (상태 조회/이어서 생성/내보내기용)
+QA_STORE_ENABLED = False
+QA_STORE_PATH = FINAL_OUTPUT_DIR / "qa_store.sqlite3"
+
+# === 증분 재생성 설정 ===
+# 작품별 입력 지문/출력 파일/상태 기록 (변경된 작품만 재생성)
+OUTPUT_MANIFEST_PATH = FINAL_OUTPUT_DIR / ".manifest.json"
+
+# === 격리 목록 설정 ===
+# 같은 입력으로 반복 실패하는 작품은 다음 실행부터 건너뜀 (--retry-quarantined로 재시도)
+QUARANTINE_PATH = FINAL_OUTPUT_DIR / ".quarantine.json"
+QUARANTINE_AFTER_FAILURES = 2      # 같은 입력 지문으로 이 횟수만큼 실패하면 격리
+QUARANTINE_MAX_RAW_CHARS = 4000    # 기록할 마지막 원본 응답 최대 길이
+LONG_TEXT_WARNING_CHARS = 3000     # 작가노트/작품설명이 이보다 길면 입력 경고로 기록
+
+# === 작품 개념 요약 (긴 작품 설명/작가노트) ===
+# 작품 설명 + 작가노트가 CONCEPT_MAX_CHARS보다 길면 핵심 문장만 추출(API 호출 없음)하여 모든 배치 프롬프트에 사용
+# (원문 해시별로 캐시 - 작품마다 한 번만 계산)
+CONCEPT_CONDENSE_ENABLED = True
+CONCEPT_MAX_CHARS = 800            # 프롬프트의 '작품 개념' 최대 글자 수
+CONCEPT_CACHE_SIZE = 512           # 요약 결과 캐시 항목 수 (오래된 것부터 제거)
+
+# === 작가 관점 Q&A 캐시 ===
+# 큐레이터 작가 관점 Q&A는 작가 정보만 사용하므로 작가별로 한 번 생성해 같은 작가의 다른 작품에 재사용
+# (작가명/영문명/국적/출생/전시/수상 중 하나라도 바뀌면 다시 생성)
+ARTIST_QA_CACHE_ENABLED = True
+ARTIST_QA_CACHE_PATH = FINAL_OUTPUT_DIR / ".artist_qa_cache.json"
+
 # === 환경변수 설정 ===
 MEMORY_OPTIMIZATION_ENV = {
     "TOKENIZERS_PARALLELISM": "false",
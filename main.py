@@ -3,12 +3,114 @@
 CCB Dataset Transformer - A.X 4.0 API 전용 메인 실행기
 - A.X 4.0 API 기반 Q&A 생성
 - 기존 EXAONE MLX와 동일한 인터페이스
-- 고속 모드/정밀 모드 선택 가능
+- 생성 프로필 선택 가능 (profiles/*.json, --fast/--precise는 fast/precise 프로필)
 """
 
 import sys
 import argparse
-from processors.ax4_processor import AX4Processor
+from pathlib import Path
+from utils.run_budget import parse_duration
+from utils.logger import configure_logging
+from utils.profiler import RunProfiler, start_profiler, stop_profiler
+from utils.generation_profile import resolve_profile, parse_perspective_profile
+
+PROFILE_MODES = ("cprofile", "memory")
+
+
+def parse_profile_modes(value: str) -> set:
+    """--profile 값 파싱 (쉼표로 구분한 cprofile / memory, 빈 값이면 구간 타이머와 스택 샘플링만)"""
+    modes = {m.strip().lower() for m in value.split(",") if m.strip()}
+    unknown = modes - set(PROFILE_MODES)
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"알 수 없는 프로파일 모드: {', '.join(sorted(unknown))} (사용 가능: {', '.join(PROFILE_MODES)})"
+        )
+    return modes
+
+
+def _open_store():
+    """기존 Q&A 저장소 열기 (없으면 None)"""
+    from config import QA_STORE_PATH
+    from utils.qa_store import QAStore
+    
+    if not QA_STORE_PATH.exists():
+        print(f"❌ Q&A 저장소가 없습니다: {QA_STORE_PATH}")
+        print("   --use-store 옵션으로 생성을 먼저 실행하세요.")
+        return None
+    return QAStore(QA_STORE_PATH)
+
+
+def show_store_status() -> int:
+    """저장소 기반 진행 상황 출력"""
+    from config import PERSPECTIVE_QUOTAS
+    
+    store = _open_store()
+    if store is None:
+        return 1
+    
+    summary = store.status_summary()
+    print(f"🗄️ 작품 수: {summary['artworks']}개 / Q&A: {summary['qa_items']}개")
+    for perspective, count in sorted(summary["by_perspective"].items()):
+        print(f"   - {perspective}: {count}개")
+    
+    below = store.artworks_below_quota(PERSPECTIVE_QUOTAS)
+    print(f"⚠️ 목표 미달 작품: {len(below)}개")
+    for entry in below:
+        deficits = ", ".join(f"{p} -{n}" for p, n in entry["deficits"].items())
+        print(f"   - {entry['artist']} - {entry['title']} ({deficits})")
+    
+    store.close()
+    return 0
+
+
+def export_store(target: str) -> int:
+    """저장소의 Q&A 내보내기 (JSONL 파일 또는 작품별 JSON 디렉토리)"""
+    from utils.file_processor import create_jsonl_output
+    
+    store = _open_store()
+    if store is None:
+        return 1
+    
+    target_path = Path(target)
+    if target_path.suffix == ".jsonl":
+        ok = create_jsonl_output(list(store.iter_export()), target_path)
+    else:
+        written = store.export_json_files(target_path)
+        print(f"✅ 작품별 JSON {written}개 내보내기 완료: {target_path}")
+        ok = written > 0
+    
+    store.close()
+    return 0 if ok else 1
+
+
+def show_quarantine() -> int:
+    """격리된 작품 목록 출력"""
+    from config import QUARANTINE_PATH, QUARANTINE_AFTER_FAILURES
+    from utils.quarantine import Quarantine
+    
+    entries = Quarantine(QUARANTINE_PATH, QUARANTINE_AFTER_FAILURES).list_entries()
+    print(f"🚫 격리된 작품: {len(entries)}개 ({QUARANTINE_PATH})")
+    for entry in entries:
+        counts = ", ".join(f"{kind} {n}회" for kind, n in entry["failure_counts"].items())
+        print(f"   - {entry['artist']} - {entry['title']} [{entry['failure_class']}] {counts} "
+              f"(마지막 {entry['last_failed_at']}, {entry.get('mode')} 모드)")
+        for warning in entry.get("input_warnings", []):
+            print(f"       ⚠️ {warning}")
+    if entries:
+        print("   재시도: python main.py --retry-quarantined --precise")
+    return 0
+
+
+def run_dry_run(processor) -> int:
+    """API 호출 없이 남은 작품의 프롬프트 렌더링 + 요청 수/토큰/소요 시간 추정"""
+    import time
+    from config import DRY_RUN_DIR
+    from processors.dry_run_planner import DryRunPlanner
+    
+    planner = DryRunPlanner(processor, DRY_RUN_DIR / time.strftime("%Y%m%dT%H%M%S"))
+    plan = planner.plan()
+    planner.print_summary(plan)
+    return 0
 
 
 def main():
@@ -23,36 +125,178 @@ def main():
   python main.py                    # 기본 고속 모드
   python main.py --fast             # 고속 모드 (빠른 생성)
   python main.py --precise          # 정밀 모드 (높은 품질)
+  python main.py --gen-profile precise --perspective-profile visitor=fast   # 관점별로 다른 프로필 설정 사용
+  python main.py --watch            # data/ 신규 파일을 계속 감시하며 처리
+  python main.py --queue /mnt/shared/jobs.sqlite3   # 여러 호스트가 공유 작업 큐로 분산 처리
+  python main.py --use-store        # SQLite Q&A 저장소에도 기록
+  python main.py --multi-choice     # 같은 관점 배치를 응답 n개 요청 하나로 (입력 토큰/왕복 절감)
+  python main.py --status           # 저장소 기반 진행 상황 조회
+  python main.py --export all.jsonl # 저장소의 Q&A를 JSONL로 내보내기
+  python main.py --list-quarantined # 반복 실패로 격리된 작품 조회
+  python main.py --retry-quarantined --precise   # 격리된 작품만 다른 모드로 재시도
+  python main.py --time-budget 2h --token-budget 5000000   # 예산 안에서 부족분이 큰 작품부터 처리
+  python main.py --dry-run --precise   # API 호출 없이 프롬프트 렌더링 + 요청 수/토큰/시간 추정
+  python main.py --log-format json --metrics-textfile /var/lib/node_exporter/ax4.prom
 """
     )
     
     mode_group = parser.add_mutually_exclusive_group()
     mode_group.add_argument(
         '--fast', action='store_true',
-        help='고속 모드 (기본값): 빠른 생성'
+        help='고속 모드 (기본값): fast 프로필'
     )
     mode_group.add_argument(
         '--precise', action='store_true',
-        help='정밀 모드: 높은 품질'
+        help='정밀 모드: precise 프로필'
+    )
+    mode_group.add_argument(
+        '--gen-profile', metavar='NAME',
+        help='생성 프로필 이름 (config.GENERATION_PROFILES_DIR/NAME.json - 배치 계획/동시성/토큰/샘플링/타임아웃/재시도)'
+    )
+    parser.add_argument(
+        '--perspective-profile', metavar='PERSPECTIVE=NAME', action='append', default=[],
+        help='관점별 토큰 크기/샘플링을 다른 프로필에서 사용 (visitor/curator_artwork/curator_artist, 반복 지정 가능)'
+    )
+    
+    parser.add_argument(
+        '--use-store', action='store_true',
+        help='검증된 Q&A를 SQLite 저장소에도 기록 (config.QA_STORE_ENABLED와 동일)'
+    )
+    parser.add_argument(
+        '--multi-choice', action='store_true',
+        help='같은 관점의 반복 배치를 응답 n개 요청 하나로 생성 (config.MULTI_CHOICE_ENABLED와 동일, n 미지원 시 자동 전환)'
+    )
+    parser.add_argument(
+        '--retry-quarantined', action='store_true',
+        help='격리된 작품만 다시 시도 (--precise/--fast와 함께 사용, 기본: 격리된 작품은 건너뜀)'
+    )
+    
+    command_group = parser.add_mutually_exclusive_group()
+    command_group.add_argument(
+        '--watch', action='store_true',
+        help='감시 모드: data/의 신규·수정 파일을 계속 감지하여 처리 (Ctrl+C로 종료)'
+    )
+    command_group.add_argument(
+        '--queue', metavar='PATH',
+        help='공유 작업 큐 모드: 공유 파일시스템의 큐 DB에서 작품을 임대하여 처리 (호스트마다 실행)'
+    )
+    command_group.add_argument(
+        '--status', action='store_true',
+        help='저장소 기준 관점별 Q&A 수와 목표 미달 작품 출력 후 종료'
+    )
+    command_group.add_argument(
+        '--export', metavar='PATH',
+        help='저장소의 Q&A를 JSONL(.jsonl) 또는 작품별 JSON 디렉토리로 내보낸 후 종료'
+    )
+    command_group.add_argument(
+        '--list-quarantined', action='store_true',
+        help='반복 실패로 격리된 작품과 실패 유형 출력 후 종료'
+    )
+    command_group.add_argument(
+        '--dry-run', action='store_true',
+        help='API 호출 없이 남은 작품의 프롬프트를 config.DRY_RUN_DIR에 렌더링하고 요청 수/토큰/소요 시간 추정 후 종료'
+    )
+    
+    parser.add_argument(
+        '--time-budget', metavar='DURATION', type=parse_duration,
+        help='실행 시간 예산 (예: 3600, 90m, 2h, 1h30m) - 끝낼 수 없는 작품은 시작하지 않음'
+    )
+    parser.add_argument(
+        '--request-budget', metavar='N', type=int,
+        help='API 요청 수 예산 (재시도 포함)'
+    )
+    parser.add_argument(
+        '--token-budget', metavar='N', type=int,
+        help='토큰 수 예산 (입력+출력)'
+    )
+    
+    parser.add_argument(
+        '--log-format', choices=['text', 'json'],
+        help='로그 형식 (기본: config.LOG_FORMAT) - json은 한 줄에 하나의 JSON 객체'
+    )
+    parser.add_argument(
+        '--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], type=str.upper,
+        help='로그 레벨 (기본: config.LOG_LEVEL)'
+    )
+    parser.add_argument(
+        '--metrics-textfile', metavar='PATH',
+        help='Prometheus textfile 경로 (실행 중 주기적으로 갱신)'
+    )
+    
+    parser.add_argument(
+        '--profile', nargs='?', const=set(), metavar='MODES', type=parse_profile_modes,
+        help='프로파일링 실행 (구간별 wall/CPU 시간 + 스택 샘플링, 선택: cprofile,memory) - 보고서는 config.PROFILE_DIR'
+    )
+    
+    parser.add_argument(
+        '--node-id', metavar='ID',
+        help='작업 큐 노드 식별자 (기본: 호스트명-PID)'
+    )
+    parser.add_argument(
+        '--no-enqueue', action='store_true',
+        help='작업 큐 모드에서 data/ 투입 없이 기존 작업만 처리'
     )
     
     args = parser.parse_args()
     
-    # 모드 결정
-    fast_mode = not args.precise  # 기본값: 고속 모드
+    from config import LOG_FORMAT, LOG_LEVEL
+    configure_logging(args.log_format or LOG_FORMAT, args.log_level or LOG_LEVEL)
+    
+    budget_given = any(v is not None for v in (args.time_budget, args.request_budget, args.token_budget))
+    if budget_given and (args.watch or args.queue):
+        parser.error("--time-budget/--request-budget/--token-budget은 일괄 처리에서만 사용할 수 있습니다")
+    
+    if args.status:
+        return show_store_status()
+    if args.export:
+        return export_store(args.export)
+    if args.list_quarantined:
+        return show_quarantine()
+    
+    # 생성 프로필 결정 (기본값: config.DEFAULT_GENERATION_PROFILE)
+    from config import DEFAULT_GENERATION_PROFILE
+    profile_name = args.gen_profile or ("precise" if args.precise else "fast" if args.fast else DEFAULT_GENERATION_PROFILE)
+    try:
+        profile = resolve_profile(
+            profile_name, [parse_perspective_profile(value) for value in args.perspective_profile]
+        )
+    except ValueError as e:
+        parser.error(str(e))
     
     print("🎨 CCB Dataset Transformer (A.X 4.0 API)")
     print("=" * 60)
     
-    mode_str = "⚡ 고속 모드" if fast_mode else "🎯 정밀 모드"
-    print(f"📊 실행 모드: {mode_str}")
+    mode_str = profile.label
+    print(f"📊 실행 모드: {mode_str} (프로필 {profile.mode})")
     print(f"🌐 API 제공자: SKT A.X 4.0")
     print(f"🎯 목표 생성량: 80개 Q&A (30+30+20)")
     print("=" * 60)
     
+    if args.profile is not None:
+        from config import PROFILE_DIR, PROFILE_SAMPLE_INTERVAL, PROFILE_TOP_N
+        start_profiler(RunProfiler(
+            PROFILE_DIR,
+            use_cprofile="cprofile" in args.profile,
+            use_tracemalloc="memory" in args.profile,
+            sample_interval=PROFILE_SAMPLE_INTERVAL,
+            top_n=PROFILE_TOP_N
+        ))
+        print(f"⏱️ 프로파일링 사용: 구간 타이머 + 스택 샘플링"
+              + "".join(f" + {m}" for m in sorted(args.profile)))
+    
     try:
-        # A.X 4.0 프로세서 생성 및 실행
-        processor = AX4Processor(fast_mode=fast_mode)
+        # A.X 4.0 프로세서 생성 및 실행 (openai/psutil 등 무거운 의존성은 여기서 로드)
+        from processors.ax4_processor import AX4Processor
+        processor = AX4Processor(
+            profile=profile,
+            use_store=args.use_store or None,
+            multi_choice=args.multi_choice or None,
+            retry_quarantined=args.retry_quarantined,
+            time_budget=args.time_budget,
+            request_budget=args.request_budget,
+            token_budget=args.token_budget,
+            metrics_textfile=Path(args.metrics_textfile) if args.metrics_textfile else None
+        )
         
         # 처리 통계 출력
         stats = processor.get_processing_stats()
@@ -60,7 +304,14 @@ def main():
         print(f"📂 출력 디렉토리: {stats['output_dir']}")
         print("=" * 60)
         
-        processor.process_all_files()
+        if args.dry_run:
+            return run_dry_run(processor)
+        if args.watch:
+            processor.watch()
+        elif args.queue:
+            processor.process_queue(Path(args.queue), args.node_id, enqueue=not args.no_enqueue)
+        else:
+            processor.process_all_files()
         
         print(f"\n🎉 모든 작업이 완료되었습니다! ({mode_str})")
         return 0
@@ -71,6 +322,10 @@ def main():
     except Exception as e:
         print(f"\n❌ 예상치 못한 오류 발생: {e}")
         return 1
+    finally:
+        report_paths = stop_profiler()
+        if report_paths:
+            print(f"⏱️ 프로파일 보고서: {report_paths['text']}")
 
 
 if __name__ == "__main__":
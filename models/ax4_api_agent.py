@@ -3,21 +3,233 @@
 A.X 4.0 API 에이전트 - SKT A.X API 기반 Q&A 생성
 """
 
+import hashlib
 import json
-import openai
-from openai import OpenAI
+import os
+import queue
+import re
+import threading
+import time
+import warnings
+from collections import deque
+from contextlib import contextmanager
 from utils.json_parser import parse_model_output
+from utils.logger import setup_logger
 from utils.prompt_loader import get_prompt_loader
-from utils.qna_validator import validate_qna
+from utils.qna_validator import validate_qna, dedup_qna, normalize_instruction
+from utils.qna_rules import rules_for_artwork, count_reasons, title_required, REASON_FIELDS
+from utils.circuit_breaker import CircuitBreaker, STATE_CLOSED
+from utils.hedging import LatencyTracker, HedgeBudget
+from utils.run_budget import RunBudget, estimate_tokens
+from utils.usage import add_usage, empty_usage
+from utils import metrics
+from utils.profiler import profiled
+from utils.generation_profile import GenerationProfile, load_profile
+from utils.records import ArtworkRecord, qa_records_from_dicts
+from utils.retry_policy import (
+    RetryPolicy, RetryBudget, AX4Error, AX4TimeoutError, AX4ThrottledError,
+    AX4ServerError, AX4ClientError, AX4ParseError, AX4BudgetError
+)
+from config import (
+    CIRCUIT_WINDOW_SECONDS, CIRCUIT_MIN_REQUESTS, CIRCUIT_ERROR_RATE,
+    CIRCUIT_CONSECUTIVE_FAILURES, CIRCUIT_OPEN_SECONDS, CIRCUIT_MAX_OPEN_SECONDS,
+    MAX_MODEL_ATTEMPTS, RETRY_MAX_REQUEST_ATTEMPTS, RETRY_ARTWORK_BUDGET, RETRY_RUN_BUDGET,
+    RETRY_BASE_DELAY, RETRY_MAX_DELAY, HEDGE_ENABLED, HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES,
+    HEDGE_LATENCY_WINDOW, HEDGE_BUDGET_RATIO, HEDGE_BUDGET_BURST, STREAM_INCLUDE_USAGE,
+    REPAIR_ENABLED, REPAIR_MAX_ITEMS, REPAIR_MAX_TOKENS_PER_ITEM, REPAIR_TEMPERATURE,
+    MULTI_CHOICE_MAX_N, DEFAULT_GENERATION_PROFILE, REQUEST_TIMEOUT_SECONDS
+)
 
 
+logger = setup_logger("AX4Agent")
+
 # A.X 4.0 API 설정
 AX4_API_BASE_URL = "https://guest-api.sktax.chat/v1"
-AX4_API_KEY = "sktax-XyeKFrq67ZjS4EpsDlrHHXV8it"
+# 호스트별 키 사용 시 환경 변수 AX4_API_KEY로 덮어씀 (분산 처리 시 노드마다 다른 키)
+AX4_API_KEY = os.environ.get("AX4_API_KEY", "sktax-XyeKFrq67ZjS4EpsDlrHHXV8it")
 AX4_MODEL = "ax4"
+# 헤지 요청용 대체 엔드포인트 (없으면 같은 엔드포인트로 중복 요청)
+AX4_HEDGE_BASE_URL = os.environ.get("AX4_HEDGE_BASE_URL")
+AX4_HEDGE_API_KEY = os.environ.get("AX4_HEDGE_API_KEY", AX4_API_KEY)
 
 # 전역 클라이언트 변수 (지연 로딩)
 _client = None
+_hedge_client = None
+
+# 엔드포인트 공용 회로 차단기 (모든 작업자 스레드가 공유)
+_breaker = CircuitBreaker(
+    "A.X 4.0",
+    window_seconds=CIRCUIT_WINDOW_SECONDS,
+    min_requests=CIRCUIT_MIN_REQUESTS,
+    error_rate_threshold=CIRCUIT_ERROR_RATE,
+    consecutive_failures=CIRCUIT_CONSECUTIVE_FAILURES,
+    open_seconds=CIRCUIT_OPEN_SECONDS,
+    max_open_seconds=CIRCUIT_MAX_OPEN_SECONDS,
+)
+
+
+# 헤지 요청용 지연 시간 기록과 예산
+_latency = LatencyTracker(window=HEDGE_LATENCY_WINDOW, min_samples=HEDGE_MIN_SAMPLES)
+_hedge_budget = HedgeBudget(ratio=HEDGE_BUDGET_RATIO, burst=HEDGE_BUDGET_BURST)
+
+
+# 실행 예산 (--time-budget/--request-budget/--token-budget 사용 시 설정)
+_run_budget = None
+
+
+# 다중 응답(n) 요청 사용 여부 (set_multi_choice로 설정, 엔드포인트가 n을 거부/무시하면 실행 중 해제)
+_multi_choice = False
+_multi_choice_lock = threading.Lock()
+
+
+# 요청/배치/작품 재시도 공용 정책 (실행 전체 예산 포함, 생성 프로필 설정 시 프로필 값으로 교체)
+_retry_policy = RetryPolicy(
+    max_request_attempts=RETRY_MAX_REQUEST_ATTEMPTS,
+    artwork_budget=RETRY_ARTWORK_BUDGET,
+    run_budget=RETRY_RUN_BUDGET,
+    max_artwork_attempts=MAX_MODEL_ATTEMPTS,
+    base_delay=RETRY_BASE_DELAY,
+    max_delay=RETRY_MAX_DELAY,
+)
+
+
+# 생성 프로필 (set_generation_profile로 설정, 설정 전에는 처음 사용할 때 기본 프로필 로드)
+_profile = None
+_request_timeout = REQUEST_TIMEOUT_SECONDS
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """A.X 4.0 엔드포인트 회로 차단기"""
+    return _breaker
+
+
+def get_retry_policy() -> RetryPolicy:
+    """A.X 4.0 재시도 정책"""
+    return _retry_policy
+
+
+def set_generation_profile(profile: GenerationProfile) -> None:
+    """생성 프로필 설정 - 배치 계획/토큰 크기/샘플링/요청 타임아웃/재시도 정책에 적용"""
+    global _profile, _retry_policy, _request_timeout
+    _profile = profile
+    _request_timeout = profile.request_timeout
+    _retry_policy = RetryPolicy(run_budget=RETRY_RUN_BUDGET, **profile.retry)
+
+
+def get_generation_profile() -> GenerationProfile:
+    """현재 생성 프로필 (설정하지 않았으면 기본 프로필, 폐지된 fast_mode 인자로 호출 중이면 그 프로필)"""
+    override = getattr(_fast_mode_override, "profile", None)
+    if override is not None:
+        return override
+    if _profile is None:
+        set_generation_profile(load_profile(DEFAULT_GENERATION_PROFILE))
+    return _profile
+
+
+# 폐지된 fast_mode 인자 호환 - True/False를 fast/precise 프로필로 바꿔 그 호출(스레드)에만 적용
+_FAST_MODE_PROFILES = {True: "fast", False: "precise"}
+_fast_mode_override = threading.local()
+
+
+@contextmanager
+def _fast_mode_compat(func_name: str, fast_mode: bool = None):
+    """
+    fast_mode를 넘긴 이전 호출 방식 지원 (None이면 현재 프로필 그대로)
+
+    배치 계획/토큰 크기/샘플링만 해당 프로필을 따르고, 요청 타임아웃/재시도 정책은 현재 프로필 설정을 유지합니다.
+    bool이 아닌 값은 위치 인자가 밀린 호출로 보고 TypeError를 발생시킵니다.
+    """
+    if fast_mode is None or getattr(_fast_mode_override, "profile", None) is not None:
+        yield
+        return
+    if not isinstance(fast_mode, bool):
+        raise TypeError(
+            f"{func_name}(): fast_mode는 bool이어야 합니다 ({type(fast_mode).__name__} 전달됨) - "
+            f"exclude_instructions 등은 키워드 인자로 넘기세요"
+        )
+    warnings.warn(
+        f"{func_name}(fast_mode=...)는 폐지 예정입니다 - set_generation_profile() 또는 --gen-profile을 사용하세요",
+        DeprecationWarning, stacklevel=4
+    )
+    _fast_mode_override.profile = load_profile(_FAST_MODE_PROFILES[fast_mode])
+    try:
+        yield
+    finally:
+        _fast_mode_override.profile = None
+
+
+def get_batch_plan() -> list:
+    """현재 프로필의 배치 계획 [(배치명, 관점, 배치 크기), ...]"""
+    return get_generation_profile().batch_plan
+
+
+def set_run_budget(budget: RunBudget) -> None:
+    """실행 예산 설정 (None이면 제한 없음) - 예산이 소진되면 요청 대신 AX4BudgetError 발생"""
+    global _run_budget
+    _run_budget = budget
+
+
+def set_multi_choice(enabled: bool) -> None:
+    """같은 관점 배치를 다중 응답(n) 요청 하나로 받을지 설정"""
+    global _multi_choice
+    _multi_choice = enabled
+
+
+def multi_choice_enabled() -> bool:
+    return _multi_choice
+
+
+# n 파라미터를 가리키는 단어 (오류 본문의 'n', "n", loc ["body", "n"] 등 - 이스케이프 문자 \n 제외)
+_N_PARAM_PATTERN = re.compile(r"(?<![\w\\])n(?!\w)")
+
+
+def _is_n_unsupported(error: AX4Error) -> bool:
+    """n 파라미터를 거부한 오류인지 (400/422이고 오류 본문에 n이 언급된 경우만)"""
+    return (
+        isinstance(error, AX4ClientError) and error.status_code in (400, 422)
+        and bool(_N_PARAM_PATTERN.search(str(error)))
+    )
+
+
+def _disable_multi_choice(reason: str) -> None:
+    """n을 지원하지 않는 엔드포인트 - 이후 요청은 배치별 개별 요청으로 전환 (한 번만 기록)"""
+    global _multi_choice
+    with _multi_choice_lock:
+        if not _multi_choice:
+            return
+        _multi_choice = False
+    logger.warning(f"   ⚠️ 다중 응답(n) 미지원 엔드포인트 ({reason}) - 배치별 개별 요청으로 전환")
+
+
+def get_hedge_stats() -> dict:
+    """헤지 요청 통계 (전체 요청/헤지 요청/헤지 응답 채택 수, 현재 임계값)"""
+    stats = _hedge_budget.stats()
+    stats["threshold_seconds"] = _latency.percentile(HEDGE_PERCENTILE)
+    return stats
+
+
+def classify_api_error(error: Exception) -> AX4Error:
+    """openai 예외를 재시도 판단용 오류 유형으로 변환"""
+    if isinstance(error, AX4Error):
+        return error
+    import openai  # 클라이언트 생성 시 이미 로드됨
+    
+    if isinstance(error, openai.APITimeoutError):
+        return AX4TimeoutError(str(error))
+    if isinstance(error, openai.APIConnectionError):
+        return AX4TimeoutError(f"연결 실패: {error}")
+    if isinstance(error, openai.RateLimitError):
+        retry_after = None
+        try:
+            retry_after = float(error.response.headers.get("retry-after"))
+        except (AttributeError, TypeError, ValueError):
+            pass
+        return AX4ThrottledError(str(error), retry_after=retry_after)
+    if isinstance(error, openai.APIStatusError):
+        if error.status_code >= 500:
+            return AX4ServerError(str(error))
+        return AX4ClientError(str(error), status_code=error.status_code)
+    return AX4Error(str(error))
 
 
 def get_ax4_client():
@@ -26,312 +238,710 @@ def get_ax4_client():
     
     if _client is None:
         try:
-            print("A.X 4.0 API 클라이언트 초기화 중...")
+            logger.info("A.X 4.0 API 클라이언트 초기화 중...")
+            from openai import OpenAI  # 무거운 의존성(httpx/pydantic)은 첫 요청 때 로드
             _client = OpenAI(
                 base_url=AX4_API_BASE_URL,
                 api_key=AX4_API_KEY
             )
-            print("✅ A.X 4.0 API 클라이언트 초기화 완료")
+            logger.info("✅ A.X 4.0 API 클라이언트 초기화 완료")
         except Exception as e:
-            print(f"❌ A.X 4.0 API 클라이언트 초기화 실패: {e}")
+            logger.error(f"❌ A.X 4.0 API 클라이언트 초기화 실패: {e}")
             raise
     
     return _client
 
 
-def generate_with_ax4_api(prompt: str, max_tokens: int = 12288, temperature: float = 0.7, max_retries: int = 5) -> str:
-    """A.X 4.0 API를 사용하여 텍스트 생성 (재시도 로직 포함)"""
-    import time
-    import random
+def get_hedge_client():
+    """헤지 요청용 클라이언트 (대체 엔드포인트가 없으면 기본 클라이언트)"""
+    global _hedge_client
+    
+    if not AX4_HEDGE_BASE_URL:
+        return get_ax4_client()
+    if _hedge_client is None:
+        from openai import OpenAI
+        _hedge_client = OpenAI(base_url=AX4_HEDGE_BASE_URL, api_key=AX4_HEDGE_API_KEY)
+        logger.info(f"✅ 헤지 요청용 클라이언트 초기화 완료 ({AX4_HEDGE_BASE_URL})")
+    return _hedge_client
+
+
+class _HedgeCancelled(Exception):
+    """다른 요청이 먼저 응답하여 중단된 요청"""
+
+
+def _choice_params(n: int, top_p: float = None) -> dict:
+    """다중 응답/샘플링 추가 파라미터 (n=1, top_p 미지정이면 보내지 않음 - 엔드포인트 기본값 사용)"""
+    params = {"n": n} if n > 1 else {}
+    if top_p is not None:
+        params["top_p"] = top_p
+    return params
+
+
+def _stream_completion(client, prompt: str, max_tokens: int, temperature: float,
+                       cancel: threading.Event, n: int = 1, top_p: float = None) -> tuple:
+    """
+    스트리밍 요청 - cancel이 설정되면 연결을 닫아 생성을 중단, (응답별 본문 목록, usage) 반환
+
+    stream_options로 마지막 usage 청크를 요청하며, 서버가 보내지 않으면 usage는 None (호출자가 추정)
+    """
+    extra = {"stream_options": {"include_usage": True}} if STREAM_INCLUDE_USAGE else {}
+    stream = client.chat.completions.create(
+        model=AX4_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        temperature=temperature,
+        timeout=_request_timeout,
+        stream=True,
+        **extra,
+        **_choice_params(n, top_p)
+    )
+    parts = {}   # 응답 index → 본문 조각
+    usage = None
+    started = time.monotonic()
+    try:
+        for chunk in stream:
+            if cancel.is_set():
+                raise _HedgeCancelled()
+            for choice in chunk.choices or []:
+                if choice.delta.content:
+                    if not parts:
+                        metrics.FIRST_TOKEN_SECONDS.observe(time.monotonic() - started, mode="stream")
+                    parts.setdefault(getattr(choice, "index", 0) or 0, []).append(choice.delta.content)
+            usage = getattr(chunk, "usage", None) or usage  # include_usage: choices가 빈 마지막 청크
+    finally:
+        stream.close()
+    return ["".join(parts[index]) for index in sorted(parts)], usage
+
+
+def _hedged_completion(prompt: str, max_tokens: int, temperature: float, threshold: float, n: int = 1,
+                       top_p: float = None) -> tuple:
+    """
+    헤지 요청 - 기본 요청이 threshold초 안에 끝나지 않으면 같은 요청을 한 번 더 보내고
+    먼저 도착한 유효한 응답을 사용 (나머지 요청은 스트림을 닫아 취소)
+    """
+    results: "queue.Queue[tuple]" = queue.Queue()
+    cancel = threading.Event()
+    
+    def run(client, label: str) -> None:
+        try:
+            results.put((label, _stream_completion(client, prompt, max_tokens, temperature, cancel, n, top_p), None))
+        except _HedgeCancelled:
+            results.put((label, ([], None), None))
+        except Exception as e:
+            results.put((label, ([], None), e))
     
-    client = get_ax4_client()
+    threading.Thread(target=run, args=(get_ax4_client(), "primary"), daemon=True).start()
+    pending, hedge_decided, first_error = 1, False, None
     
-    for attempt in range(max_retries):
+    while pending:
         try:
-            # 지수 백오프와 지터 적용
-            if attempt > 0:
-                backoff_time = (2 ** attempt) + random.uniform(0, 1)
-                print(f"   ⏳ {backoff_time:.1f}초 대기 후 재시도...")
-                time.sleep(backoff_time)
-            
-            print(f"   🔄 API 호출 시도 {attempt + 1}/{max_retries}")
-            
-            response = client.chat.completions.create(
-                model=AX4_MODEL,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature,
-                timeout=60.0  # 60초 타임아웃 설정
-            )
-            
-            return response.choices[0].message.content
-            
+            label, (contents, usage), error = results.get(timeout=None if hedge_decided else threshold)
+        except queue.Empty:
+            hedge_decided = True
+            if _breaker.state == STATE_CLOSED and _hedge_budget.try_acquire():
+                logger.info(f"   🪁 응답 지연 ({threshold:.1f}초 초과) - 헤지 요청 전송")
+                threading.Thread(target=run, args=(get_hedge_client(), "hedge"), daemon=True).start()
+                pending += 1
+            continue
+        
+        pending -= 1
+        hedge_decided = True  # 기본 요청이 끝난 뒤에는 헤지하지 않음
+        if any(contents):
+            cancel.set()
+            if label == "hedge":
+                _hedge_budget.record_win()
+                logger.info("   🪁 헤지 요청 응답 채택 - 기본 요청 취소")
+            return contents, usage
+        first_error = first_error or error
+    
+    if first_error is not None:
+        raise first_error
+    return [], None
+
+
+def _usage_dict(usage, prompt: str, content: str) -> dict:
+    """응답 usage를 dict로 변환 (usage가 없으면 문자 수로 추정)"""
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if prompt_tokens is None or completion_tokens is None:
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(content)
+        estimated = True
+    else:
+        estimated = False
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "estimated": estimated,
+    }
+
+
+@profiled("api.request")
+def _request_completion(prompt: str, max_tokens: int, temperature: float, n: int = 1, top_p: float = None) -> tuple:
+    """요청 1회 (헤지 사용 시 지연 임계값을 넘기면 중복 요청) - (응답별 본문 목록, 사용량) 반환"""
+    _hedge_budget.record_request()
+    threshold = _latency.percentile(HEDGE_PERCENTILE) if HEDGE_ENABLED else None
+    started = time.monotonic()
+    
+    if threshold is None:
+        response = get_ax4_client().chat.completions.create(
+            model=AX4_MODEL,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=_request_timeout,  # 프로필 request_timeout
+            **_choice_params(n, top_p)
+        )
+        # 비스트리밍 요청은 첫 토큰 시각을 알 수 없으므로 응답 도착까지 시간을 mode=response로 기록
+        metrics.FIRST_TOKEN_SECONDS.observe(time.monotonic() - started, mode="response")
+        contents = [choice.message.content or "" for choice in response.choices]
+        usage = getattr(response, "usage", None)
+    else:
+        contents, usage = _hedged_completion(prompt, max_tokens, temperature, threshold, n, top_p)
+    
+    _latency.record(time.monotonic() - started)
+    return contents, _usage_dict(usage, prompt, "".join(contents))
+
+
+def generate_with_ax4_api(prompt: str, max_tokens: int = 12288, temperature: float = 0.7,
+                          budget: RetryBudget = None, usage: dict = None, top_p: float = None) -> str:
+    """
+    A.X 4.0 API를 사용하여 텍스트 생성
+    
+    타임아웃/429/5xx는 재시도 정책과 작품 예산(budget) 안에서 다시 요청하고,
+    재시도하지 않는 경우 유형별 AX4Error를 발생시킵니다.
+    usage 합계(dict)를 주면 재시도를 포함한 요청별 토큰 사용량을 더합니다.
+    """
+    return generate_choices_with_ax4_api(prompt, max_tokens, temperature, 1, budget, usage, top_p)[0]
+
+
+def generate_choices_with_ax4_api(prompt: str, max_tokens: int = 12288, temperature: float = 0.7, n: int = 1,
+                                  budget: RetryBudget = None, usage: dict = None, top_p: float = None) -> list:
+    """
+    같은 프롬프트의 응답 n개 생성 (요청 1회, 입력 토큰은 한 번만 처리) - 비어 있지 않은 응답 목록 반환
+    
+    엔드포인트가 n을 거부(본문에 n이 언급된 400/422)하면 이 요청만 응답 1개로 다시 보내고,
+    n을 무시하고 응답을 덜 보내면 받은 응답만 반환합니다 (부족분은 호출자가 따로 요청).
+    """
+    if not _multi_choice:
+        n = 1   # 실행 중 미지원으로 전환된 뒤의 재시도 요청
+    attempt = 0
+    
+    while True:
+        attempt += 1
+        # 예산 확인은 회로 차단기 통과 전에 (half-open 시험 요청 슬롯을 받은 뒤 결과 없이 빠져나가지 않도록)
+        if _run_budget is not None and not _run_budget.allow_request():
+            raise AX4BudgetError(f"실행 예산 소진: {_run_budget.stop_reason}")
+        # 회로가 열려 있으면 요청 없이 대기 (half-open이면 시험 요청 하나만 통과)
+        _breaker.acquire()
+        logger.debug(f"   🔄 API 호출 시도 {attempt}/{_retry_policy.max_request_attempts}")
+        
+        started = time.monotonic()
+        try:
+            contents, request_usage = _request_completion(prompt, max_tokens, temperature, n, top_p)
         except Exception as e:
-            error_msg = str(e)
-            print(f"   ❌ API 호출 실패 (시도 {attempt + 1}): {error_msg[:100]}")
-            
-            # 마지막 시도였다면 예외를 그대로 raise
-            if attempt == max_retries - 1:
-                raise e
+            error = classify_api_error(e)
+            metrics.REQUEST_SECONDS.observe(time.monotonic() - started, outcome=error.kind)
+            metrics.REQUESTS.inc(outcome=error.kind)
+            if _run_budget is not None:
+                _run_budget.record_request(artwork_key=budget.artwork_key if budget is not None else None)
+            if usage is not None:
+                usage["requests"] = usage.get("requests", 0) + 1
+            if error.endpoint_failure:
+                _breaker.record_failure()
+            else:
+                _breaker.record_success()  # 엔드포인트는 응답함 (요청 자체의 문제)
+            logger.warning(
+                f"   ❌ API 호출 실패 ({error.kind}, 시도 {attempt}): {str(e)[:100]}",
+                extra={"event": "request_failed", "kind": error.kind, "attempt": attempt}
+            )
             
-            # 타임아웃이나 서버 오류인 경우 재시도
-            if any(keyword in error_msg.lower() for keyword in 
-                   ['timeout', 'timed out', '504', '502', '503', 'gateway', 'server error', 'request timeout']):
-                print(f"   🔄 타임아웃/서버 오류 감지 - 재시도 예정")
+            if n > 1 and _is_n_unsupported(error):
+                # n을 거부한 요청 - 같은 프롬프트를 응답 1개로 바로 다시 요청 (다른 요청의 다중 응답은 유지)
+                logger.warning(f"   ⚠️ 다중 응답(n={n}) 거부 - 이 요청만 응답 1개로 다시 요청: {str(e)[:80]}")
+                n, attempt = 1, 0
                 continue
-            else:
-                # 진짜 클라이언트 오류 (4xx, 인증 오류 등)는 재시도하지 않음
-                if any(keyword in error_msg.lower() for keyword in ['401', '403', '400', 'unauthorized', 'forbidden']):
-                    print(f"   ❌ 클라이언트 오류 - 재시도 중단")
-                    raise e
-                else:
-                    # 확실하지 않은 오류는 재시도
-                    print(f"   🔄 알 수 없는 오류 - 재시도 예정")
-                    continue
+            if not _retry_policy.should_retry_request(error, attempt, budget):
+                raise error from e
+            metrics.RETRIES.inc(level="request")
+            backoff_time = _retry_policy.backoff(attempt, error)
+            logger.debug(f"   ⏳ {backoff_time:.1f}초 대기 후 재시도...")
+            time.sleep(backoff_time)
+            continue
+        
+        _breaker.record_success()
+        metrics.REQUEST_SECONDS.observe(time.monotonic() - started, outcome="ok")
+        metrics.REQUESTS.inc(outcome="ok")
+        metrics.TOKENS.inc(request_usage["prompt_tokens"], type="prompt")
+        metrics.TOKENS.inc(request_usage["completion_tokens"], type="completion")
+        if _run_budget is not None:
+            _run_budget.record_request(
+                request_usage["total_tokens"], budget.artwork_key if budget is not None else None
+            )
+        if usage is not None:
+            add_usage(usage, request_usage)
+        if n > 1 and len(contents) < n:
+            _disable_multi_choice(f"응답 {len(contents)}/{n}개")
+        contents = [content for content in contents if content]
+        if not contents:
+            raise AX4ParseError("빈 응답")
+        return contents
 
 
-def generate_artwork_questions_visitor_batch(artwork: dict, fast_mode: bool = True, exclude_instructions: set = None, batch_size: int = 10) -> list:
-    """작품에 관한 질문 - 일반 관람객 관점 (배치 크기 조정 가능)"""
-    
+# 관점별 배치 설정 (프롬프트 빌더, 목표 개수 문구, 로그 라벨, 파서 이름)
+BATCH_TYPES = {
+    "visitor": ("format_visitor_prompt", "30개", "일반 관람객", "AX4_API_Visitor_Batch"),
+    "curator_artwork": ("format_curator_artwork_prompt", "30개", "큐레이터 작품", "AX4_API_Curator_Batch"),
+    "curator_artist": ("format_curator_artist_prompt", "20개", "큐레이터 작가", "AX4_API_Artist_Batch"),
+}
+
+# 배치 계획은 생성 프로필의 batch_plan (get_batch_plan)
+
+
+def group_batch_plan(batches: list, max_n: int = MULTI_CHOICE_MAX_N) -> list:
+    """
+    배치 계획 → 요청 단위 묶음 (다중 응답 사용 시 관점/크기가 같은 연속 배치를 최대 max_n개까지 한 요청으로)
+
+    Returns:
+        [[(배치명, 관점, 배치 크기), ...], ...] - 묶음 하나가 요청 하나, 묶음 안의 배치는 응답 순서
+    """
+    groups = []
+    for batch in batches:
+        last = groups[-1] if groups else None
+        if _multi_choice and last and len(last) < max_n and last[0][1:] == tuple(batch[1:]):
+            last.append(batch)
+        else:
+            groups.append([batch])
+    return groups
+
+
+def group_label(group: list) -> str:
+    """요청 묶음 표시 이름 (예: '일반 관람객 1차~3차')"""
+    first, last = group[0][0], group[-1][0]
+    return first if len(group) == 1 else f"{first}~{last.rsplit(' ', 1)[-1]}"
+
+
+def compute_prompt_hash(prompt: str) -> str:
+    """프롬프트 해시 (저장소 기록 및 재현성 추적용)"""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+@profiled("prompt.build_batch_prompt")
+def build_batch_prompt(batch_type: str, artwork: dict, exclude_instructions: set = None, batch_size: int = 10) -> str:
+    """관점별 배치 프롬프트 생성 (배치 크기에 맞춰 목표 개수 조정)"""
+    builder_name, quota_text, _, _ = BATCH_TYPES[batch_type]
     prompt_loader = get_prompt_loader()
-    
-    # 배치 크기에 맞춰 프롬프트 조정
-    original_prompt = prompt_loader.format_visitor_prompt(artwork, exclude_instructions)
-    adjusted_prompt = original_prompt.replace("30개", f"{batch_size}개")
-    
-    print(f"   📝 일반 관람객 프롬프트 생성 완료 ({len(adjusted_prompt)} 문자, {batch_size}개 목표)")
-    
-    # API 최적화 설정 (배치 크기에 따라 토큰 수 조정) - 더 보수적으로
-    max_tokens = min(4000, batch_size * 250)  # 배치당 약 250토큰 (더 작게)
-    temperature = 0.7 if fast_mode else 0.8
-    mode_str = "⚡ 고속 모드" if fast_mode else "🎯 정밀 모드"
-    print(f"   {mode_str} (max_tokens: {max_tokens})")
-    
-    response = generate_with_ax4_api(
+    original_prompt = getattr(prompt_loader, builder_name)(artwork, exclude_instructions)
+    return original_prompt.replace(quota_text, f"{batch_size}개")
+
+
+def batch_generation_params(batch_type: str, batch_size: int) -> tuple:
+    """배치 생성 파라미터 (max_tokens, temperature, top_p) - 현재 프로필의 관점별 설정, 토큰 수는 배치 크기에 비례"""
+    params = get_generation_profile().params(batch_type)
+    return params.max_tokens(batch_size), params.temperature, params.top_p
+
+
+def generate_batch_with_hash(batch_type: str, artwork: dict, fast_mode: bool = None, exclude_instructions: set = None,
+                             batch_size: int = 10, budget: RetryBudget = None, usage: dict = None) -> tuple:
+    """관점별 배치 생성 - (파싱된 Q&A 목록, 프롬프트 해시) 반환 (usage에 토큰 사용량 합산, fast_mode는 폐지 예정)"""
+    with _fast_mode_compat("generate_batch_with_hash", fast_mode):
+        choices, prompt_hash = generate_batch_choices(
+            batch_type, artwork, exclude_instructions=exclude_instructions, batch_size=batch_size,
+            n=1, budget=budget, usage=usage
+        )
+    return choices[0], prompt_hash
+
+
+def generate_batch_choices(batch_type: str, artwork: dict, fast_mode: bool = None, exclude_instructions: set = None,
+                           batch_size: int = 10, n: int = 1, budget: RetryBudget = None, usage: dict = None) -> tuple:
+    """
+    관점별 배치 n개를 요청 하나로 생성 - (응답별 파싱된 Q&A 목록, 프롬프트 해시) 반환
+
+    파싱된 Q&A가 없는 응답은 제외하므로 목록이 n개보다 짧을 수 있습니다 (부족분은 호출자가 따로 요청).
+    fast_mode는 폐지 예정 (주면 fast/precise 프로필로 생성).
+    """
+    with _fast_mode_compat("generate_batch_choices", fast_mode):
+        return _generate_batch_choices(batch_type, artwork, exclude_instructions, batch_size, n, budget, usage)
+
+
+def _generate_batch_choices(batch_type: str, artwork: dict, exclude_instructions: set, batch_size: int, n: int,
+                            budget: RetryBudget, usage: dict) -> tuple:
+    _, _, label, parser_name = BATCH_TYPES[batch_type]
+
+    adjusted_prompt = build_batch_prompt(batch_type, artwork, exclude_instructions, batch_size)
+    prompt_hash = compute_prompt_hash(adjusted_prompt)
+
+    logger.debug(f"   📝 {label} 프롬프트 생성 완료 ({len(adjusted_prompt)} 문자, {batch_size}개 목표)")
+
+    max_tokens, temperature, top_p = batch_generation_params(batch_type, batch_size)
+    logger.debug(f"   {get_generation_profile().label} (max_tokens: {max_tokens}, temperature: {temperature}, 응답 {n}개)")
+
+    responses = generate_choices_with_ax4_api(
         prompt=adjusted_prompt,
         max_tokens=max_tokens,
         temperature=temperature,
-        max_retries=4  # 배치 처리 시 충분한 재시도
+        n=n,
+        budget=budget,
+        usage=usage,
+        top_p=top_p
     )
-    
-    parsed_result = parse_model_output(response, "AX4_API_Visitor_Batch")
-    if parsed_result and isinstance(parsed_result, list):
-        if len(parsed_result) < batch_size // 2:  # 목표의 절반 이상
-            print(f"   ⚠️ 생성 부족: {len(parsed_result)}/{batch_size}개")
-        return parsed_result
-    return []
 
+    choices = []
+    for response in responses:
+        parse_stats = {}
+        parsed_result = parse_model_output(response, parser_name, stats=parse_stats)
+        metrics.observe_parse(parse_stats)
+        if parsed_result and isinstance(parsed_result, list):
+            if len(parsed_result) < batch_size // 2:  # 목표의 절반 이상
+                logger.warning(f"   ⚠️ 생성 부족: {len(parsed_result)}/{batch_size}개")
+            choices.append(parsed_result)
+    if choices:
+        return choices, prompt_hash
+    raise AX4ParseError("파싱된 Q&A 없음", raw_response=responses[0])
+
+
+# 규칙 위반 항목 수정 요청 (작품마다 한 번)
+REPAIR_BATCH_TYPE = "repair"
+REPAIR_BATCH_NAME = "규칙 위반 수정"
+REPAIR_PARSER_NAME = "AX4_API_Repair"
+
+
+def select_repairable(rejected: list) -> list:
+    """수정 요청할 위반 항목 선택 (형식 오류는 고칠 내용이 없으므로 제외, 최대 REPAIR_MAX_ITEMS개)"""
+    if not REPAIR_ENABLED:
+        return []
+    repairable = [(item, reasons) for item, reasons in rejected if REASON_FIELDS not in reasons]
+    return repairable[:REPAIR_MAX_ITEMS]
+
+
+def build_repair_prompt(artwork, items: list) -> str:
+    """위반 항목 수정 프롬프트 (prompts/repair_items.md)"""
+    return get_prompt_loader().format_repair_prompt(artwork, items)
+
+
+def repair_generation_params(item_count: int) -> tuple:
+    """수정 요청 파라미터 (max_tokens, temperature) - 고칠 항목 수에 비례"""
+    return item_count * REPAIR_MAX_TOKENS_PER_ITEM, REPAIR_TEMPERATURE
+
+
+def merge_repaired_items(originals: list, repaired: list, rules, prompt_hash: str) -> list:
+    """
+    수정 응답을 원래 항목과 순서대로 짝지어 다시 검증 (통과한 항목만 원래 관점/배치 메타로 반환)
+
+    originals: [(위반 항목, 사유 목록)] - 항목에는 원래 관점/배치 메타가 붙어 있음
+    """
+    fixed = []
+    for (original, _), item in zip(originals, repaired):
+        if rules.check(item, title_required(original.perspective)):
+            continue
+        fixed.append(item.set_meta(original.perspective, f"{original.batch} (수정)", prompt_hash))
+    return fixed
 
-def generate_artwork_questions_visitor(artwork: dict, fast_mode: bool = True, exclude_instructions: set = None) -> list:
+
+def repair_rejected_items(artwork, rejected: list, rules, seen_instructions: set,
+                          budget: RetryBudget = None, usage: dict = None) -> list:
+    """규칙 위반 항목만 모아 한 번에 수정 요청 → 다시 검증/중복 제거한 항목 반환"""
+    originals = select_repairable(rejected)
+    if not originals:
+        return []
+    if not _retry_policy.allow_repair(budget):
+        logger.info(f"   🩹 재시도 예산 소진 - 규칙 위반 {len(originals)}개 수정 요청 생략")
+        return []
+
+    prompt = build_repair_prompt(artwork, originals)
+    max_tokens, temperature = repair_generation_params(len(originals))
+    response = generate_with_ax4_api(
+        prompt=prompt,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        budget=budget,
+        usage=usage
+    )
+    repaired = parse_model_output(response, REPAIR_PARSER_NAME) or []
+    fixed = merge_repaired_items(originals, repaired, rules, compute_prompt_hash(prompt))
+    accepted = dedup_qna(fixed, seen_instructions)
+    metrics.QA_ITEMS.inc(len(accepted), result="repaired")
+    logger.info(f"   🩹 규칙 위반 {len(originals)}개 수정 요청 → {len(accepted)}개 복구")
+    return accepted
+
+
+def _batch_or_empty(batch_type: str, artwork: dict, exclude_instructions: set, batch_size: int) -> list:
+    try:
+        return generate_batch_with_hash(
+            batch_type, artwork, exclude_instructions=exclude_instructions, batch_size=batch_size
+        )[0]
+    except AX4ParseError:
+        return []
+
+
+# 관점 전체를 한 번에 생성하는 함수의 토큰 한도 (배치 상한 대신 사용, 샘플링은 프로필 관점 설정)
+SINGLE_SHOT_MAX_TOKENS = 16384
+
+
+def _single_shot_params(batch_type: str) -> tuple:
+    params = get_generation_profile().params(batch_type)
+    return SINGLE_SHOT_MAX_TOKENS, params.temperature, params.top_p
+
+
+def generate_artwork_questions_visitor_batch(artwork: dict, fast_mode: bool = None, exclude_instructions: set = None, batch_size: int = 10) -> list:
+    """작품에 관한 질문 - 일반 관람객 관점 (배치 크기 조정 가능)"""
+    with _fast_mode_compat("generate_artwork_questions_visitor_batch", fast_mode):
+        return _batch_or_empty("visitor", artwork, exclude_instructions, batch_size)
+
+
+def generate_artwork_questions_visitor(artwork: dict, fast_mode: bool = None, exclude_instructions: set = None) -> list:
     """작품에 관한 질문 - 일반 관람객 관점 (30개)"""
-    
+    with _fast_mode_compat("generate_artwork_questions_visitor", fast_mode):
+        return _generate_artwork_questions_visitor(artwork, exclude_instructions)
+
+
+def _generate_artwork_questions_visitor(artwork: dict, exclude_instructions: set) -> list:
     prompt_loader = get_prompt_loader()
     prompt = prompt_loader.format_visitor_prompt(artwork, exclude_instructions)
     
-    print(f"   📝 일반 관람객 프롬프트 생성 완료 ({len(prompt)} 문자)")
+    logger.debug(f"   📝 일반 관람객 프롬프트 생성 완료 ({len(prompt)} 문자)")
     
-    # API 최적화 설정
-    max_tokens = 12288 if fast_mode else 16384
-    temperature = 0.7 if fast_mode else 0.8
-    mode_str = "⚡ 고속 모드" if fast_mode else "🎯 정밀 모드"
-    print(f"   {mode_str}")
+    max_tokens, temperature, top_p = _single_shot_params("visitor")
+    logger.debug(f"   {get_generation_profile().label}")
     
     response = generate_with_ax4_api(
         prompt=prompt,
         max_tokens=max_tokens,
-        temperature=temperature
+        temperature=temperature,
+        top_p=top_p
     )
     
     parsed_result = parse_model_output(response, "AX4_API_Visitor")
     if parsed_result and isinstance(parsed_result, list):
         if len(parsed_result) < 20:  # 30개 목표 중 최소 20개는 있어야 함
-            print(f"   ⚠️ 생성 부족: {len(parsed_result)}/30개 - 재시도 권장")
+            logger.warning(f"   ⚠️ 생성 부족: {len(parsed_result)}/30개 - 재시도 권장")
         return parsed_result
     return []
 
 
-def generate_artwork_questions_curator_batch(artwork: dict, fast_mode: bool = True, exclude_instructions: set = None, batch_size: int = 10) -> list:
+def generate_artwork_questions_curator_batch(artwork: dict, fast_mode: bool = None, exclude_instructions: set = None, batch_size: int = 10) -> list:
     """작품에 관한 질문 - 큐레이터/공예이론가 관점 (배치 크기 조정 가능)"""
-    
-    prompt_loader = get_prompt_loader()
-    
-    # 배치 크기에 맞춰 프롬프트 조정
-    original_prompt = prompt_loader.format_curator_artwork_prompt(artwork, exclude_instructions)
-    adjusted_prompt = original_prompt.replace("30개", f"{batch_size}개")
-    
-    print(f"   📝 큐레이터 작품 프롬프트 생성 완료 ({len(adjusted_prompt)} 문자, {batch_size}개 목표)")
-    
-    # API 최적화 설정 (배치 크기에 따라 토큰 수 조정) - 더 보수적으로
-    max_tokens = min(4000, batch_size * 250)  # 배치당 약 250토큰 (더 작게)
-    temperature = 0.7 if fast_mode else 0.8
-    mode_str = "⚡ 고속 모드" if fast_mode else "🎯 정밀 모드"
-    print(f"   {mode_str} (max_tokens: {max_tokens})")
-    
-    response = generate_with_ax4_api(
-        prompt=adjusted_prompt,
-        max_tokens=max_tokens,
-        temperature=temperature,
-        max_retries=4  # 배치 처리 시 충분한 재시도
-    )
-    
-    parsed_result = parse_model_output(response, "AX4_API_Curator_Batch")
-    if parsed_result and isinstance(parsed_result, list):
-        if len(parsed_result) < batch_size // 2:  # 목표의 절반 이상
-            print(f"   ⚠️ 생성 부족: {len(parsed_result)}/{batch_size}개")
-        return parsed_result
-    return []
+    with _fast_mode_compat("generate_artwork_questions_curator_batch", fast_mode):
+        return _batch_or_empty("curator_artwork", artwork, exclude_instructions, batch_size)
 
 
-def generate_artwork_questions_curator(artwork: dict, fast_mode: bool = True, exclude_instructions: set = None) -> list:
+def generate_artwork_questions_curator(artwork: dict, fast_mode: bool = None, exclude_instructions: set = None) -> list:
     """작품에 관한 질문 - 큐레이터/공예이론가 관점 (30개)"""
-    
+    with _fast_mode_compat("generate_artwork_questions_curator", fast_mode):
+        return _generate_artwork_questions_curator(artwork, exclude_instructions)
+
+
+def _generate_artwork_questions_curator(artwork: dict, exclude_instructions: set) -> list:
     prompt_loader = get_prompt_loader()
     prompt = prompt_loader.format_curator_artwork_prompt(artwork, exclude_instructions)
     
-    print(f"   📝 큐레이터 작품 프롬프트 생성 완료 ({len(prompt)} 문자)")
+    logger.debug(f"   📝 큐레이터 작품 프롬프트 생성 완료 ({len(prompt)} 문자)")
     
-    # API 최적화 설정
-    max_tokens = 12288 if fast_mode else 16384
-    temperature = 0.7 if fast_mode else 0.8
-    mode_str = "⚡ 고속 모드" if fast_mode else "🎯 정밀 모드"
-    print(f"   {mode_str}")
+    max_tokens, temperature, top_p = _single_shot_params("curator_artwork")
+    logger.debug(f"   {get_generation_profile().label}")
     
     response = generate_with_ax4_api(
         prompt=prompt,
         max_tokens=max_tokens,
-        temperature=temperature
+        temperature=temperature,
+        top_p=top_p
     )
     
     parsed_result = parse_model_output(response, "AX4_API_Curator")
     if parsed_result and isinstance(parsed_result, list):
         if len(parsed_result) < 20:  # 30개 목표 중 최소 20개는 있어야 함
-            print(f"   ⚠️ 생성 부족: {len(parsed_result)}/30개 - 재시도 권장")
+            logger.warning(f"   ⚠️ 생성 부족: {len(parsed_result)}/30개 - 재시도 권장")
         return parsed_result
     return []
 
 
-def generate_artist_questions_curator_batch(artwork: dict, fast_mode: bool = True, exclude_instructions: set = None, batch_size: int = 10) -> list:
+def generate_artist_questions_curator_batch(artwork: dict, fast_mode: bool = None, exclude_instructions: set = None, batch_size: int = 10) -> list:
     """작가에 대한 질문 - 큐레이터/공예이론가 관점 (배치 크기 조정 가능)"""
-    
-    prompt_loader = get_prompt_loader()
-    
-    # 배치 크기에 맞춰 프롬프트 조정
-    original_prompt = prompt_loader.format_curator_artist_prompt(artwork, exclude_instructions)
-    adjusted_prompt = original_prompt.replace("20개", f"{batch_size}개")
-    
-    print(f"   📝 큐레이터 작가 프롬프트 생성 완료 ({len(adjusted_prompt)} 문자, {batch_size}개 목표)")
-    
-    # 배치 크기에 따라 토큰 수 조정 (작가 질문은 좀 더 길 수 있음) - 보수적으로
-    max_tokens = min(5000, batch_size * 300)  # 배치당 약 300토큰 (더 작게)
-    temperature = 0.8  # 작가 질문은 좀 더 다양성 필요
-    print(f"   🎯 작가 관점 모드 (max_tokens: {max_tokens})")
-    
-    response = generate_with_ax4_api(
-        prompt=adjusted_prompt,
-        max_tokens=max_tokens,
-        temperature=temperature,
-        max_retries=4  # 배치 처리 시 충분한 재시도
-    )
-    
-    parsed_result = parse_model_output(response, "AX4_API_Artist_Batch")
-    if parsed_result and isinstance(parsed_result, list):
-        if len(parsed_result) < batch_size // 2:  # 목표의 절반 이상
-            print(f"   ⚠️ 생성 부족: {len(parsed_result)}/{batch_size}개")
-        return parsed_result
-    return []
+    with _fast_mode_compat("generate_artist_questions_curator_batch", fast_mode):
+        return _batch_or_empty("curator_artist", artwork, exclude_instructions, batch_size)
 
 
-def generate_artist_questions_curator(artwork: dict, fast_mode: bool = True, exclude_instructions: set = None) -> list:
+def generate_artist_questions_curator(artwork: dict, fast_mode: bool = None, exclude_instructions: set = None) -> list:
     """작가에 대한 질문 - 큐레이터/공예이론가 관점 (20개)"""
-    
+    with _fast_mode_compat("generate_artist_questions_curator", fast_mode):
+        return _generate_artist_questions_curator(artwork, exclude_instructions)
+
+
+def _generate_artist_questions_curator(artwork: dict, exclude_instructions: set) -> list:
     prompt_loader = get_prompt_loader()
     prompt = prompt_loader.format_curator_artist_prompt(artwork, exclude_instructions)
     
-    print(f"   📝 큐레이터 작가 프롬프트 생성 완료 ({len(prompt)} 문자)")
+    logger.debug(f"   📝 큐레이터 작가 프롬프트 생성 완료 ({len(prompt)} 문자)")
     
-    # 고품질 모드 강제 적용 (20개 완전 생성을 위해)
-    max_tokens = 16384  # 충분한 토큰 할당
-    temperature = 0.8  # 더 높은 다양성과 완성도
-    print("   🎯 고품질 모드 활성화 (20개 완전 생성)")
+    max_tokens, temperature, top_p = _single_shot_params("curator_artist")
+    logger.debug(f"   {get_generation_profile().label}")
     
     response = generate_with_ax4_api(
         prompt=prompt,
         max_tokens=max_tokens,
-        temperature=temperature
+        temperature=temperature,
+        top_p=top_p
     )
     
     parsed_result = parse_model_output(response, "AX4_API_Artist")
     if parsed_result and isinstance(parsed_result, list):
         if len(parsed_result) < 15:  # 20개 목표 중 최소 15개는 있어야 함
-            print(f"   ⚠️ 생성 부족: {len(parsed_result)}/20개 - 재시도 권장")
+            logger.warning(f"   ⚠️ 생성 부족: {len(parsed_result)}/20개 - 재시도 권장")
         return parsed_result
     return []
 
 
-def generate_all_qa_batch(artwork: dict, fast_mode: bool = True, exclude_questions: list = None) -> str:
-    """모든 유형의 Q&A를 배치로 생성 (타임아웃 방지를 위한 순차 처리)"""
+def collect_exclude_instructions(exclude_questions: list = None) -> set:
+    """기존 Q&A(QARecord 또는 이전 형식의 dict)에서 프롬프트 제외 목록용 질문 집합 생성"""
+    exclude_instructions = set()
+    for q in qa_records_from_dicts(exclude_questions or []):
+        exclude_instructions.add((q.instruction or '').strip().lower())
+    return exclude_instructions
+
+
+def generate_all_qa_records(artwork: dict, fast_mode: bool = None, exclude_questions: list = None, batches: list = None,
+                            budget: RetryBudget = None, failures: list = None, usage: list = None) -> list:
+    """
+    모든 유형의 Q&A를 배치로 생성 - 검증된 항목에 관점/배치/프롬프트 해시 메타 포함
+    
+    실패하거나 Q&A를 하나도 얻지 못한 배치는 작품 재시도 예산(budget) 안에서 그 배치만 다시 생성합니다.
+    규칙을 어긴 항목은 모든 배치가 끝난 뒤 한 번의 수정 요청으로 그 항목만 다시 받습니다.
+    failures 목록을 주면 최종 실패한 배치의 오류(AX4Error)를 추가합니다.
+    usage 목록을 주면 배치별 (관점, 배치명, 토큰 사용량)을 추가합니다.
+    fast_mode는 폐지 예정 (주면 fast/precise 프로필의 배치 계획과 생성 설정 사용).
+    """
+    # 이전 호출 방식(작품 dict / Q&A dict 목록)은 경계에서 레코드로 변환
+    if isinstance(artwork, dict):
+        artwork = ArtworkRecord.from_dict(artwork)
+    exclude_questions = qa_records_from_dicts(exclude_questions or [])
+    with _fast_mode_compat("generate_all_qa_records", fast_mode):
+        return _generate_all_qa_records(artwork, exclude_questions, batches, budget, failures, usage)
+
+
+def _generate_all_qa_records(artwork: dict, exclude_questions: list, batches: list,
+                             budget: RetryBudget, failures: list, usage: list) -> list:
     import time
     
-    mode_str = "⚡ 고속 모드" if fast_mode else "🎯 정밀 모드"
-    print(f"   📊 {mode_str}로 Q&A 생성 시작 (순차 처리)")
+    logger.info(f"   📊 {get_generation_profile().label}로 Q&A 생성 시작 (순차 처리)")
     
     # 기존 질문 정보 처리
-    exclude_instructions = set()
-    if exclude_questions:
-        for q in exclude_questions:
-            instruction = q.get('instruction', '').strip().lower()
-            exclude_instructions.add(instruction)
-        print(f"   ⚠️ 제외할 기존 질문: {len(exclude_instructions)}개")
-    
-    all_qa = []
-    
-    # 더 작은 배치로 세분화 (10개씩 8단계)
-    batches = [
-        ("일반 관람객 1차", "visitor", 10),
-        ("일반 관람객 2차", "visitor", 10), 
-        ("일반 관람객 3차", "visitor", 10),
-        ("큐레이터 작품 1차", "curator_artwork", 10),
-        ("큐레이터 작품 2차", "curator_artwork", 10),
-        ("큐레이터 작품 3차", "curator_artwork", 10),
-        ("큐레이터 작가 1차", "curator_artist", 10),
-        ("큐레이터 작가 2차", "curator_artist", 10),
-    ]
-    
-    for i, (batch_name, batch_type, batch_size) in enumerate(batches, 1):
-        print(f"   📝 [{i}/8] {batch_name} 질문 생성 중... ({batch_size}개)")
+    exclude_instructions = collect_exclude_instructions(exclude_questions)
+    if exclude_instructions:
+        logger.info(f"   ⚠️ 제외할 기존 질문: {len(exclude_instructions)}개")
+    
+    all_records = []
+    all_rejected = []
+    generated_count = 0
+    seen_instructions = {normalize_instruction(q.instruction) for q in exclude_questions or []}
+    rules = rules_for_artwork(artwork)
+    
+    # 더 작은 배치로 세분화 (기본: 프로필 배치 계획)
+    if batches is None:
+        batches = get_batch_plan()
+    if budget is None:
+        budget = _retry_policy.new_budget()
+    
+    # 같은 관점의 연속 배치는 다중 응답 사용 시 요청 하나로 묶음 (응답 순서대로 각 배치로 처리)
+    plan = deque(group_batch_plan(batches))
+    position = 0
+    while plan:
+        group = plan.popleft()
+        _, batch_type, batch_size = group[0]
+        label = group_label(group)
+        position += len(group)
+        choices_str = f" x {len(group)}" if len(group) > 1 else ""
+        logger.info(f"   📝 [{position}/{len(batches)}] {label} 질문 생성 중... ({batch_size}개{choices_str})")
+        batch_usage = empty_usage()
+        if usage is not None:
+            usage.append((batch_type, label, batch_usage))
         try:
-            if batch_type == "visitor":
-                qa_batch = generate_artwork_questions_visitor_batch(artwork, fast_mode, exclude_instructions, batch_size=batch_size)
-            elif batch_type == "curator_artwork":
-                qa_batch = generate_artwork_questions_curator_batch(artwork, fast_mode, exclude_instructions, batch_size=batch_size)
-            else:  # curator_artist
-                qa_batch = generate_artist_questions_curator_batch(artwork, fast_mode, exclude_instructions, batch_size=batch_size)
+            while True:
+                try:
+                    choices, prompt_hash = generate_batch_choices(
+                        batch_type, artwork, exclude_instructions=exclude_instructions, batch_size=batch_size, n=len(group),
+                        budget=budget, usage=batch_usage
+                    )
+                    break
+                except AX4Error as e:
+                    if not _retry_policy.should_retry_batch(e, budget):
+                        raise
+                    metrics.RETRIES.inc(level="batch")
+                    logger.info(f"   🔁 {label} 배치 재시도 ({e.kind}, 남은 예산 {budget.remaining}회)")
             
-            print(f"   ✅ {batch_name}: {len(qa_batch)}개 생성")
-            all_qa.extend(qa_batch)
+            if len(choices) < len(group):
+                # 응답을 덜 받은 배치(n 미지원/파싱 실패)는 따로 다시 요청
+                remaining = group[len(choices):]
+                plan.extendleft(reversed(group_batch_plan(remaining)))
+                position -= len(remaining)
+                logger.info(f"   ↪️ {label}: 응답 {len(choices)}/{len(group)}개 - 나머지 {len(remaining)}개 배치는 따로 요청")
+            
+            for (batch_name, _, _), qa_batch in zip(group, choices):
+                logger.info(f"   ✅ {batch_name}: {len(qa_batch)}개 생성")
+                generated_count += len(qa_batch)
+                
+                # 배치 단위 규칙 검증/중복 제거 후 메타데이터 부착 (같은 요청의 응답끼리도 중복 제거)
+                rejected = []
+                valid_items = validate_qna(qa_batch, rules, batch_type, rejected)
+                if rejected:
+                    reason_counts = count_reasons(rejected)
+                    metrics.observe_rule_failures(reason_counts)
+                    reasons = ", ".join(f"{k} {v}" for k, v in reason_counts.items())
+                    logger.info(f"   🚫 {batch_name} 규칙 위반 {len(rejected)}개 제외 ({reasons})")
+                    for item, _ in rejected:
+                        item.set_meta(batch_type, batch_name, prompt_hash)
+                    all_rejected.extend(rejected)
+                accepted = dedup_qna(valid_items, seen_instructions)
+                for item in accepted:
+                    all_records.append(item.set_meta(batch_type, batch_name, prompt_hash))
+                metrics.QA_ITEMS.inc(len(qa_batch) - len(valid_items), result="dropped_validation")
+                metrics.QA_ITEMS.inc(len(valid_items) - len(accepted), result="dropped_duplicate")
+                metrics.QA_ITEMS.inc(len(accepted), result="accepted")
             
             # 배치 간 더 긴 대기시간
-            if i < len(batches):  # 마지막 배치가 아니면
-                print(f"   ⏳ 다음 배치까지 3초 대기...")
+            if plan:  # 마지막 요청이 아니면
+                logger.debug(f"   ⏳ 다음 배치까지 3초 대기...")
                 time.sleep(3)
                 
         except Exception as e:
-            print(f"   ⚠️ {batch_name} 생성 실패: {e}")
+            logger.warning(f"   ⚠️ {label} 생성 실패: {e}")
+            if failures is not None:
+                failures.append(e if isinstance(e, AX4Error) else AX4Error(str(e)))
             # 실패해도 계속 진행
     
-    total_count = len(all_qa)
-    print(f"   📊 총 생성된 Q&A: {total_count}개")
+    if select_repairable(all_rejected):
+        repair_usage = empty_usage()
+        if usage is not None:
+            usage.append((REPAIR_BATCH_TYPE, REPAIR_BATCH_NAME, repair_usage))
+        try:
+            all_records.extend(
+                repair_rejected_items(artwork, all_rejected, rules, seen_instructions, budget, repair_usage)
+            )
+        except Exception as e:
+            logger.warning(f"   ⚠️ {REPAIR_BATCH_NAME} 실패: {e}")
+            if failures is not None:
+                failures.append(e if isinstance(e, AX4Error) else AX4Error(str(e)))
     
-    if total_count < 50:  # 최소 기준을 낮춤 (타임아웃으로 인한 부분 실패 고려)
-        print(f"   ⚠️ 생성된 Q&A가 부족합니다: {total_count}/80개 (목표)")
+    logger.info(f"   📊 총 생성된 Q&A: {generated_count}개")
     
-    # 결과를 검증하고 반환
-    validated_items = validate_qna(all_qa)
+    if generated_count < 50:  # 최소 기준을 낮춤 (타임아웃으로 인한 부분 실패 고려)
+        logger.warning(f"   ⚠️ 생성된 Q&A가 부족합니다: {generated_count}/80개 (목표)")
     
-    print(f"   ✅ 검증 완료: {len(validated_items)}개 유효한 Q&A")
-    return json.dumps(validated_items, ensure_ascii=False, indent=2)
+    logger.info(f"   ✅ 검증 완료: {len(all_records)}개 유효한 Q&A")
+    return all_records
+
+
+def strip_record_meta(records: list) -> list:
+    """Q&A 기록에서 메타데이터를 제거하여 출력 형식(dict)으로 변환"""
+    return [r.to_dict() for r in records]
+
+
+def generate_all_qa_batch(artwork: dict, fast_mode: bool = None, exclude_questions: list = None) -> str:
+    """모든 유형의 Q&A를 배치로 생성 (타임아웃 방지를 위한 순차 처리, fast_mode는 폐지 예정)"""
+    with _fast_mode_compat("generate_all_qa_batch", fast_mode):
+        records = generate_all_qa_records(artwork, exclude_questions=exclude_questions)
+    return json.dumps(strip_record_meta(records), ensure_ascii=False, indent=2)
 
 
 # 기존 함수들과의 호환성을 위한 wrapper
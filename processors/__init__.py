@@ -1,7 +1,13 @@
 """
 프로세서 모듈 (A.X 4.0 API 전용)
+- AX4Processor는 처음 사용할 때 임포트 (패키지 임포트만으로 openai 등을 로드하지 않도록)
 """
 
-from .ax4_processor import AX4Processor
+__all__ = ['AX4Processor']
 
-__all__ = ['AX4Processor']
\ No newline at end of file
+
+def __getattr__(name):
+    if name == 'AX4Processor':
+        from .ax4_processor import AX4Processor
+        return AX4Processor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,701 @@
+#!/usr/bin/env python3
+"""
+A.X 4.0 단계별 처리 파이프라인
+- ingest → normalize → prompt → generate → parse → validate → persist
+- 네트워크 단계(generate)는 디스크/파싱 작업을 기다리지 않고 다음 요청을 보냄
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.pipeline import StagedPipeline
+from utils.parse_pool import ParsePool
+from utils.json_parser import parse_model_output
+from utils.qna_validator import dedup_qna, normalize_instruction
+from utils.qna_rules import rules_for_artwork, count_reasons
+from utils.retry_policy import AX4Error, AX4ParseError, AX4BudgetError, RetryBudget
+from utils.usage import empty_usage
+from utils.records import ArtworkRecord, QARecord
+from utils.resource_monitor import ResourceMonitor, ConcurrencyGovernor
+from utils.work_index import WorkIndex, CLAIM_LEADER, CLAIM_FOLLOWER, CLAIM_DEFERRED, CLAIM_DONE
+from utils.artist_qa_cache import ARTIST_PERSPECTIVE, artist_cache_key, artist_fingerprint
+from utils import metrics
+from models.ax4_api_agent import (
+    BATCH_TYPES, get_batch_plan, get_generation_profile, build_batch_prompt, batch_generation_params,
+    group_batch_plan, group_label, collect_exclude_instructions, compute_prompt_hash, generate_choices_with_ax4_api,
+    get_retry_policy,
+    REPAIR_BATCH_TYPE, REPAIR_BATCH_NAME, REPAIR_PARSER_NAME, select_repairable, build_repair_prompt,
+    repair_generation_params, merge_repaired_items
+)
+from config import (
+    MIN_PARSED_QA_COUNT, PIPELINE_STAGE_WORKERS,
+    PIPELINE_QUEUE_SIZES, PIPELINE_MONITOR_INTERVAL,
+    PARSE_POOL_WORKERS, PARSE_DEBUG_OUTPUT, RESOURCE_MONITOR_ENABLED, GOVERNOR_STAGE_LIMITS
+)
+
+# 작가 관점 배치 처리 방식 (_claim_artist)
+ARTIST_GENERATE = "generate"   # 작가 관점 배치를 직접 생성
+ARTIST_CACHED = "cached"       # 작가 캐시의 Q&A 사용
+ARTIST_WAIT = "wait"           # 같은 작가 작업이 생성 중 - 끝나면 캐시에서 받음
+ARTIST_CACHE_BATCH_NAME = "큐레이터 작가 (캐시)"
+
+
+class ArtworkJob:
+    """작품 단위 작업 상태 (배치 결과를 모아 완료 여부 판단)"""
+
+    def __init__(self, artwork: ArtworkRecord, output_filename: str, artwork_key: str,
+                 regenerate: bool, existing_qa: List[QARecord], budget: RetryBudget):
+        self.artwork = artwork
+        self.output_filename = output_filename
+        self.artwork_key = artwork_key
+        self.regenerate = regenerate
+        self.existing_qa = existing_qa
+        self.exclude_instructions = collect_exclude_instructions(existing_qa)
+        self.rules = rules_for_artwork(artwork)   # 작가명/작품명/수치 규칙 (작품마다 한 번 컴파일)
+        self.attempt = 1
+        self.budget = budget   # 요청/배치/작품 재시도 공용 예산
+        self.pending = 0
+        self.records: List[QARecord] = []
+        self.seen_instructions = set()
+        self.failures: List[AX4Error] = []       # 재시도 없이 끝난 배치 오류 (격리 기록용)
+        self.short_response: Optional[str] = None  # 목표의 절반도 못 채운 마지막 응답
+        self.rejected: List[Tuple[QARecord, List[str]]] = []   # 모든 배치의 규칙 위반 항목 (수정 요청용)
+        self.repair_requested = False
+        self.artist_shared = False   # 작가 관점 Q&A를 캐시/같은 작가 작업에서 받음 (직접 생성하지 않음)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """재시도를 위해 이번 시도의 결과 초기화"""
+        self.records = []
+        self.failures = []
+        self.short_response = None
+        self.rejected = []
+        self.repair_requested = False
+        self.seen_instructions = {
+            normalize_instruction(q.instruction) for q in self.existing_qa
+        }
+
+    @property
+    def label(self) -> str:
+        return self.artwork.label
+
+
+class BatchJob:
+    """배치 단위 작업 (프롬프트 → 응답 → 파싱 결과)"""
+
+    def __init__(self, job: ArtworkJob, batch_name: str, batch_type: str, batch_size: int):
+        self.job = job
+        self.batch_name = batch_name
+        self.batch_type = batch_type
+        self.batch_size = batch_size
+        self.choice_names = [batch_name]   # 응답별 배치명 (다중 응답 요청이면 같은 프롬프트의 배치 여러 개)
+        self.prompt = ""
+        self.prompt_hash = ""
+        self.max_tokens = 0
+        self.temperature = 0.7
+        self.top_p: Optional[float] = None
+        self.response: Optional[str] = None
+        self.parsed: List[QARecord] = []   # 검증까지 마친 Q&A
+        self.keys: List[str] = []      # 중복 비교용 정규화 질문
+        self.rejected: List[Tuple[QARecord, List[str]]] = []   # 규칙 위반 항목과 사유
+        self.repair_items: Optional[List[Tuple[QARecord, List[str]]]] = None   # 수정 요청 배치면 고칠 항목
+        self.cached = False            # 작가 캐시에서 가져온 항목 (API 호출 없이 validate 단계로 바로 투입)
+        self.error: Optional[AX4Error] = None
+        self.usage = empty_usage()     # 재시도를 포함한 토큰 사용량 (재시도 시에도 유지)
+
+    def reset(self) -> None:
+        """배치 재시도를 위해 응답/파싱 결과 초기화"""
+        self.response = None
+        self.parsed = []
+        self.keys = []
+        self.rejected = []
+        self.error = None
+
+
+class AX4Pipeline:
+    """AX4Processor의 단계별 파이프라인 실행기"""
+
+    def __init__(self, processor, stage_workers: Optional[Dict[str, int]] = None,
+                 queue_sizes: Optional[Dict[str, int]] = None,
+                 min_request_interval: Optional[float] = None,
+                 monitor_interval: float = PIPELINE_MONITOR_INTERVAL,
+                 parse_workers: int = PARSE_POOL_WORKERS,
+                 resource_monitor: bool = RESOURCE_MONITOR_ENABLED,
+                 on_artwork_done: Optional[Callable[[str, bool, str], None]] = None,
+                 on_artwork_skipped: Optional[Callable[[str, str], None]] = None):
+        self.processor = processor
+        # 작품 처리 종료 알림 (작품 키, 성공 여부, 실패 사유) - 공유 작업 큐 완료 처리용
+        self.on_artwork_done = on_artwork_done
+        # 격리 등으로 건너뛴 작품 알림 (작품 키, 사유) - 실패로 기록하지 않음
+        self.on_artwork_skipped = on_artwork_skipped
+        self.logger = processor.logger
+        # 동시 API 요청 수와 요청 간격은 생성 프로필 값 (인자로 주면 우선)
+        profile = get_generation_profile()
+        workers = dict(PIPELINE_STAGE_WORKERS, generate=profile.generate_workers, **(stage_workers or {}))
+        if min_request_interval is None:
+            min_request_interval = profile.min_request_interval
+        sizes = dict(PIPELINE_QUEUE_SIZES, **(queue_sizes or {}))
+
+        # 파싱/검증 프로세스 풀 (0이면 parse 단계 스레드에서 직접 실행)
+        self.retry_policy = get_retry_policy()
+        self.parse_pool = ParsePool(parse_workers, verbose=PARSE_DEBUG_OUTPUT and parse_workers == 0)
+        if self.parse_pool.enabled:
+            # parse 단계 스레드는 풀 작업 결과를 기다리므로 프로세스 수만큼 있어야 모든 프로세스가 동시에 일함
+            workers["parse"] = max(workers.get("parse", 1), parse_workers)
+            self.logger.info(
+                f"🧮 파싱/검증 프로세스 풀 사용: {parse_workers}개 프로세스 (parse 작업자 {workers['parse']}개)"
+            )
+
+        # 조절 대상 단계는 최대 작업자 수만큼 스레드를 만들어 두고 허용 수만 바꿈
+        limits = {
+            name: (min(low, workers.get(name, 1)), max(high, workers.get(name, 1)))
+            for name, (low, high) in GOVERNOR_STAGE_LIMITS.items()
+        } if resource_monitor else {}
+
+        self.pipeline = StagedPipeline("AX4Pipeline", monitor_interval)
+        for name, handler in (
+            ("ingest", self._ingest),
+            ("normalize", self._normalize),
+            ("prompt", self._prompt),
+            ("generate", self._generate),
+            ("parse", self._parse),
+            ("validate", self._validate),
+            ("persist", self._persist),
+        ):
+            self.pipeline.add_stage(name, handler, workers.get(name, 1), sizes.get(name, 0),
+                                    max_workers=limits.get(name, (0, 0))[1])
+
+        # 메모리/CPU 샘플링 → 단계별 동시성/큐 크기 조절 (처리 경로에서는 시스템 호출 없음)
+        self.resource_monitor: Optional[ResourceMonitor] = None
+        self.governor: Optional[ConcurrencyGovernor] = None
+        if resource_monitor:
+            self.resource_monitor = ResourceMonitor()
+            self.governor = ConcurrencyGovernor(self.pipeline, limits)
+            self.resource_monitor.add_listener(self.governor.on_sample)
+
+        # 요청 시작 간 최소 간격 (generate 작업자 공통)
+        self._min_request_interval = min_request_interval
+        self._request_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+        # 같은 작품의 중복 처리 방지 (카탈로그 파일 간 중복은 한 작업으로 합쳐 결과 공유)
+        self._state_lock = threading.Lock()
+        self.work_index: WorkIndex = processor.work_index
+        self._budget_waiting: List[Tuple[Dict, Optional[str]]] = []  # 진행 중 작품의 예약 해제를 기다리는 작품
+
+        # 작가 관점 Q&A는 작가별로 한 작업만 생성하고 같은 작가의 다른 작업은 결과를 기다려 공유
+        self.artist_cache = processor.artist_cache
+        self._artist_leaders: Dict[str, ArtworkJob] = {}        # 작가 키 → 작가 관점 배치를 생성 중인 작업
+        self._artist_waiters: Dict[str, List[ArtworkJob]] = {}  # 작가 키 → 기다리는 작업
+
+        self.success_count = 0
+        self.failure_count = 0
+        self.skipped_count = 0   # 격리 목록으로 건너뛴 작품
+        self.duplicate_count = 0   # 대표 버전이 아니거나 같은 키로 반복된 입력 항목
+        self.not_started: List[str] = []   # 실행 예산 부족으로 시작하지 않은 작품 키
+        self.interrupted: List[str] = []   # 실행 예산 소진으로 중단된 작품 키
+
+    # --- 실행 ---
+
+    def start(self) -> None:
+        metrics.REGISTRY.add_collector(self._collect_metrics)
+        self.pipeline.start()
+        if self.resource_monitor:
+            self.resource_monitor.start()
+
+    def stop(self) -> None:
+        if self.resource_monitor:
+            self.resource_monitor.stop()
+        self.pipeline.stop()
+        self.parse_pool.shutdown()
+        self._collect_metrics()   # 마지막 값(0) 기록 후 수집 해제
+        metrics.REGISTRY.remove_collector(self._collect_metrics)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        return self.pipeline.join(timeout)
+
+    def submit_file(self, json_file: Path) -> None:
+        """카탈로그 파일 투입 (ingest 단계)"""
+        self.pipeline.submit(json_file)
+
+    def submit_item(self, raw_item: Dict, change: Optional[str] = None) -> None:
+        """원본 아이템 직접 투입 (normalize 단계, change를 주면 매니페스트 대신 사용)"""
+        self.pipeline.submit((raw_item, change), stage="normalize")
+
+    def run_files(self, json_files: List[Path]) -> None:
+        """파일 목록을 끝까지 처리"""
+        self.start()
+        try:
+            for json_file in json_files:
+                self.submit_file(json_file)
+            self.join()
+        finally:
+            self.stop()
+
+    def queue_depths(self) -> Dict[str, int]:
+        return self.pipeline.queue_depths()
+
+    # --- 단계 핸들러 ---
+
+    def _ingest(self, json_file: Path, emit: Callable[[Any], None]) -> None:
+        """파일 로드 → 원본 아이템"""
+        items = self.processor.load_catalog_items(json_file)
+        for raw_item in items or []:
+            if isinstance(raw_item, dict):
+                emit((raw_item, None))
+
+    def _normalize(self, item: Tuple[Dict, Optional[str]], emit: Callable[[Any], None]) -> None:
+        """형식 변환, 변경 여부 판단, 기존 Q&A 로드 → 작품 작업"""
+        raw_item, forced_change = item
+        artwork, output_filename, artwork_key, change = self.processor.plan_item(raw_item)
+        self.processor.mark_seen(artwork_key)
+        if forced_change:
+            change = forced_change
+
+        if self.processor.is_stale_version(artwork_key, artwork):
+            # 같은 작품 키의 다른 카탈로그 항목(updated_at이 늦거나 앞 파일)이 대표 버전
+            self.logger.info(f"   🔗 다른 카탈로그 항목이 대표 버전 - 건너뜀: {artwork.label}")
+            self._count_duplicate()
+            return
+
+        if change == "unchanged":
+            self.logger.info(f"   ⏭️ 입력 변경 없음 - 건너뜀: {artwork.label}")
+            self.work_index.mark_done(artwork_key, artwork, output_filename)
+            self._count(success=True)
+            self._notify(artwork_key, True)
+            return
+
+        skip_reason = self.processor.quarantine_skip_reason(artwork_key, artwork)
+        if skip_reason:
+            self.logger.info(f"   🚫 {skip_reason} - 건너뜀: {artwork.label}")
+            with self._state_lock:
+                self.skipped_count += 1
+            metrics.ARTWORKS.inc(result="skipped")
+            self._notify_skipped(artwork_key, skip_reason)
+            return
+
+        with self._state_lock:
+            # 같은 작품(원본 id / 작가·작품명)이 처리 중이거나 이번 실행에서 끝났으면 그 결과를 공유
+            claim, work = self.work_index.claim(artwork_key, artwork, output_filename, item)
+            started = claim == CLAIM_LEADER and self.processor.begin_artwork(artwork_key)
+            if claim == CLAIM_LEADER and not started:
+                # 남은 예산으로 끝낼 수 없는 작품은 시작하지 않음 (진행 중 작품이 끝나면 다시 확인)
+                self.work_index.abandon(artwork_key)
+                if self.work_index.in_flight():
+                    self._budget_waiting.append(item)
+                    return
+                self.not_started.append(artwork_key)
+                metrics.ARTWORKS.inc(result="not_started")
+
+        if claim == CLAIM_FOLLOWER:
+            if work.key != artwork_key:
+                self.logger.info(f"   🔗 중복 작품 - 처리 중인 작업에 합류: {artwork.label} ({work.key})")
+            else:
+                self.logger.info(f"   🔗 같은 항목이 처리 중 - 건너뜀: {artwork.label}")
+                self._count_duplicate()
+            return
+        if claim == CLAIM_DEFERRED:
+            # 처리 중 수정된 버전 / 같은 출력 파일을 쓰는 다른 작품은 앞 작업이 끝난 뒤 다시 투입
+            return
+        if claim == CLAIM_DONE:
+            self.logger.info(f"   🔗 중복 작품 - 이번 실행의 결과 공유: {artwork.label} ({work.key})")
+            self._share(work.key, [(artwork_key, artwork)], success=True)
+            return
+
+        if not started:
+            self.logger.info(f"   ⏸️ 실행 예산 부족 - 시작하지 않음: {artwork.label}")
+            self._notify(artwork_key, False, "실행 예산 부족")
+            return
+
+        regenerate = change == "changed"
+        existing_qa = self.processor.load_existing_qa(artwork, output_filename, regenerate)
+        if existing_qa is None:
+            self._finish(artwork_key, success=True)
+            return
+
+        job = ArtworkJob(artwork, output_filename, artwork_key, regenerate, existing_qa,
+                         self.retry_policy.new_budget(artwork_key))
+        self.logger.info(f"📥 작품 작업 추가: {job.label} ({change})")
+        emit(job)
+
+    def _prompt(self, job: ArtworkJob, emit: Callable[[Any], None]) -> None:
+        """작품 작업 → 배치별 프롬프트 (작가 관점은 캐시가 있으면 생성하지 않음)"""
+        artist_mode, cached, plan = self._claim_artist(job)
+        batches = [self._build_batch(job, group) for group in group_batch_plan(plan)]
+        for batch in batches:
+            emit(batch)
+        if artist_mode == ARTIST_CACHED:
+            self._deliver_artist(job, cached)
+
+    def _build_batch(self, job: ArtworkJob, group: List[Tuple[str, str, int]]) -> BatchJob:
+        """요청 묶음(group_batch_plan) → 배치 작업 (배치가 여러 개면 응답 n개 요청)"""
+        _, batch_type, batch_size = group[0]
+        batch = BatchJob(job, group_label(group), batch_type, batch_size)
+        batch.choice_names = [batch_name for batch_name, _, _ in group]
+        batch.prompt = build_batch_prompt(batch_type, job.artwork, job.exclude_instructions, batch_size)
+        batch.prompt_hash = compute_prompt_hash(batch.prompt)
+        batch.max_tokens, batch.temperature, batch.top_p = batch_generation_params(batch_type, batch_size)
+        return batch
+
+    def _generate(self, batch: BatchJob, emit: Callable[[Any], None]) -> None:
+        """API 호출 (네트워크 전용 단계)"""
+        run_budget = self.processor.run_budget
+        if run_budget is not None and not run_budget.allow_request():
+            # 요청 간격 대기 없이 바로 중단 처리
+            batch.error = AX4BudgetError(f"실행 예산 소진: {run_budget.stop_reason}")
+            emit(batch)
+            return
+        self._wait_request_slot()
+        try:
+            responses = generate_choices_with_ax4_api(
+                prompt=batch.prompt,
+                max_tokens=batch.max_tokens,
+                temperature=batch.temperature,
+                n=len(batch.choice_names),
+                budget=batch.job.budget,
+                usage=batch.usage,
+                top_p=batch.top_p
+            )
+        except Exception as e:
+            batch.error = e if isinstance(e, AX4Error) else AX4Error(str(e))
+            self.logger.warning(f"   ⚠️ {batch.job.label} / {batch.batch_name} 생성 실패: {e}")
+            emit(batch)
+            return
+        for part in self._split_choices(batch, responses):
+            emit(part)
+
+    def _parse(self, batch: BatchJob, emit: Callable[[Any], None]) -> None:
+        """응답 파싱 및 항목 검증 (프로세스 풀 사용 시 별도 프로세스에서 실행)"""
+        if batch.response:
+            try:
+                if batch.repair_items is not None:
+                    # 수정 응답은 원래 항목과 순서로 짝지으므로 검증 없이 파싱만 (검증은 validate 단계)
+                    batch.parsed = parse_model_output(batch.response, REPAIR_PARSER_NAME) or []
+                else:
+                    parser_name = BATCH_TYPES[batch.batch_type][3]
+                    batch.parsed, batch.keys, parse_stats, batch.rejected = self.parse_pool.process(
+                        batch.response, parser_name, batch.job.rules, batch.batch_type
+                    )
+                    metrics.observe_parse(parse_stats)
+            except Exception as e:
+                batch.error = AX4ParseError(f"파싱 실패: {e}", raw_response=batch.response)
+            if not batch.parsed and batch.error is None:
+                batch.error = AX4ParseError("파싱된 Q&A 없음", raw_response=batch.response)
+            if batch.rejected:
+                reasons = ", ".join(f"{k} {v}" for k, v in count_reasons(batch.rejected).items())
+                self.logger.info(f"   🚫 {batch.job.label} / {batch.batch_name} 규칙 위반 {len(batch.rejected)}개 제외 ({reasons})")
+            if len(batch.parsed) < batch.batch_size // 2:  # 목표의 절반 이상
+                self.logger.warning(f"   ⚠️ 생성 부족: {len(batch.parsed)}/{batch.batch_size}개")
+        emit(batch)
+
+    def _validate(self, batch: BatchJob, emit: Callable[[Any], None]) -> None:
+        """작품 단위 중복 제거 후 결과를 모아 완료 여부 판단"""
+        job = batch.job
+
+        # 실패한 배치는 예산이 남아 있으면 그 배치만 다시 생성
+        if batch.error is not None and self.retry_policy.should_retry_batch(batch.error, job.budget):
+            self.logger.info(
+                f"   🔁 {job.label} / {batch.batch_name} 배치 재시도 "
+                f"({batch.error.kind}, 남은 예산 {job.budget.remaining}회)"
+            )
+            metrics.RETRIES.inc(level="batch")
+            batch.reset()
+            self.pipeline.requeue("generate", batch)
+            return
+
+        if not batch.cached and batch.usage["requests"]:
+            self.processor.record_usage(job.artwork_key, batch.batch_type, batch.batch_name, batch.usage)
+        repair_items = []
+        with job.lock:
+            if batch.error is not None:
+                job.failures.append(batch.error)
+            elif batch.repair_items is not None:
+                self._merge_repair(batch)
+            elif batch.cached:
+                # 캐시 항목은 검증/메타 부착이 끝난 상태 - 이 작품의 다른 질문과 중복만 제거
+                accepted = dedup_qna(batch.parsed, job.seen_instructions)
+                job.records.extend(accepted)
+                metrics.QA_ITEMS.inc(len(accepted), result="cached")
+            else:
+                if len(batch.parsed) < batch.batch_size // 2:
+                    job.short_response = batch.response
+                accepted = dedup_qna(batch.parsed, job.seen_instructions, batch.keys)
+                for item in accepted:
+                    job.records.append(item.set_meta(batch.batch_type, batch.batch_name, batch.prompt_hash))
+                for item, _ in batch.rejected:
+                    item.set_meta(batch.batch_type, batch.batch_name, batch.prompt_hash)
+                job.rejected.extend(batch.rejected)
+                metrics.QA_ITEMS.inc(len(batch.parsed) - len(accepted), result="dropped_duplicate")
+                metrics.QA_ITEMS.inc(len(accepted), result="accepted")
+            job.pending -= len(batch.choice_names)   # 실패한 다중 응답 요청은 묶인 배치 수만큼
+            if job.pending > 0:
+                return
+            if not job.repair_requested:
+                # 모든 배치가 끝나면 위반 항목만 모아 한 번 수정 요청
+                repair_items = select_repairable(job.rejected)
+                if repair_items and not self.retry_policy.allow_repair(job.budget):
+                    self.logger.info(f"   🩹 재시도 예산 소진 - 규칙 위반 {len(repair_items)}개 수정 요청 생략: {job.label}")
+                    repair_items = []
+                if repair_items:
+                    job.repair_requested = True
+                    job.pending = 1
+            record_count = len(job.records)
+
+        if repair_items:
+            self._request_repair(job, repair_items)
+            return
+
+        if record_count >= MIN_PARSED_QA_COUNT:
+            emit(job)
+            return
+
+        self.logger.warning(
+            f"   ⚠️ 생성 부족: {job.label} {record_count}/{MIN_PARSED_QA_COUNT}개 "
+            f"(시도 {job.attempt}/{self.retry_policy.max_artwork_attempts}, 남은 예산 {job.budget.remaining}회)"
+        )
+        if any(f.kind == "budget" for f in job.failures):
+            # 실행 예산 소진: 실패로 기록하지 않고 다음 실행에서 이어서 생성
+            self.logger.warning(f"   ⏸️ 실행 예산 소진으로 중단: {job.label}")
+            self._release_artist(job)
+            followers = self._release(job.artwork_key)
+            for artwork_key in [job.artwork_key] + [key for key, _ in followers]:
+                with self._state_lock:
+                    self.interrupted.append(artwork_key)
+                metrics.ARTWORKS.inc(result="interrupted")
+                self._notify(artwork_key, False, "실행 예산 소진")
+            return
+
+        if self.retry_policy.should_retry_artwork(job.attempt, job.budget, len(get_batch_plan())):
+            metrics.RETRIES.inc(level="artwork")
+            job.attempt += 1
+            job.reset()
+            self.pipeline.requeue("prompt", job)
+            return
+
+        self.logger.error(f"❌ 작품 처리 실패: {job.label} ({job.attempt}회 시도 후 포기)")
+        self.processor.record_failure(job.artwork, job.output_filename, job.existing_qa, job.regenerate,
+                                      job.failures, job.short_response)
+        self._release_artist(job)
+        self._finish(job.artwork_key, success=False,
+                     error=f"생성 부족: {record_count}/{MIN_PARSED_QA_COUNT}개")
+
+    def _persist(self, job: ArtworkJob, emit: Callable[[Any], None]) -> None:
+        """출력 파일/저장소/매니페스트 기록 (직접 생성한 작가 관점 Q&A는 작가 캐시에도 저장)"""
+        try:
+            self.processor.save_results(
+                job.artwork, job.output_filename, job.existing_qa, job.records, job.regenerate
+            )
+        except Exception as e:
+            self.logger.error(f"❌ 결과 저장 실패: {job.label}: {e}")
+            self._release_artist(job)
+            self._finish(job.artwork_key, success=False, error=f"결과 저장 실패: {e}")
+            return
+        if not job.artist_shared:
+            self.processor.cache_artist_qa(job.artwork, job.artwork_key, job.records)
+        self._release_artist(job)
+        self._finish(job.artwork_key, success=True)
+
+    # --- 내부 ---
+
+    def _claim_artist(self, job: ArtworkJob) -> Tuple[str, Optional[List[QARecord]], List[Tuple[str, str, int]]]:
+        """
+        작가 관점 배치 처리 방식 결정 → (ARTIST_*, 캐시 항목, 생성할 배치 계획)
+
+        대기 등록과 같은 임계 구역에서 job.pending/artist_shared를 설정 (먼저 끝난 작업의 전달/대체 생성이
+        덮어쓰이지 않도록)
+        """
+        artist_key = artist_cache_key(job.artwork) if self.artist_cache is not None else None
+        with self._state_lock:
+            leader = None
+            cached = self.artist_cache.get(job.artwork) if artist_key is not None else None
+            if artist_key is None:
+                artist_mode = ARTIST_GENERATE
+            elif cached:
+                artist_mode = ARTIST_CACHED
+            else:
+                leader = self._artist_leaders.get(artist_key)
+                if leader is None:
+                    self._artist_leaders[artist_key] = job
+                    artist_mode = ARTIST_GENERATE
+                elif leader is job or artist_fingerprint(leader.artwork) != artist_fingerprint(job.artwork):
+                    # 작가 정보가 다르면 기다리지 않고 직접 생성
+                    artist_mode = ARTIST_GENERATE
+                else:
+                    self._artist_waiters.setdefault(artist_key, []).append(job)
+                    artist_mode = ARTIST_WAIT
+            plan = [
+                entry for entry in get_batch_plan()
+                if entry[1] != ARTIST_PERSPECTIVE or artist_mode == ARTIST_GENERATE
+            ]
+            with job.lock:
+                job.artist_shared = artist_mode != ARTIST_GENERATE
+                job.pending = len(plan) + (1 if job.artist_shared else 0)   # 다중 응답 요청도 배치별로 집계
+        if artist_mode == ARTIST_CACHED:
+            self.logger.info(f"   ♻️ {job.label} 작가 Q&A 캐시 사용 ({len(cached)}개)")
+        elif artist_mode == ARTIST_WAIT:
+            self.logger.info(f"   ⏳ {job.label} 작가 Q&A는 같은 작가 작업 결과 사용 예정 ({leader.label})")
+        return artist_mode, cached, plan
+
+    def _deliver_artist(self, job: ArtworkJob, records: List[QARecord]) -> None:
+        """캐시된 작가 관점 Q&A를 배치로 만들어 validate 단계로 보냄"""
+        batch = BatchJob(job, ARTIST_CACHE_BATCH_NAME, ARTIST_PERSPECTIVE, len(records))
+        batch.cached = True
+        batch.parsed = records
+        self.pipeline.requeue("validate", batch)
+
+    def _release_artist(self, job: ArtworkJob) -> None:
+        """작가 관점 생성 작업 종료 - 기다리던 작업에 캐시 전달 (캐시가 없으면 각자 작가 관점 배치 생성)"""
+        if self.artist_cache is None:
+            return
+        artist_key = artist_cache_key(job.artwork)
+        with self._state_lock:
+            if artist_key is None or self._artist_leaders.get(artist_key) is not job:
+                return
+            del self._artist_leaders[artist_key]
+            waiters = self._artist_waiters.pop(artist_key, [])
+        for waiter in waiters:
+            cached = self.artist_cache.get(waiter.artwork)
+            if cached:
+                self.logger.info(f"   ♻️ {waiter.label} 작가 Q&A 캐시 사용 ({len(cached)}개)")
+                self._deliver_artist(waiter, cached)
+                continue
+            self.logger.info(f"   🔁 {waiter.label} 같은 작가 작업에서 작가 Q&A를 얻지 못해 직접 생성")
+            plan = [entry for entry in get_batch_plan() if entry[1] == ARTIST_PERSPECTIVE]
+            batches = [self._build_batch(waiter, group) for group in group_batch_plan(plan)]
+            with waiter.lock:
+                waiter.artist_shared = False
+                waiter.pending += len(plan) - 1
+            for batch in batches:
+                self.pipeline.requeue("generate", batch)
+
+    def _split_choices(self, batch: BatchJob, responses: List[str]) -> List[BatchJob]:
+        """
+        다중 응답을 배치별 작업으로 나눔 (이후 단계는 배치 하나씩 파싱/검증/중복 제거)
+
+        받지 못한 응답(n 미지원/빈 응답)의 배치는 같은 프롬프트로 generate 단계에 다시 보냄
+        """
+        if len(batch.choice_names) == 1:
+            batch.response = responses[0]
+            return [batch]
+
+        # 요청 사용량은 묶음 이름으로 한 번 기록 (나눈 배치는 재시도분만 기록)
+        job = batch.job
+        self.processor.record_usage(job.artwork_key, batch.batch_type, batch.batch_name, batch.usage)
+        parts = []
+        for index, batch_name in enumerate(batch.choice_names):
+            part = BatchJob(job, batch_name, batch.batch_type, batch.batch_size)
+            part.prompt, part.prompt_hash = batch.prompt, batch.prompt_hash
+            part.max_tokens, part.temperature, part.top_p = batch.max_tokens, batch.temperature, batch.top_p
+            if index < len(responses):
+                part.response = responses[index]
+                parts.append(part)
+            else:
+                self.pipeline.requeue("generate", part)
+        if len(responses) < len(batch.choice_names):
+            self.logger.info(
+                f"   ↪️ {job.label} / {batch.batch_name}: 응답 {len(responses)}/{len(batch.choice_names)}개 "
+                f"- 나머지 {len(batch.choice_names) - len(responses)}개 배치는 따로 요청"
+            )
+        return parts
+
+    def _request_repair(self, job: ArtworkJob, items: List[Tuple[QARecord, List[str]]]) -> None:
+        """규칙 위반 항목 수정 요청 배치를 generate 단계로 보냄 (작품마다 한 번)"""
+        batch = BatchJob(job, REPAIR_BATCH_NAME, REPAIR_BATCH_TYPE, len(items))
+        batch.repair_items = items
+        batch.prompt = build_repair_prompt(job.artwork, items)
+        batch.prompt_hash = compute_prompt_hash(batch.prompt)
+        batch.max_tokens, batch.temperature = repair_generation_params(len(items))
+        self.logger.info(f"   🩹 {job.label} 규칙 위반 {len(items)}개 수정 요청")
+        self.pipeline.requeue("generate", batch)
+
+    def _merge_repair(self, batch: BatchJob) -> None:
+        """수정 응답을 다시 검증하여 작품 결과에 합침 (job.lock 안에서 호출)"""
+        job = batch.job
+        fixed = merge_repaired_items(batch.repair_items, batch.parsed, job.rules, batch.prompt_hash)
+        accepted = dedup_qna(fixed, job.seen_instructions)
+        job.records.extend(accepted)
+        metrics.QA_ITEMS.inc(len(accepted), result="repaired")
+        self.logger.info(f"   🩹 {job.label} 수정 {len(batch.repair_items)}개 중 {len(accepted)}개 복구")
+
+    def _wait_request_slot(self) -> None:
+        """요청 시작 간격 제한"""
+        if self._min_request_interval <= 0:
+            return
+        with self._request_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self._min_request_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def _count(self, success: bool) -> None:
+        metrics.ARTWORKS.inc(result="success" if success else "failure")
+        with self._state_lock:
+            if success:
+                self.success_count += 1
+            else:
+                self.failure_count += 1
+
+    def _count_duplicate(self) -> None:
+        metrics.ARTWORKS.inc(result="duplicate")
+        with self._state_lock:
+            self.duplicate_count += 1
+
+    def _finish(self, artwork_key: str, success: bool, error: str = "") -> None:
+        """작품 처리 종료 (집계 → 처리 중 해제 → 완료 알림 → 합류한 중복 작품에 결과 공유)"""
+        self._count(success)
+        followers = self._release(artwork_key, success)
+        self._notify(artwork_key, success, error)
+        self._share(artwork_key, followers, success, error)
+
+    def _share(self, leader_key: str, followers: List[Tuple[str, ArtworkRecord]],
+               success: bool, error: str = "") -> None:
+        """같은 작품 작업의 결과를 중복 작품에 전달 (매니페스트 기록 + 집계 + 완료 알림)"""
+        for artwork_key, artwork in followers:
+            if success:
+                self.processor.share_result(artwork, artwork_key, leader_key)
+            self._count(success)
+            self._notify(artwork_key, success, error)
+
+    def _collect_metrics(self) -> None:
+        """내보내기 시점의 단계별 큐 깊이/작업 중 수"""
+        for name, stats in self.pipeline.stats().items():
+            metrics.QUEUE_DEPTH.set(stats["queued"], stage=name)
+            metrics.STAGE_BUSY.set(stats["busy"], stage=name)
+            metrics.STAGE_WORKERS.set(stats["workers"], stage=name)
+
+    def _notify(self, artwork_key: str, success: bool, error: str = "") -> None:
+        if self.on_artwork_done is None:
+            return
+        try:
+            self.on_artwork_done(artwork_key, success, error)
+        except Exception as e:
+            self.logger.error(f"❌ 완료 알림 처리 실패 ({artwork_key}): {e}")
+
+    def _notify_skipped(self, artwork_key: str, reason: str) -> None:
+        if self.on_artwork_skipped is None:
+            return
+        try:
+            self.on_artwork_skipped(artwork_key, reason)
+        except Exception as e:
+            self.logger.error(f"❌ 건너뜀 알림 처리 실패 ({artwork_key}): {e}")
+
+    def _release(self, artwork_key: str, success: bool = False) -> List[Tuple[str, ArtworkRecord]]:
+        """
+        작품 처리 중 해제 - 보류된 작품(처리 중 수정된 버전 등)과 예산 대기 작품을 다시 투입
+
+        Returns:
+            결과를 공유할 중복 작품 목록
+        """
+        self.processor.end_artwork(artwork_key)
+        with self._state_lock:
+            followers, deferred = self.work_index.complete(artwork_key, success)
+            waiting, self._budget_waiting = self._budget_waiting, []
+        for item in deferred:
+            self.pipeline.requeue("normalize", item)
+        for waiting_item in waiting:
+            self.pipeline.requeue("normalize", waiting_item)
+        return followers
@@ -4,31 +4,74 @@ A.X 4.0 API 프로세서 - CCB Dataset Transformer
 """
 
 import json
+import os
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from utils.logger import setup_logger
 from utils.file_processor import FileProcessor
-from utils.common import load_json_file, ensure_directory, save_output_json, get_memory_info, check_memory_safety
-from models.ax4_api_agent import generate_all_qa_batch
+from utils.catalog_watcher import CatalogWatcher
+from utils.common import load_json_file, ensure_directory, save_output_json, get_memory_info
+from utils.qa_store import QAStore, make_artwork_key, LEGACY_PERSPECTIVE
+from utils.job_queue import JobQueue
+from utils.quarantine import Quarantine
+from utils.work_index import WorkIndex, CLAIM_DONE
+from utils.artist_qa_cache import ArtistQACache, ARTIST_PERSPECTIVE
+from utils.qna_validator import dedup_qna, normalize_instruction
+from utils.run_budget import RunBudget
+from utils.usage import UsageTracker
+from utils.metrics import MetricsExporter, RETRIES, QA_ITEMS
+from utils.profiler import profiled
+from utils.generation_profile import GenerationProfile, load_profile
+from utils.records import ArtworkRecord, QARecord, split_output_items
+from utils.output_manifest import (
+    OutputManifest, compute_item_fingerprint, STATUS_COMPLETE, STATUS_FAILED
+)
+from models.ax4_api_agent import (
+    generate_all_qa_records, get_retry_policy, get_hedge_stats, set_run_budget, set_multi_choice,
+    group_batch_plan, get_batch_plan, set_generation_profile
+)
+from processors.ax4_pipeline import AX4Pipeline
 from config import (
     FINAL_OUTPUT_DIR, DATA_DIR, FILE_WAIT_TIMEOUT, FILE_CHECK_INTERVAL,
-    MAX_MODEL_ATTEMPTS, MIN_PARSED_QA_COUNT, MAX_REGENERATION_ATTEMPTS
+    MIN_PARSED_QA_COUNT, MAX_REGENERATION_ATTEMPTS, TARGET_QA_COUNT,
+    PERSPECTIVE_QUOTAS, QA_STORE_ENABLED, QA_STORE_PATH, OUTPUT_MANIFEST_PATH,
+    WATCH_POLL_INTERVAL, WATCH_DEBOUNCE_SECONDS, PIPELINE_ENABLED,
+    JOB_QUEUE_LEASE_SECONDS, JOB_QUEUE_HEARTBEAT_INTERVAL, JOB_QUEUE_MAX_ATTEMPTS,
+    JOB_QUEUE_MAX_LEASED, JOB_QUEUE_POLL_INTERVAL,
+    QUARANTINE_PATH, QUARANTINE_AFTER_FAILURES, QUARANTINE_MAX_RAW_CHARS, LONG_TEXT_WARNING_CHARS,
+    HEDGE_ENABLED, MULTI_CHOICE_ENABLED, DEFAULT_GENERATION_PROFILE, RUN_TIME_BUDGET_SECONDS, RUN_REQUEST_BUDGET, RUN_TOKEN_BUDGET,
+    RUN_ARTWORK_TOKEN_ESTIMATE, RUN_CHECKPOINT_PATH,
+    USAGE_COST_PER_1K_PROMPT_TOKENS, USAGE_COST_PER_1K_COMPLETION_TOKENS, USAGE_COST_CURRENCY,
+    USAGE_REPORT_DIR, USAGE_IN_OUTPUT_METADATA,
+    METRICS_TEXTFILE_PATH, METRICS_JSON_PATH, METRICS_EXPORT_INTERVAL,
+    ARTIST_QA_CACHE_ENABLED, ARTIST_QA_CACHE_PATH
 )
 
 
 class AX4Processor:
     """A.X 4.0 API 기반 CCB Dataset 처리기"""
     
-    def __init__(self, fast_mode: bool = True):
+    def __init__(self, profile: Optional[GenerationProfile] = None, use_store: Optional[bool] = None,
+                 retry_quarantined: bool = False, time_budget: Optional[float] = None,
+                 request_budget: Optional[int] = None, token_budget: Optional[int] = None,
+                 metrics_textfile: Optional[Path] = None, multi_choice: Optional[bool] = None):
         """
         초기화
         
         Args:
-            fast_mode: 고속 모드 여부 (기본: True)
+            profile: 생성 프로필 (None이면 config의 DEFAULT_GENERATION_PROFILE)
+            use_store: SQLite Q&A 저장소 사용 여부 (None이면 config의 QA_STORE_ENABLED)
+            retry_quarantined: 격리된 작품만 다시 시도 (기본: 격리된 작품은 건너뜀)
+            time_budget / request_budget / token_budget: 실행 예산 (초/요청 수/토큰 수, None이면 config 값)
+            metrics_textfile: Prometheus textfile 경로 (None이면 config의 METRICS_TEXTFILE_PATH)
+            multi_choice: 같은 관점 배치를 다중 응답 요청 하나로 생성 (None이면 config의 MULTI_CHOICE_ENABLED)
         """
-        self.fast_mode = fast_mode
+        self.profile = profile or load_profile(DEFAULT_GENERATION_PROFILE)
+        set_generation_profile(self.profile)
+        self.retry_quarantined = retry_quarantined
         self.logger = setup_logger("AX4Processor")
         self.file_processor = FileProcessor()
         
@@ -36,49 +79,116 @@ class AX4Processor:
         ensure_directory(FINAL_OUTPUT_DIR)
         ensure_directory(DATA_DIR)
         
-        mode_str = "⚡ 고속 모드" if fast_mode else "🎯 정밀 모드"
-        self.logger.info(f"AX4Processor 초기화 완료 ({mode_str})")
+        # Q&A 저장소 (선택)
+        if use_store is None:
+            use_store = QA_STORE_ENABLED
+        self.store = QAStore(QA_STORE_PATH) if use_store else None
+        if self.store:
+            self.logger.info(f"🗄️ Q&A 저장소 사용: {QA_STORE_PATH}")
+        
+        # 입력 지문 매니페스트 (증분 재생성)
+        self.manifest = OutputManifest(OUTPUT_MANIFEST_PATH)
+        self.record_manifest = True  # 공유 작업 큐 모드에서는 큐가 지문/상태를 기록
+        
+        # 반복 실패 작품 격리 목록
+        self.quarantine = Quarantine(QUARANTINE_PATH, QUARANTINE_AFTER_FAILURES, QUARANTINE_MAX_RAW_CHARS)
+        
+        # 작가 관점 Q&A 캐시 (같은 작가의 다른 작품은 작가 관점 배치를 생성하지 않음)
+        self.artist_cache = ArtistQACache(
+            ARTIST_QA_CACHE_PATH, PERSPECTIVE_QUOTAS[ARTIST_PERSPECTIVE]
+        ) if ARTIST_QA_CACHE_ENABLED else None
+        self._seen_keys = set()
+        self._catalog_complete = True
+        self.work_index = WorkIndex()   # 카탈로그 파일 간 중복 작품을 한 작업으로 합침
+        self.canonical_versions: Dict[str, Tuple[str, str]] = {}   # 작품 키 → (updated_at, 대표 버전 지문)
+        self._passthrough_items: Dict[str, List] = {}   # 출력 파일명 → Q&A가 아닌 기존 항목 (저장 시 그대로 유지)
+        self._not_started: List[str] = []   # 실행 예산 부족으로 시작하지 않은 작품 키
+        self._interrupted: List[str] = []   # 실행 예산 소진으로 중단된 작품 키
+        
+        self.logger.info(f"AX4Processor 초기화 완료 ({self.profile.label}, 프로필 {self.profile.mode})")
+        self.logger.info(
+            f"🎛️ 생성 프로필: 배치 {len(self.profile.batch_plan)}개, 동시 요청 {self.profile.generate_workers}개, "
+            f"요청 간격 {self.profile.min_request_interval}초, 타임아웃 {self.profile.request_timeout}초"
+        )
+        
+        # 다중 응답 요청 (같은 관점의 반복 배치를 요청 하나로)
+        set_multi_choice(MULTI_CHOICE_ENABLED if multi_choice is None else multi_choice)
+        batch_plan = get_batch_plan()
+        batch_requests = len(group_batch_plan(batch_plan))
+        if batch_requests < len(batch_plan):
+            self.logger.info(
+                f"🧩 다중 응답 요청 사용: 배치 {len(batch_plan)}개 → 작품당 요청 {batch_requests}회 "
+                f"(n을 거부한 요청은 응답 1개로 다시 요청)"
+            )
+        
+        policy = get_retry_policy()
+        self.logger.info(
+            f"🔁 재시도 정책: 작품당 최대 {policy.max_requests_per_artwork(len(batch_plan))}회 요청, "
+            f"실행 전체 재시도 {policy.run_budget}회"
+        )
+        
+        # 토큰 사용량 / 비용 집계
+        self.usage = UsageTracker(
+            USAGE_COST_PER_1K_PROMPT_TOKENS, USAGE_COST_PER_1K_COMPLETION_TOKENS, USAGE_COST_CURRENCY
+        )
+        
+        # 지표 파일 (실행 중 주기적으로 + 종료 시 저장)
+        self.metrics_exporter = MetricsExporter(
+            metrics_textfile or METRICS_TEXTFILE_PATH, METRICS_JSON_PATH, METRICS_EXPORT_INTERVAL
+        )
+        
+        # 실행 예산 (시간/요청/토큰) - 설정된 경우에만 요청 전 확인
+        run_budget = RunBudget(
+            time_budget if time_budget is not None else RUN_TIME_BUDGET_SECONDS,
+            request_budget if request_budget is not None else RUN_REQUEST_BUDGET,
+            token_budget if token_budget is not None else RUN_TOKEN_BUDGET,
+            artwork_requests=batch_requests,
+            artwork_tokens=RUN_ARTWORK_TOKEN_ESTIMATE
+        )
+        self.run_budget = run_budget if run_budget.enabled else None
+        set_run_budget(self.run_budget)
+        if self.run_budget:
+            self.logger.info(
+                f"⏱️ 실행 예산: 시간 {run_budget.time_seconds or '-'}초, "
+                f"요청 {run_budget.max_requests or '-'}회, 토큰 {run_budget.max_tokens or '-'}개"
+            )
     
-    def convert_item_to_artwork_format(self, raw_item: Dict) -> Dict:
-        """원본 데이터 아이템을 작품 형식으로 변환"""
+    def convert_item_to_artwork_format(self, raw_item: Dict) -> ArtworkRecord:
+        """원본 데이터 아이템을 작품 레코드로 변환"""
         try:
             # artist_info JSON 파싱
             artist_metadata = {}
+            input_warnings = []
             raw_artist_info = raw_item.get('artist_info', '')
             if raw_artist_info:
                 try:
                     artist_metadata = json.loads(raw_artist_info)
                 except json.JSONDecodeError:
                     self.logger.warning(f"artist_info JSON 파싱 실패")
+                    input_warnings.append("artist_info JSON 파싱 실패")
+            for field in ("artist_note", "description"):
+                text_length = len(raw_item.get(field) or "")
+                if text_length > LONG_TEXT_WARNING_CHARS:
+                    input_warnings.append(f"{field} 길이 {text_length}자")
             
             # 변환된 작품 데이터
-            artwork = {
-                "작가": raw_item.get("artist_name", "Unknown"),
-                "영문작가명": raw_item.get("artist_name_eng", ""),
-                "국적": raw_item.get("nationality", ""),
-                "출생년도": artist_metadata.get("birth", ""),
-                "제목": raw_item.get("title", "Unknown"),
-                "영문제목": raw_item.get("title_eng", ""),
-                "크기": raw_item.get("size", ""),
-                "무게": raw_item.get("weight", ""),
-                "제작년도": raw_item.get("year", ""),
-                "재료": raw_item.get("materials", ""),
-                "작가노트": raw_item.get("artist_note", ""),
-                "작품설명": raw_item.get("description", ""),
-                "전시이력": artist_metadata.get("exhibits", []),
-                "수상이력": artist_metadata.get("awards", [])
-            }
-            
-            return artwork
+            return ArtworkRecord.from_raw(
+                raw_item, artist_metadata, compute_item_fingerprint(raw_item), input_warnings
+            )
             
         except Exception as e:
             self.logger.error(f"데이터 변환 실패: {e}")
             # 최소 데이터로 폴백
-            return {
-                "작가": raw_item.get("artist_name", "Unknown"),
-                "제목": raw_item.get("title", "Unknown"),
-                "재료": raw_item.get("materials", "다양한 재료")
-            }
+            return ArtworkRecord(
+                raw_item.get("artist_name", "Unknown"),
+                raw_item.get("title", "Unknown"),
+                materials=raw_item.get("materials", "다양한 재료"),
+                nationality="N/A", birth_year="N/A", year="N/A",
+                item_id=raw_item.get("id"),
+                item_no=raw_item.get("no"),
+                updated_at=raw_item.get("updated_at"),
+                fingerprint=compute_item_fingerprint(raw_item)
+            )
     
     def sanitize_filename(self, filename: str) -> str:
         """파일명 안전화"""
@@ -93,79 +203,377 @@ class AX4Processor:
         
         return safe_name if safe_name else "Unknown"
     
-    def process_artwork(self, artwork: Dict, output_filename: str) -> Optional[str]:
+    def build_output_filename(self, artwork: ArtworkRecord) -> str:
+        """출력 파일명 생성 (작가명_작품명.json)"""
+        safe_artist = self.sanitize_filename(artwork.artist)
+        safe_title = self.sanitize_filename(artwork.title)
+        return f"{safe_artist}_{safe_title}.json"
+    
+    def plan_item(self, raw_item: Dict) -> Tuple[ArtworkRecord, str, str, str]:
+        """원본 아이템 변환 후 (작품, 출력 파일명, 작품 키, 변경 분류) 반환"""
+        artwork = self.convert_item_to_artwork_format(raw_item)
+        output_filename = self.build_output_filename(artwork)
+        artwork_key = make_artwork_key(artwork, output_filename)
+        change = self.manifest.classify(artwork_key, artwork.fingerprint)
+        return artwork, output_filename, artwork_key, change
+    
+    def scan_catalog_versions(self, json_files: List[Path]) -> None:
         """
-        단일 작품 처리
-        
-        Args:
-            artwork: 작품 정보 딕셔너리
-            output_filename: 출력 파일명
+        여러 카탈로그 파일에 같은 작품 키가 다른 내용으로 있을 때 대표 버전 선택
+        - updated_at이 가장 늦은 버전, 같으면 파일명 순서상 앞 파일의 버전
+        - 나머지 버전은 처리하지 않음 (파일 처리 순서에 따라 실행마다 재생성되지 않도록)
+        """
+        versions: Dict[str, Tuple[str, str]] = {}
+        for json_file in sorted(json_files):
+            data = load_json_file(json_file)
+            items = data.get("items") if isinstance(data, dict) else None
+            if not isinstance(items, list):
+                continue
+            for raw_item in items:
+                if not isinstance(raw_item, dict):
+                    continue
+                artwork, _, artwork_key, _ = self.plan_item(raw_item)
+                updated_at = str(artwork.updated_at or "")
+                current = versions.get(artwork_key)
+                if current is None or updated_at > current[0]:
+                    versions[artwork_key] = (updated_at, artwork.fingerprint)
+        self.canonical_versions = versions
+    
+    def is_stale_version(self, artwork_key: str, artwork: ArtworkRecord) -> bool:
+        """같은 작품 키의 대표 버전이 다른 카탈로그 항목인지 여부"""
+        canonical = self.canonical_versions.get(artwork_key)
+        return canonical is not None and canonical[1] != artwork.fingerprint
+    
+    def load_existing_qa(self, artwork: ArtworkRecord, output_filename: str,
+                         regenerate: bool = False) -> Optional[List[QARecord]]:
+        """
+        이어서 생성할 기존 Q&A 로드
         
         Returns:
-            성공 시 출력 파일 경로, 실패 시 None
+            기존 Q&A 목록 (목표를 이미 채워 건너뛸 작품이면 None)
         """
-        self.logger.info(f"📝 작품 처리 시작: {artwork.get('제목', 'Unknown')}")
-        
-        # 메모리 체크 (간소화)
-        status, available, _ = check_memory_safety()
-        if status != "SAFE":
-            self.logger.warning(f"⚠️ 메모리 상태: {status} (사용가능: {available:.1f}GB)")
-        
-        # 기존 파일 확인 (이어서 생성 로직)
         output_path = FINAL_OUTPUT_DIR / output_filename
+        artwork_key = make_artwork_key(artwork, output_filename)
         existing_qa = []
         
+        # 출력 파일의 Q&A가 아닌 항목은 재생성/저장소 사용 여부와 관계없이 그대로 유지
+        file_qa = []
+        self._passthrough_items.pop(output_filename, None)
         if output_path.exists():
             try:
                 existing_data = load_json_file(output_path)
                 if isinstance(existing_data, list):
-                    existing_qa = existing_data
-                    self.logger.info(f"   📂 기존 Q&A {len(existing_qa)}개 발견")
+                    file_qa, passthrough = split_output_items(existing_data)
+                    if passthrough:
+                        self._passthrough_items[output_filename] = passthrough
+                        self.logger.info(f"   📎 Q&A 형식이 아닌 기존 항목 {len(passthrough)}개 유지")
             except Exception as e:
                 self.logger.warning(f"   ⚠️ 기존 파일 로드 실패: {e}")
         
-        # Q&A 생성 시도
-        success = False
+        if regenerate:
+            self.logger.info(f"   ♻️ 입력 변경 감지 - 기존 Q&A를 대체하여 재생성 ({artwork_key})")
+            return existing_qa
+        
+        if self.store:
+            # 저장소가 있으면 인덱스 쿼리로 진행 상황 확인
+            if self.store.is_complete(artwork_key, PERSPECTIVE_QUOTAS):
+                self.logger.info(f"   ⏭️ 목표 Q&A 달성 - 건너뜀 ({artwork_key})")
+                return None
+            existing_qa = self.store.get_qa_items(artwork_key)
+            if existing_qa:
+                self.logger.info(f"   🗄️ 저장소에서 기존 Q&A {len(existing_qa)}개 발견")
+                # 저장소에는 출력 형식 필드만 있으므로 출력 파일의 원본 항목(추가 키 / question·answer)을 다시 연결
+                raw_items = {(r.instruction, r.output): r.raw for r in file_qa if r.raw is not None}
+                for record in existing_qa if raw_items else []:
+                    record.raw = raw_items.get((record.instruction, record.output))
+        
+        if not existing_qa and file_qa:
+            existing_qa = file_qa
+            self.logger.info(f"   📂 기존 Q&A {len(existing_qa)}개 발견")
+            if self.store:
+                # 저장소 도입 이전 파일은 관점 정보 없이 가져옴
+                try:
+                    for record in existing_qa:
+                        record.perspective = LEGACY_PERSPECTIVE
+                    self.store.upsert_artwork(artwork_key, artwork, output_filename)
+                    self.store.add_qa_items(artwork_key, artwork, existing_qa)
+                except Exception as e:
+                    self.logger.warning(f"   ⚠️ 기존 Q&A 저장소 등록 실패: {e}")
+        
+        return existing_qa
+    
+    @profiled("io.save_results")
+    def save_results(self, artwork: ArtworkRecord, output_filename: str, existing_qa: List[QARecord],
+                     generated_records: List[QARecord], regenerate: bool = False) -> str:
+        """생성된 Q&A 저장 (출력 파일 + 저장소 + 매니페스트)"""
+        output_path = FINAL_OUTPUT_DIR / output_filename
+        artwork_key = make_artwork_key(artwork, output_filename)
+        
+        # 기존 항목과 결합하여 최종 출력 저장 (레코드를 출력 형식으로 바로 직렬화, 기존 항목은 원본 그대로)
+        all_qa = self._passthrough_items.pop(output_filename, []) + existing_qa + generated_records
+        save_output_json(all_qa, output_path)
+        
+        if self.store:
+            if regenerate:
+                self.store.delete_qa_items(artwork_key)
+            self.store.upsert_artwork(artwork_key, artwork, output_filename, STATUS_COMPLETE)
+            self.store.add_qa_items(artwork_key, artwork, generated_records)
+        if self.record_manifest:
+            usage = self.usage.artwork_usage(artwork_key) if USAGE_IN_OUTPUT_METADATA else None
+            self.manifest.record(artwork_key, artwork, output_filename, STATUS_COMPLETE, len(all_qa), usage)
+            if self.quarantine.clear(artwork_key):
+                self.logger.info(f"   🔓 격리 해제: {artwork_key}")
+        
+        self.logger.info(f"   ✅ Q&A 생성 완료: 신규 {len(generated_records)}개, 총 {len(all_qa)}개")
+        return str(output_path)
+    
+    def cache_artist_qa(self, artwork: ArtworkRecord, artwork_key: str, records: List[QARecord]) -> bool:
+        """
+        작품에서 생성한 작가 관점 Q&A를 작가 캐시에 저장 (목표 개수를 채운 경우만)
+        
+        공유 작업 큐 모드에서는 노드마다 시작 시 읽은 사본으로 공유 파일을 덮어쓰므로 메모리에만 반영
+        """
+        if self.artist_cache is None or not self.artist_cache.put(
+            artwork, records, artwork_key, save=self.record_manifest
+        ):
+            return False
+        self.logger.info(f"   🗂️ 작가 Q&A 캐시 저장: {artwork.artist}")
+        return True
+    
+    def share_result(self, artwork: ArtworkRecord, artwork_key: str, leader_key: str) -> None:
+        """중복 작품에 같은 작품 작업의 완료 결과를 기록 (다음 실행에서 입력 변경 없음으로 건너뜀)"""
+        if not self.record_manifest:
+            return
+        entry = self.manifest.get(leader_key)
+        if not entry or entry.get("status") != STATUS_COMPLETE:
+            return
+        self.manifest.record(artwork_key, artwork, entry["output_file"], STATUS_COMPLETE, entry.get("qa_count"))
+    
+    def record_failure(self, artwork: ArtworkRecord, output_filename: str, existing_qa: List[QARecord],
+                       regenerate: bool = False, failures: Optional[List[Exception]] = None,
+                       raw_response: Optional[str] = None) -> None:
+        """
+        작품 처리 실패 기록 (매니페스트 + 격리 목록)
+        
+        Args:
+            failures: 최종 실패한 배치 오류 목록 (없으면 생성 부족으로 분류)
+            raw_response: 오류에 원본 응답이 없을 때 기록할 응답 (예: 생성 부족 배치)
+        """
+        if not self.record_manifest:
+            return
+        artwork_key = make_artwork_key(artwork, output_filename)
+        if not regenerate:
+            # 변경된 작품은 이전 지문을 유지하여 다음 실행에서 다시 재생성
+            self.manifest.record(artwork_key, artwork, output_filename, STATUS_FAILED, len(existing_qa))
+        
+        failure_class, error = "under_quota", f"검증된 Q&A {MIN_PARSED_QA_COUNT}개 미만"
+        if failures:
+            last = failures[-1]
+            failure_class, error = getattr(last, "kind", "unknown"), str(last)
+            raw_response = next(
+                (f.raw_response for f in reversed(failures) if getattr(f, "raw_response", None)), raw_response
+            )
+        entry = self.quarantine.record_failure(
+            artwork_key, artwork, failure_class, error, raw_response,
+            mode=self.profile.mode
+        )
+        if entry["quarantined"]:
+            self.logger.warning(
+                f"   🚫 작품 격리: {artwork_key} ({failure_class}, 누적 실패 {entry['failures']}회) "
+                f"- 다음 실행부터 건너뜀"
+            )
+    
+    def quarantine_skip_reason(self, artwork_key: str, artwork: ArtworkRecord) -> Optional[str]:
+        """격리 목록 기준 건너뛸 사유 (처리할 작품이면 None)"""
+        quarantined = self.quarantine.is_quarantined(artwork_key, artwork.fingerprint)
+        if self.retry_quarantined:
+            if not quarantined:
+                return "격리 작품 재시도 모드"
+            entry = self.quarantine.get(artwork_key) or {}
+            self.logger.info(
+                f"   ♻️ 격리 작품 재시도: {artwork_key} "
+                f"(이전 실패 {entry.get('failure_class')}, {entry.get('mode')} 모드)"
+            )
+            return None
+        if quarantined:
+            return "격리된 작품"
+        return None
+    
+    def record_usage(self, artwork_key: str, perspective: str, batch_name: str, usage: Dict) -> None:
+        """배치 하나(재시도 포함)의 토큰 사용량 기록"""
+        self.usage.record(usage, artwork_key, perspective, batch_name,
+                          mode=self.profile.mode)
+    
+    def write_run_reports(self) -> None:
+        """실행 종료 보고서 저장 (토큰 사용량 + 지표)"""
+        self.write_usage_report()
+        self.metrics_exporter.stop()
+        if self.metrics_exporter.enabled:
+            self.logger.info(
+                f"   📈 지표: {', '.join(str(p) for p in (self.metrics_exporter.textfile_path, self.metrics_exporter.json_path) if p)}"
+            )
+    
+    def write_usage_report(self) -> None:
+        """실행 사용량 보고서 저장 및 요약 출력"""
+        try:
+            path = self.usage.write_report(USAGE_REPORT_DIR)
+        except OSError as e:
+            self.logger.error(f"❌ 사용량 보고서 저장 실패: {e}")
+            return
+        if path is None:
+            return
+        totals = self.usage.totals()
+        cost = f", 예상 비용 {totals['cost']} {USAGE_COST_CURRENCY}" if "cost" in totals else ""
+        estimated = f" (추정 {totals['estimated_requests']}회 포함)" if totals["estimated_requests"] else ""
+        self.logger.info(
+            f"   💰 토큰 사용량: 입력 {totals['prompt_tokens']}, 출력 {totals['completion_tokens']} "
+            f"(요청 {totals['requests']}회{estimated}{cost})"
+        )
+        self.logger.info(f"   📄 사용량 보고서: {path}")
+    
+    def begin_artwork(self, artwork_key: str) -> bool:
+        """실행 예산으로 작품을 끝낼 수 있으면 예상 사용량을 예약하고 True (예산 미설정 시 항상 True)"""
+        if self.run_budget is None:
+            return True
+        return self.run_budget.try_start_artwork(artwork_key)
+    
+    def end_artwork(self, artwork_key: str) -> None:
+        """작품 종료 - 예약 해제 및 작품당 예상 사용량 갱신"""
+        if self.run_budget is not None:
+            self.run_budget.finish_artwork(artwork_key)
+    
+    def plan_budget_order(self, json_files: List[Path]) -> List[Dict]:
+        """예산 실행용 처리 순서 - 목표 대비 부족한 Q&A가 많은 작품부터"""
+        planned = []
+        for json_file in json_files:
+            for raw_item in self.load_catalog_items(json_file) or []:
+                if not isinstance(raw_item, dict):
+                    continue
+                _, _, artwork_key, change = self.plan_item(raw_item)
+                if change == "unchanged":
+                    deficit = 0
+                elif change in ("new", "changed"):
+                    deficit = TARGET_QA_COUNT
+                else:
+                    entry = self.manifest.get(artwork_key) or {}
+                    deficit = max(0, TARGET_QA_COUNT - (entry.get("qa_count") or 0))
+                planned.append((deficit, raw_item))
+        planned.sort(key=lambda p: p[0], reverse=True)
+        return [raw_item for _, raw_item in planned]
+    
+    def write_run_checkpoint(self, not_started: List[str], interrupted: List[str]) -> None:
+        """예산 실행 종료 상태 기록 (다음 실행은 매니페스트 기준으로 남은 작품부터 이어서 처리)"""
+        summary = self.run_budget.summary()
+        checkpoint = {
+            "status": "budget_exhausted" if (not_started or interrupted) else "complete",
+            "stop_reason": summary["stop_reason"],
+            "budget": summary,
+            "not_started": sorted(not_started),
+            "interrupted": sorted(interrupted),
+            "written_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        try:
+            tmp_path = RUN_CHECKPOINT_PATH.with_suffix(RUN_CHECKPOINT_PATH.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, RUN_CHECKPOINT_PATH)
+        except OSError as e:
+            self.logger.error(f"❌ 실행 체크포인트 저장 실패: {e}")
+            return
+        
+        self.logger.info(
+            f"⏱️ 실행 예산 사용: {summary['elapsed_seconds']}초, 요청 {summary['requests']}회, "
+            f"토큰 {summary['tokens']}개"
+        )
+        if checkpoint["status"] == "budget_exhausted":
+            self.logger.warning(
+                f"   ⏸️ {summary['stop_reason']} - 시작하지 않은 작품 {len(not_started)}개, "
+                f"중단된 작품 {len(interrupted)}개 (체크포인트: {RUN_CHECKPOINT_PATH})"
+            )
+    
+    def process_artwork(self, artwork: ArtworkRecord, output_filename: str, regenerate: bool = False) -> Optional[str]:
+        """
+        단일 작품 처리
+        
+        Args:
+            artwork: 작품 레코드
+            output_filename: 출력 파일명
+            regenerate: 입력이 변경되어 기존 Q&A를 버리고 새로 생성할지 여부
+        
+        Returns:
+            성공 시 출력 파일 경로, 실패 시 None
+        """
+        self.logger.info(f"📝 작품 처리 시작: {artwork.title}")
+        
+        # 기존 Q&A 확인 (이어서 생성 로직)
+        existing_qa = self.load_existing_qa(artwork, output_filename, regenerate)
+        if existing_qa is None:
+            return str(FINAL_OUTPUT_DIR / output_filename)
+        
+        # Q&A 생성 시도 (요청/배치/작품 재시도가 작품 예산 하나를 공유)
+        policy = get_retry_policy()
+        artwork_key = make_artwork_key(artwork, output_filename)
+        budget = policy.new_budget(artwork_key)
         attempts = 0
+        failures = []
+        
+        # 같은 작가의 캐시된 작가 관점 Q&A가 있으면 작가 관점 배치는 생성하지 않음
+        cached_artist = self.artist_cache.get(artwork) if self.artist_cache else None
+        batches = None
+        if cached_artist:
+            batches = [b for b in get_batch_plan() if b[1] != ARTIST_PERSPECTIVE]
+            self.logger.info(f"   ♻️ 작가 Q&A 캐시 사용: {artwork.artist} ({len(cached_artist)}개)")
         
-        while not success and attempts < MAX_MODEL_ATTEMPTS:
+        while True:
             attempts += 1
-            self.logger.info(f"   🎯 생성 시도 {attempts}/{MAX_MODEL_ATTEMPTS}")
+            self.logger.info(f"   🎯 생성 시도 {attempts}/{policy.max_artwork_attempts} (남은 재시도 예산 {budget.remaining}회)")
             
             try:
-                # A.X 4.0 API로 Q&A 생성
-                qa_json = generate_all_qa_batch(
-                    artwork=artwork,
-                    fast_mode=self.fast_mode,
-                    exclude_questions=existing_qa
-                )
+                # A.X 4.0 API로 Q&A 생성 (관점/배치 메타 포함)
+                batch_usage = []
+                try:
+                    generated_records = generate_all_qa_records(
+                        artwork=artwork,
+                        exclude_questions=existing_qa,
+                        batches=batches,
+                        budget=budget,
+                        failures=failures,
+                        usage=batch_usage
+                    )
+                finally:
+                    for perspective, batch_name, usage in batch_usage:
+                        self.record_usage(artwork_key, perspective, batch_name, usage)
                 
-                # 파싱 및 검증
-                generated_qa = json.loads(qa_json)
+                if cached_artist:
+                    seen = {normalize_instruction(q.instruction) for q in existing_qa + generated_records}
+                    shared = dedup_qna(cached_artist, seen)
+                    QA_ITEMS.inc(len(shared), result="cached")
+                    generated_records += shared
                 
-                if len(generated_qa) >= MIN_PARSED_QA_COUNT:
-                    # 기존 Q&A와 결합
-                    all_qa = existing_qa + generated_qa
-                    
-                    # 최종 출력 저장
-                    save_output_json(all_qa, output_path)
-                    
-                    total_count = len(all_qa)
-                    new_count = len(generated_qa)
-                    
-                    self.logger.info(f"   ✅ Q&A 생성 완료: 신규 {new_count}개, 총 {total_count}개")
-                    success = True
-                    
-                    return str(output_path)
+                if len(generated_records) >= MIN_PARSED_QA_COUNT:
+                    result_path = self.save_results(artwork, output_filename, existing_qa, generated_records, regenerate)
+                    if not cached_artist:
+                        self.cache_artist_qa(artwork, artwork_key, generated_records)
+                    return result_path
                 
-                else:
-                    self.logger.warning(f"   ⚠️ 생성 부족: {len(generated_qa)}/{MIN_PARSED_QA_COUNT}개")
+                self.logger.warning(f"   ⚠️ 생성 부족: {len(generated_records)}/{MIN_PARSED_QA_COUNT}개")
                     
             except Exception as e:
                 self.logger.error(f"   ❌ 생성 실패 (시도 {attempts}): {e}")
-                time.sleep(2)  # 잠시 대기 후 재시도
+                failures.append(e)
+            
+            if any(getattr(f, "kind", None) == "budget" for f in failures):
+                # 실행 예산 소진: 실패로 기록하지 않고 다음 실행에서 이어서 생성
+                self.logger.warning("   ⏸️ 실행 예산 소진으로 중단")
+                self._interrupted.append(artwork_key)
+                return None
+            
+            if not policy.should_retry_artwork(attempts, budget, len(get_batch_plan())):
+                break
+            RETRIES.inc(level="artwork")
         
         self.logger.error(f"❌ 작품 처리 실패: {attempts}회 시도 후 포기")
+        self.record_failure(artwork, output_filename, existing_qa, regenerate, failures)
         return None
     
     def process_file(self, json_file_path: Path) -> bool:
@@ -181,45 +589,61 @@ class AX4Processor:
         self.logger.info(f"📁 파일 처리 시작: {json_file_path}")
         
         try:
-            # JSON 파일 로드
-            json_data = load_json_file(json_file_path)
-            
-            if not isinstance(json_data, dict):
-                self.logger.error(f"   ❌ 잘못된 파일 형식: dict가 아님")
-                return False
-            
-            # items 배열 추출
-            if 'items' not in json_data:
-                self.logger.error(f"   ❌ 'items' 키가 없습니다")
-                return False
-            
-            items = json_data['items']
-            if not isinstance(items, list):
-                self.logger.error(f"   ❌ 'items'가 배열이 아닙니다")
+            items = self.load_catalog_items(json_file_path)
+            if items is None:
                 return False
             
-            self.logger.info(f"   📋 처리할 작품 수: {len(items)}개")
-            
             success_count = 0
             
             # 각 작품 개별 처리
             for i, raw_item in enumerate(items, 1):
                 self.logger.info(f"\n   📝 [{i}/{len(items)}] 작품 처리 중...")
                 
-                # 데이터 형식 변환
-                artwork = self.convert_item_to_artwork_format(raw_item)
+                # 데이터 형식 변환 및 변경 여부 판단
+                artwork, output_filename, artwork_key, change = self.plan_item(raw_item)
+                artist_name = artwork.artist
+                artwork_title = artwork.title
+                self.mark_seen(artwork_key)
+                
+                if self.is_stale_version(artwork_key, artwork):
+                    self.logger.info(f"   🔗 다른 카탈로그 항목이 대표 버전 - 건너뜀: {artist_name} - {artwork_title}")
+                    success_count += 1
+                    continue
+                
+                # 입력 지문이 같은 완료 작품은 건너뜀
+                if change == "unchanged":
+                    self.logger.info(f"   ⏭️ 입력 변경 없음 - 건너뜀: {artist_name} - {artwork_title}")
+                    self.work_index.mark_done(artwork_key, artwork, output_filename)
+                    success_count += 1
+                    continue
+                
+                skip_reason = self.quarantine_skip_reason(artwork_key, artwork)
+                if skip_reason:
+                    self.logger.info(f"   🚫 {skip_reason} - 건너뜀: {artist_name} - {artwork_title}")
+                    continue
                 
-                # 출력 파일명 생성 (작가명_작품명.json)
-                artist_name = artwork.get('작가', 'Unknown')
-                artwork_title = artwork.get('제목', 'Unknown')
+                # 다른 카탈로그 파일에서 이미 처리한 같은 작품은 결과 공유
+                claim, work = self.work_index.claim(artwork_key, artwork, output_filename)
+                if claim == CLAIM_DONE:
+                    self.logger.info(f"   🔗 중복 작품 - 이번 실행의 결과 공유: {artist_name} - {artwork_title} ({work.key})")
+                    self.share_result(artwork, artwork_key, work.key)
+                    success_count += 1
+                    continue
                 
-                # 파일명 안전화
-                safe_artist = self.sanitize_filename(artist_name)
-                safe_title = self.sanitize_filename(artwork_title)
-                output_filename = f"{safe_artist}_{safe_title}.json"
+                # 남은 실행 예산으로 끝낼 수 없는 작품은 시작하지 않음
+                if not self.begin_artwork(artwork_key):
+                    self.logger.info(f"   ⏸️ 실행 예산 부족 - 시작하지 않음: {artist_name} - {artwork_title}")
+                    self.work_index.abandon(artwork_key)
+                    self._not_started.append(artwork_key)
+                    continue
                 
                 # 작품 처리
-                result_path = self.process_artwork(artwork, output_filename)
+                result_path = None
+                try:
+                    result_path = self.process_artwork(artwork, output_filename, regenerate=(change == "changed"))
+                finally:
+                    self.end_artwork(artwork_key)
+                    self.work_index.complete(artwork_key, bool(result_path))
                 
                 if result_path:
                     self.logger.info(f"   ✅ 작품 처리 완료: {artist_name} - {artwork_title}")
@@ -232,14 +656,43 @@ class AX4Processor:
                 
         except Exception as e:
             self.logger.error(f"❌ 파일 처리 중 오류: {e}")
+            self._catalog_complete = False
             return False
     
+    def load_catalog_items(self, json_file_path: Path) -> Optional[List[Dict]]:
+        """카탈로그 파일에서 작품 아이템 목록 로드 ({"items": [...]} 형식)"""
+        json_data = load_json_file(json_file_path)
+        
+        if not isinstance(json_data, dict):
+            self.logger.error(f"   ❌ 잘못된 파일 형식: dict가 아님 ({json_file_path.name})")
+            self._catalog_complete = False
+            return None
+        
+        # items 배열 추출
+        if 'items' not in json_data:
+            self.logger.error(f"   ❌ 'items' 키가 없습니다 ({json_file_path.name})")
+            self._catalog_complete = False
+            return None
+        
+        items = json_data['items']
+        if not isinstance(items, list):
+            self.logger.error(f"   ❌ 'items'가 배열이 아닙니다 ({json_file_path.name})")
+            self._catalog_complete = False
+            return None
+        
+        self.logger.info(f"   📋 처리할 작품 수: {len(items)}개 ({json_file_path.name})")
+        return items
+    
+    def mark_seen(self, artwork_key: str) -> None:
+        """이번 실행에서 카탈로그에 있는 작품으로 기록 (orphaned 판단용)"""
+        self._seen_keys.add(artwork_key)
+    
     def process_all_files(self) -> None:
         """모든 데이터 파일 처리"""
         self.logger.info("🚀 전체 파일 처리 시작")
         
         # data 디렉토리에서 JSON 파일 검색
-        json_files = list(DATA_DIR.glob("*.json"))
+        json_files = sorted(DATA_DIR.glob("*.json"))
         
         if not json_files:
             self.logger.warning(f"⚠️ 처리할 JSON 파일이 없습니다: {DATA_DIR}")
@@ -247,36 +700,243 @@ class AX4Processor:
         
         self.logger.info(f"📋 처리 대상 파일: {len(json_files)}개")
         
-        success_count = 0
+        self._seen_keys = set()
+        self._catalog_complete = True
+        self.work_index = WorkIndex()
+        self.scan_catalog_versions(json_files)
+        self._not_started, self._interrupted = [], []
+        if self.run_budget:
+            self.run_budget.start()
+        self.metrics_exporter.start()
         
-        for i, json_file in enumerate(json_files, 1):
-            self.logger.info(f"\n{'='*60}")
-            self.logger.info(f"📁 [{i}/{len(json_files)}] {json_file.name}")
-            self.logger.info(f"{'='*60}")
-            
-            if self.process_file(json_file):
-                success_count += 1
-            
-            # 간단한 메모리 정리
-            import gc
-            gc.collect()
+        if PIPELINE_ENABLED:
+            # 단계별 파이프라인: 네트워크 대기와 파싱/저장이 겹쳐서 진행
+            pipeline = AX4Pipeline(self)
+            if self.run_budget:
+                # 예산 실행: 부족분이 큰 작품부터 투입
+                pipeline.start()
+                try:
+                    for raw_item in self.plan_budget_order(json_files):
+                        pipeline.submit_item(raw_item)
+                    pipeline.join()
+                finally:
+                    pipeline.stop()
+            else:
+                pipeline.run_files(json_files)
+            success_count, failed_count, unit = pipeline.success_count, pipeline.failure_count, "작품"
+            self._not_started, self._interrupted = pipeline.not_started, pipeline.interrupted
+            if pipeline.skipped_count:
+                self.logger.info(f"   🚫 격리 목록으로 건너뜀: {pipeline.skipped_count}개 작품")
+            if pipeline.duplicate_count:
+                self.logger.info(f"   🔗 중복 입력 항목 건너뜀: {pipeline.duplicate_count}개")
+        else:
+            success_count = 0
+            for i, json_file in enumerate(json_files, 1):
+                self.logger.info(f"\n{'='*60}")
+                self.logger.info(f"📁 [{i}/{len(json_files)}] {json_file.name}")
+                self.logger.info(f"{'='*60}")
+                
+                if self.process_file(json_file):
+                    success_count += 1
+            failed_count, unit = len(json_files) - success_count, "파일"
+        
+        # 카탈로그에서 사라진 작품의 출력 표시 (모든 파일을 정상적으로 읽은 경우만)
+        if self._catalog_complete:
+            self.mark_orphaned_outputs()
         
         # 최종 결과 출력
         self.logger.info(f"\n🎉 전체 처리 완료")
-        self.logger.info(f"   ✅ 성공: {success_count}/{len(json_files)}개")
+        self.logger.info(f"   ✅ 성공: {success_count}/{success_count + failed_count}개 {unit}")
         self.logger.info(f"   📁 출력 디렉토리: {FINAL_OUTPUT_DIR}")
         
-        if success_count < len(json_files):
-            failed_count = len(json_files) - success_count
-            self.logger.warning(f"   ⚠️ 실패: {failed_count}개 파일")
+        if failed_count:
+            self.logger.warning(f"   ⚠️ 실패: {failed_count}개 {unit}")
+        
+        if self.run_budget:
+            self.write_run_checkpoint(self._not_started, self._interrupted)
+        self.write_run_reports()
+        
+        if HEDGE_ENABLED:
+            hedge = get_hedge_stats()
+            self.logger.info(
+                f"   🪁 헤지 요청: {hedge['hedges']}/{hedge['requests']}회 (헤지 응답 채택 {hedge['hedge_wins']}회)"
+            )
+    
+    def watch(self, poll_interval: float = WATCH_POLL_INTERVAL,
+              debounce_seconds: float = WATCH_DEBOUNCE_SECONDS) -> None:
+        """
+        감시 모드 - data 디렉토리의 신규/수정 파일을 실행 중인 파이프라인에 계속 투입 (Ctrl+C로 종료)
+        
+        Args:
+            poll_interval: 디렉토리 스캔 간격 (초)
+            debounce_seconds: 파일 쓰기 완료로 판단하기 위한 안정화 시간 (초)
+        """
+        watcher = CatalogWatcher(DATA_DIR, "*.json", debounce_seconds)
+        pipeline = AX4Pipeline(self)
+        
+        self.logger.info(f"👀 감시 모드 시작: {DATA_DIR} (간격 {poll_interval}s)")
+        self.metrics_exporter.start()
+        pipeline.start()
+        
+        try:
+            while True:
+                changed = watcher.poll()
+                if changed:
+                    # 대표 버전은 변경 파일만이 아니라 전체 카탈로그 기준으로 다시 선택
+                    self.scan_catalog_versions(list(DATA_DIR.glob("*.json")))
+                for json_file in changed:
+                    self.logger.info(f"📁 변경 감지: {json_file.name}")
+                    pipeline.submit_file(json_file)
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            self.logger.info("⏹️ 감시 모드 종료 - 진행 중인 작업 완료 대기 (다시 Ctrl+C로 즉시 종료)")
+            try:
+                pipeline.join()
+            finally:
+                pipeline.stop()
+                self.write_run_reports()
+            raise
+    
+    def enqueue_catalog(self, job_queue: JobQueue) -> int:
+        """
+        data 디렉토리의 모든 작품을 공유 작업 큐에 투입 (여러 노드가 동시에 호출해도 안전)
+        
+        Returns:
+            새로 투입되거나 입력 변경으로 다시 대기열에 들어간 작품 수
+        """
+        jobs = []
+        json_files = sorted(DATA_DIR.glob("*.json"))
+        self.scan_catalog_versions(json_files)
+        for json_file in json_files:
+            for raw_item in self.load_catalog_items(json_file) or []:
+                if not isinstance(raw_item, dict):
+                    continue
+                artwork, _, artwork_key, change = self.plan_item(raw_item)
+                if self.is_stale_version(artwork_key, artwork):
+                    continue
+                jobs.append({
+                    "job_key": artwork_key,
+                    "payload": raw_item,
+                    "fingerprint": artwork.fingerprint,
+                    "change": change,
+                })
+        
+        queued = job_queue.enqueue(jobs)
+        self.logger.info(f"📮 작업 큐 투입: {len(jobs)}개 중 {queued}개 대기열 추가")
+        return queued
+    
+    def process_queue(self, queue_path: Path, node_id: Optional[str] = None, enqueue: bool = True) -> None:
+        """
+        공유 작업 큐 모드 - 여러 호스트가 같은 큐에서 작품을 임대하여 나눠 처리
+        
+        Args:
+            queue_path: 공유 파일시스템의 작업 큐 DB 경로
+            node_id: 노드 식별자 (None이면 호스트명-PID)
+            enqueue: 시작 전에 data 디렉토리의 작품을 큐에 투입할지 여부
+        """
+        job_queue = JobQueue(queue_path, node_id, JOB_QUEUE_LEASE_SECONDS, JOB_QUEUE_MAX_ATTEMPTS)
+        self.record_manifest = False
+        self.logger.info(f"🛰️ 공유 작업 큐 모드: {queue_path} (노드 {job_queue.node_id})")
+        if self.store:
+            self.logger.warning("⚠️ Q&A 저장소(WAL)는 네트워크 파일시스템에서 공유할 수 없습니다 - 노드별 경로를 사용하세요")
+        
+        if enqueue:
+            self.enqueue_catalog(job_queue)
+        
+        held = set()
+        held_lock = threading.Lock()
+        stop_event = threading.Event()
+        
+        def on_artwork_done(artwork_key: str, success: bool, error: str) -> None:
+            with held_lock:
+                held.discard(artwork_key)
+            if success:
+                if not job_queue.complete(artwork_key):
+                    self.logger.warning(f"   ⚠️ 임대를 잃은 작업 - 완료 기록하지 않음: {artwork_key}")
+                return
+            status = job_queue.fail(artwork_key, error)
+            if status is None:
+                self.logger.warning(f"   ⚠️ 임대를 잃은 작업 - 실패 기록하지 않음: {artwork_key}")
+            else:
+                self.logger.warning(f"   ⚠️ 작업 실패 기록: {artwork_key} → {status}")
+        
+        def on_artwork_skipped(artwork_key: str, reason: str) -> None:
+            with held_lock:
+                held.discard(artwork_key)
+            if not job_queue.skip(artwork_key, reason):
+                self.logger.warning(f"   ⚠️ 임대를 잃은 작업 - 건너뜀 기록하지 않음: {artwork_key}")
+        
+        def heartbeat() -> None:
+            while not stop_event.wait(JOB_QUEUE_HEARTBEAT_INTERVAL):
+                with held_lock:
+                    keys = list(held)
+                try:
+                    extended = job_queue.heartbeat(keys)
+                except Exception as e:
+                    self.logger.warning(f"   ⚠️ 하트비트 실패: {e}")
+                    continue
+                if extended < len(keys):
+                    self.logger.warning(f"   ⚠️ 임대를 잃은 작업: {len(keys) - extended}개 (다른 노드가 처리 중일 수 있음)")
+        
+        pipeline = AX4Pipeline(self, on_artwork_done=on_artwork_done, on_artwork_skipped=on_artwork_skipped)
+        self.metrics_exporter.start()
+        pipeline.start()
+        threading.Thread(target=heartbeat, name="JobQueue-heartbeat", daemon=True).start()
+        
+        try:
+            while True:
+                with held_lock:
+                    capacity = JOB_QUEUE_MAX_LEASED - len(held)
+                jobs = job_queue.lease(capacity)
+                for job in jobs:
+                    with held_lock:
+                        held.add(job["job_key"])
+                    self.logger.info(f"📦 작업 임대: {job['job_key']} (시도 {job['attempt']})")
+                    pipeline.submit_item(job["payload"], job["change"])
+                
+                if not jobs:
+                    with held_lock:
+                        idle = not held
+                    # 다른 노드의 임대가 남아 있으면 만료될 경우를 대비해 계속 대기
+                    if idle and job_queue.remaining() == 0:
+                        break
+                    time.sleep(JOB_QUEUE_POLL_INTERVAL)
+            pipeline.join()
+        finally:
+            stop_event.set()
+            pipeline.stop()
+            # 중단 시 보유 작업 반납 (정상 종료 시에는 보유 작업 없음)
+            released = job_queue.release_all()
+            if released:
+                self.logger.info(f"↩️ 보유 작업 {released}개 반납")
+            stats = job_queue.stats()
+            job_queue.close()
+            self.write_run_reports()
+        
+        self.logger.info(f"\n🎉 작업 큐 처리 완료 (이 노드: 성공 {pipeline.success_count}개, 실패 {pipeline.failure_count}개)")
+        self.logger.info(f"   📊 큐 상태: {stats}")
+    
+    def mark_orphaned_outputs(self) -> None:
+        """이번 실행에서 보지 못한 작품을 orphaned로 표시 (파일은 삭제하지 않음)"""
+        orphaned = self.manifest.mark_orphaned(self._seen_keys)
+        if self.store:
+            self.store.mark_orphaned(list(self._seen_keys))
+        
+        for entry in orphaned:
+            self.logger.warning(
+                f"   🗑️ 카탈로그에서 제거된 작품: {entry['artist']} - {entry['title']} ({entry['output_file']})"
+            )
     
     def get_processing_stats(self) -> Dict:
         """처리 통계 정보 반환"""
         stats = {
-            "mode": "⚡ 고속 모드" if self.fast_mode else "🎯 정밀 모드",
+            "mode": self.profile.label,
+            "generation_profile": self.profile.mode,
             "api_provider": "A.X 4.0 API",
             "data_dir": str(DATA_DIR),
             "output_dir": str(FINAL_OUTPUT_DIR),
             "memory_status": get_memory_info()
         }
+        if self.store:
+            stats["store"] = self.store.status_summary()
         return stats
\ No newline at end of file
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+드라이런 계획 (--dry-run)
+- 실제 실행과 같은 작품 선별(변경 여부 / 격리 / 목표 달성)과 배치 계획, 프롬프트 빌더를 그대로 사용
+- API를 호출하지 않고 남은 작품의 프롬프트를 파일로 렌더링
+- 요청별 입력/출력 토큰, 전체 요청 수, 생성 프로필의 동시성과 이전 실행 지연 시간 기준 소요 시간을 추정
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.common import load_json_file, save_json_safe
+from utils.run_budget import estimate_tokens
+from utils.work_index import WorkIndex, CLAIM_DONE
+from utils.artist_qa_cache import ARTIST_PERSPECTIVE, artist_cache_key, artist_fingerprint
+from models.ax4_api_agent import (
+    get_batch_plan, build_batch_prompt, batch_generation_params, collect_exclude_instructions,
+    group_batch_plan, group_label, multi_choice_enabled
+)
+from config import (
+    DATA_DIR, PIPELINE_ENABLED,
+    METRICS_JSON_PATH, USAGE_REPORT_DIR, USAGE_COST_PER_1K_PROMPT_TOKENS,
+    USAGE_COST_PER_1K_COMPLETION_TOKENS, USAGE_COST_CURRENCY,
+    DRY_RUN_DEFAULT_LATENCY_SECONDS, DRY_RUN_COMPLETION_TOKENS_PER_ITEM
+)
+
+# 순차 처리(generate_all_qa_records)의 배치 간 대기 시간 (초)
+SEQUENTIAL_BATCH_PAUSE_SECONDS = 3
+
+
+def load_latency_history(metrics_path: Optional[Path]) -> Optional[float]:
+    """지표 파일의 성공 요청 평균 지연 시간 (기록이 없으면 None)"""
+    if not metrics_path or not metrics_path.exists():
+        return None
+    data = load_json_file(metrics_path)
+    if not isinstance(data, dict):
+        return None
+    metric = data.get("metrics", {}).get("ax4_request_seconds", {})
+    total = count = 0
+    for value in metric.get("values", []):
+        if value.get("labels", {}).get("outcome") == "ok":
+            total += value.get("sum") or 0
+            count += value.get("count") or 0
+    return total / count if count else None
+
+
+def load_completion_history(report_dir: Path) -> Tuple[Dict[str, float], Optional[float], Optional[str]]:
+    """
+    가장 최근 사용량 보고서의 요청당 평균 출력 토큰
+
+    Returns:
+        (배치 이름별 평균, 실행 전체 평균, 보고서 파일명) - 보고서가 없으면 ({}, None, None)
+    """
+    reports = sorted(report_dir.glob("usage_*.json")) if report_dir.exists() else []
+    for path in reversed(reports):
+        report = load_json_file(path)
+        if not isinstance(report, dict) or not report.get("run", {}).get("requests"):
+            continue
+        run = report["run"]
+        totals: Dict[str, List[int]] = {}
+        for artwork in report.get("by_artwork", {}).values():
+            for batch_name, usage in artwork.get("batches", {}).items():
+                entry = totals.setdefault(batch_name, [0, 0])
+                entry[0] += usage.get("completion_tokens", 0)
+                entry[1] += usage.get("requests", 0)
+        by_batch = {name: tokens / requests for name, (tokens, requests) in totals.items() if requests}
+        return by_batch, run["completion_tokens"] / run["requests"], path.name
+    return {}, None, None
+
+
+class DryRunPlanner:
+    """남은 작품의 요청 계획 작성 (프로세서의 작품 선별 로직 재사용, 매니페스트/격리 목록에 쓰지 않음)"""
+
+    def __init__(self, processor, output_dir: Path):
+        """
+        Args:
+            processor: AX4Processor (실제 실행과 같은 저장소 설정이어야 목표 달성 작품을 똑같이 건너뜀)
+            output_dir: 계획/프롬프트를 저장할 디렉토리
+        """
+        self.processor = processor
+        self.output_dir = output_dir
+
+        self.latency = load_latency_history(METRICS_JSON_PATH)
+        self.completion_by_batch, self.completion_per_request, self.usage_report = \
+            load_completion_history(USAGE_REPORT_DIR)
+
+        self.artworks: List[Dict] = []
+        self.skipped = {"unchanged": 0, "complete": 0, "quarantined": 0, "duplicate": 0}
+        self.work_index = WorkIndex()   # 카탈로그 파일 간 중복 작품은 한 번만 계획
+        self._planned_artists: Dict[str, str] = {}   # 작가 키 → 이 계획에서 작가 관점을 생성할 작가 지문
+
+    def plan(self, json_files: Optional[List[Path]] = None) -> Dict:
+        """카탈로그 전체 계획 작성 후 plan.json 저장 → 계획 반환"""
+        if json_files is None:
+            json_files = sorted(DATA_DIR.glob("*.json"))
+        self.processor.scan_catalog_versions(json_files)
+        for json_file in json_files:
+            items = self.processor.load_catalog_items(json_file)
+            for raw_item in items or []:
+                self.plan_item(raw_item)
+
+        plan = self.build_plan()
+        save_json_safe(plan, self.output_dir / "plan.json")
+        return plan
+
+    def plan_item(self, raw_item: Dict) -> None:
+        """작품 1개 계획 (실제 실행의 normalize 단계와 같은 순서로 건너뛸 작품 판단)"""
+        artwork, output_filename, artwork_key, change = self.processor.plan_item(raw_item)
+        if self.processor.is_stale_version(artwork_key, artwork):
+            self.skipped["duplicate"] += 1
+            return
+        if change == "unchanged":
+            self.work_index.mark_done(artwork_key, artwork, output_filename)
+            self.skipped["unchanged"] += 1
+            return
+        if self.processor.quarantine_skip_reason(artwork_key, artwork):
+            self.skipped["quarantined"] += 1
+            return
+        claim, _ = self.work_index.claim(artwork_key, artwork, output_filename)
+        if claim == CLAIM_DONE:
+            self.skipped["duplicate"] += 1
+            return
+        # 드라이런은 순차 처리라 대표 작업을 바로 끝난 것으로 기록
+        self.work_index.complete(artwork_key, True)
+        existing_qa = self.processor.load_existing_qa(artwork, output_filename, change == "changed")
+        if existing_qa is None:
+            self.skipped["complete"] += 1
+            return
+
+        exclude_instructions = collect_exclude_instructions(existing_qa)
+        prompt_dir = self.output_dir / "prompts" / Path(output_filename).stem
+        prompt_dir.mkdir(parents=True, exist_ok=True)
+
+        artist_qa = self._artist_source(artwork)
+        batch_plan = [
+            entry for entry in get_batch_plan()
+            if entry[1] != ARTIST_PERSPECTIVE or artist_qa == "generate"
+        ]
+        requests = []
+        for i, group in enumerate(group_batch_plan(batch_plan), 1):
+            _, batch_type, batch_size = group[0]
+            prompt = build_batch_prompt(batch_type, artwork, exclude_instructions, batch_size)
+            max_tokens, temperature, top_p = batch_generation_params(batch_type, batch_size)
+            prompt_path = prompt_dir / f"{i:02d}_{batch_type}.md"
+            prompt_path.write_text(prompt, encoding="utf-8")
+            requests.append({
+                "batch_name": group_label(group),
+                "batch_type": batch_type,
+                "batch_size": batch_size,
+                "choices": len(group),
+                "prompt_file": str(prompt_path.relative_to(self.output_dir)),
+                "prompt_chars": len(prompt),
+                "prompt_tokens": estimate_tokens(prompt),
+                "completion_tokens": self._estimate_group_completion(group, max_tokens),
+                "max_tokens": max_tokens * len(group),
+                "temperature": temperature,
+                "top_p": top_p,
+            })
+
+        self.artworks.append({
+            "artwork_key": artwork_key,
+            "label": artwork.label,
+            "change": change,
+            "existing_qa": len(existing_qa),
+            "artist_qa": artist_qa,
+            "requests": requests,
+        })
+
+    def _artist_source(self, artwork) -> str:
+        """작가 관점 Q&A 출처 - cached(작가 캐시) / shared(이 계획의 앞선 같은 작가 작품) / generate"""
+        if self.processor.artist_cache is None:
+            return "generate"
+        artist_key = artist_cache_key(artwork)
+        if artist_key is None:
+            return "generate"
+        if self.processor.artist_cache.get(artwork):
+            return "cached"
+        fingerprint = artist_fingerprint(artwork)
+        if self._planned_artists.get(artist_key) == fingerprint:
+            return "shared"
+        self._planned_artists[artist_key] = fingerprint
+        return "generate"
+
+    def _estimate_completion(self, batch_name: str, batch_size: int, max_tokens: int) -> int:
+        """요청 1회 출력 토큰 추정 (배치별 기록 → 실행 평균 → 항목당 기본값, max_tokens 이하)"""
+        estimate = self.completion_by_batch.get(batch_name, self.completion_per_request)
+        if estimate is None:
+            estimate = batch_size * DRY_RUN_COMPLETION_TOKENS_PER_ITEM
+        return min(int(round(estimate)), max_tokens)
+
+    def _estimate_group_completion(self, group: List[Tuple[str, str, int]], max_tokens: int) -> int:
+        """요청 묶음 출력 토큰 추정 (묶음 기록이 없으면 배치별 추정의 합, 응답 수 x max_tokens 이하)"""
+        estimate = self.completion_by_batch.get(group_label(group)) if len(group) > 1 else None
+        if estimate is not None:
+            return min(int(round(estimate)), max_tokens * len(group))
+        return sum(
+            self._estimate_completion(batch_name, batch_size, max_tokens) for batch_name, _, batch_size in group
+        )
+
+    def build_plan(self) -> Dict:
+        """요청 목록 → 합계 / 가정 / 소요 시간 추정"""
+        requests = [r for artwork in self.artworks for r in artwork["requests"]]
+        prompt_tokens = sum(r["prompt_tokens"] for r in requests)
+        completion_tokens = sum(r["completion_tokens"] for r in requests)
+        latency = self.latency if self.latency is not None else DRY_RUN_DEFAULT_LATENCY_SECONDS
+        profile = self.processor.profile
+        workers = profile.generate_workers
+
+        if PIPELINE_ENABLED:
+            # 동시 요청 수 기준 처리량과 요청 시작 간 최소 간격 중 느린 쪽
+            seconds = max(len(requests) * latency / workers, len(requests) * profile.min_request_interval)
+        else:
+            pauses = sum(max(len(a["requests"]) - 1, 0) for a in self.artworks)
+            seconds = len(requests) * latency + pauses * SEQUENTIAL_BATCH_PAUSE_SECONDS
+
+        totals = {
+            "artworks": len(self.artworks),
+            "requests": len(requests),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "max_completion_tokens": sum(r["max_tokens"] for r in requests),
+            "estimated_seconds": round(seconds, 1),
+        }
+        if USAGE_COST_PER_1K_PROMPT_TOKENS or USAGE_COST_PER_1K_COMPLETION_TOKENS:
+            totals["estimated_cost"] = round(
+                prompt_tokens / 1000 * USAGE_COST_PER_1K_PROMPT_TOKENS
+                + completion_tokens / 1000 * USAGE_COST_PER_1K_COMPLETION_TOKENS, 4
+            )
+            totals["currency"] = USAGE_COST_CURRENCY
+
+        return {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "mode": profile.mode,
+            "totals": totals,
+            "skipped": dict(self.skipped),
+            "assumptions": {
+                "pipeline": PIPELINE_ENABLED,
+                "generate_workers": workers if PIPELINE_ENABLED else 1,
+                "min_request_interval": profile.min_request_interval if PIPELINE_ENABLED else None,
+                "latency_seconds": round(latency, 3),
+                "latency_source": str(METRICS_JSON_PATH) if self.latency is not None else "default",
+                "completion_source": self.usage_report or "default",
+                "prompt_token_estimate": "문자 수 / 2",
+                "multi_choice": multi_choice_enabled(),
+                "excluded": "재시도, 규칙 위반 수정 요청(작품당 최대 1회)은 포함하지 않음",
+                "artist_qa": "작가 캐시가 있거나 앞선 같은 작가 작품이 생성하면 작가 관점 배치 제외",
+            },
+            "artworks": self.artworks,
+        }
+
+    def print_summary(self, plan: Dict) -> None:
+        """계획 요약 출력"""
+        totals = plan["totals"]
+        assumptions = plan["assumptions"]
+        skipped = ", ".join(f"{k} {v}" for k, v in plan["skipped"].items() if v) or "없음"
+        minutes, seconds = divmod(int(totals["estimated_seconds"]), 60)
+        hours, minutes = divmod(minutes, 60)
+
+        print(f"🧪 드라이런 계획: {self.output_dir}")
+        print(f"   🎨 처리할 작품: {totals['artworks']}개 (건너뜀: {skipped})")
+        print(f"   📨 요청 수: {totals['requests']}회 (재시도/수정 요청 제외)")
+        print(f"   🔢 예상 토큰: 입력 {totals['prompt_tokens']:,} + 출력 {totals['completion_tokens']:,} "
+              f"= {totals['total_tokens']:,} (출력 상한 {totals['max_completion_tokens']:,})")
+        if "estimated_cost" in totals:
+            print(f"   💰 예상 비용: {totals['estimated_cost']:,} {totals['currency']}")
+        print(f"   ⏱️ 예상 소요 시간: {hours}시간 {minutes}분 {seconds}초 "
+              f"(요청당 {assumptions['latency_seconds']}초 [{assumptions['latency_source']}], "
+              f"동시 요청 {assumptions['generate_workers']}개)")
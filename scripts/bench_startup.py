@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+CLI 시작 시간 벤치마크
+- 생성 없이 끝나는 명령(--help, --status, --list-quarantined 등)의 실행 시간 측정
+- 무거운 의존성(openai/httpx/pydantic/psutil)이 로드되면 실패 처리
+- 기준 시간을 넘거나 무거운 모듈이 로드되면 종료 코드 1 (운영 스크립트 회귀 확인용)
+
+사용법:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 10 --max-ms 250
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = [
+    ["--help"],
+    ["--status"],
+    ["--list-quarantined"],
+]
+
+HEAVY_MODULES = ("openai", "httpx", "pydantic", "psutil")
+
+
+def run_once(args: List[str]) -> Tuple[float, Set[str]]:
+    """명령 1회 실행 → (소요 시간 ms, 로드된 무거운 모듈)"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(ROOT / "main.py"), *args],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        module = line.rsplit("|", 1)[-1].strip()
+        top = module.split(".", 1)[0]
+        if top in HEAVY_MODULES:
+            loaded.add(top)
+    return elapsed_ms, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="CLI 시작 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=5, help="명령별 반복 횟수 (기본: 5)")
+    parser.add_argument("--max-ms", type=float, default=300.0,
+                        help="명령별 중앙값 허용 시간 (ms, 기본: 300)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"⏱️ CLI 시작 시간 ({args.runs}회 중앙값, 기준 {args.max_ms:.0f}ms)")
+    for command in COMMANDS:
+        timings = []
+        heavy = set()
+        for _ in range(args.runs):
+            elapsed_ms, loaded = run_once(command)
+            timings.append(elapsed_ms)
+            heavy |= loaded
+
+        median_ms = statistics.median(timings)
+        ok = median_ms <= args.max_ms and not heavy
+        failed = failed or not ok
+        label = " ".join(command)
+        note = f"  무거운 모듈 로드: {', '.join(sorted(heavy))}" if heavy else ""
+        print(f"   {'✅' if ok else '❌'} {label:<32} {median_ms:8.1f}ms  (최소 {min(timings):.1f}ms){note}")
+
+    if failed:
+        print("❌ 시작 시간 회귀 - 지연 임포트를 확인하세요")
+        return 1
+    print("✅ 모든 명령이 기준 이내")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
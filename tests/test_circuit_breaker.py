@@ -0,0 +1,64 @@
+"""회로 차단기 상태 전이 / half-open 시험 요청 테스트"""
+
+import time
+
+import pytest
+
+from utils.circuit_breaker import (
+    STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker, CircuitOpenError,
+)
+
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    options = dict(min_requests=4, consecutive_failures=3, open_seconds=0.05, max_open_seconds=0.2)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def test_opens_after_consecutive_failures():
+    breaker = _breaker()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(timeout=0.01)
+
+
+def test_opens_on_error_rate():
+    breaker = _breaker(consecutive_failures=100)
+    for ok in (True, False, True, False):
+        breaker.record_success() if ok else breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+
+def test_half_open_allows_single_probe():
+    breaker = _breaker(consecutive_failures=1)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    breaker.acquire(timeout=0.1)
+    assert breaker.state == STATE_HALF_OPEN
+    # 시험 요청이 끝나기 전에는 다른 요청을 통과시키지 않음
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(timeout=0.05)
+
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    breaker.acquire(timeout=0.01)
+
+
+def test_failed_probe_reopens_with_longer_cooldown():
+    breaker = _breaker(consecutive_failures=1)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.acquire(timeout=0.1)
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.open_count == 2
+    # 대기 시간이 두 배(0.1초)로 늘어 첫 대기 시간만 지나서는 통과하지 못함
+    time.sleep(0.06)
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(timeout=0.01)
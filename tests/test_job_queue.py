@@ -0,0 +1,75 @@
+"""공유 작업 큐 임대 소유권 / 멱등 투입 테스트"""
+
+import time
+
+from utils.job_queue import JOB_DONE, JOB_FAILED, JOB_PENDING, JOB_SKIPPED, JobQueue
+
+
+def _job(key: str, fingerprint: str = "v1") -> dict:
+    return {"job_key": key, "payload": {"key": key}, "fingerprint": fingerprint}
+
+
+def test_enqueue_is_idempotent_and_requeues_changed(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", node_id="a")
+    assert queue.enqueue([_job("x"), _job("y")]) == 2
+    assert queue.enqueue([_job("x"), _job("y")]) == 0
+
+    leased = queue.lease(limit=1)
+    assert queue.complete(leased[0]["job_key"])
+    assert queue.enqueue([_job(leased[0]["job_key"], "v2")]) == 1
+    assert queue.stats() == {JOB_PENDING: 2}
+
+
+def test_expired_lease_belongs_to_new_owner(tmp_path):
+    db = tmp_path / "jobs.db"
+    first = JobQueue(db, node_id="a", lease_seconds=0.05)
+    second = JobQueue(db, node_id="b", lease_seconds=60)
+    first.enqueue([_job("x")])
+
+    assert [job["job_key"] for job in first.lease()] == ["x"]
+    time.sleep(0.1)
+    leased = second.lease()
+    assert leased[0]["attempt"] == 2
+
+    # 임대를 잃은 노드의 늦은 완료/실패/건너뜀/하트비트는 반영되지 않음
+    assert first.complete("x") is False
+    assert first.fail("x", "late") is None
+    assert first.skip("x", "late") is False
+    assert first.heartbeat(["x"]) == 0
+
+    assert second.complete("x") is True
+    assert second.complete("x") is False
+    assert second.stats() == {JOB_DONE: 1}
+
+
+def test_fail_retries_until_max_attempts(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", node_id="a", max_attempts=2)
+    queue.enqueue([_job("x")])
+
+    queue.lease()
+    assert queue.fail("x", "error") == JOB_PENDING
+    queue.lease()
+    assert queue.fail("x", "error") == JOB_FAILED
+    assert queue.lease() == []
+
+
+def test_skipped_job_is_requeued_on_next_enqueue(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", node_id="a")
+    queue.enqueue([_job("x")])
+    queue.lease()
+
+    assert queue.skip("x", "quarantined")
+    assert queue.stats() == {JOB_SKIPPED: 1}
+    assert queue.lease() == []
+    assert queue.enqueue([_job("x")]) == 1
+    assert queue.lease()[0]["attempt"] == 1
+
+
+def test_release_all_returns_attempt(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", node_id="a")
+    queue.enqueue([_job("x")])
+    queue.lease()
+
+    assert queue.release_all() == 1
+    assert queue.remaining() == 1
+    assert queue.lease()[0]["attempt"] == 1
@@ -0,0 +1,44 @@
+"""기존 출력 파일 항목 분리 (split_output_items) 테스트"""
+
+from utils.records import QARecord, qa_records_from_dicts, split_output_items
+
+
+def test_plain_items_become_records():
+    item = {"instruction": "질문", "input": "", "output": "답변"}
+    records, passthrough = split_output_items([item])
+
+    assert passthrough == []
+    assert records[0].raw is None
+    assert records[0].to_dict() == item
+
+
+def test_extra_keys_are_kept_verbatim():
+    item = {"instruction": "질문", "input": "", "output": "답변", "source": "manual"}
+    records, _ = split_output_items([item])
+
+    assert records[0].instruction == "질문"
+    assert records[0].to_dict() is item
+
+
+def test_legacy_question_answer_items_are_kept_verbatim():
+    item = {"question": "질문", "answer": "답변"}
+    records, _ = split_output_items([item])
+
+    assert (records[0].instruction, records[0].output) == ("질문", "답변")
+    assert records[0].to_dict() is item
+
+
+def test_non_qa_items_pass_through():
+    items = [{"note": "메모"}, "text", 3]
+    records, passthrough = split_output_items(items)
+
+    assert records == []
+    assert passthrough == items
+
+
+def test_qa_records_from_dicts_accepts_records_and_dicts():
+    record = QARecord("질문", "", "답변")
+    records = qa_records_from_dicts([record, {"question": "q", "answer": "a"}, {"note": "x"}, None])
+
+    assert records[0] is record
+    assert [r.instruction for r in records] == ["질문", "q"]
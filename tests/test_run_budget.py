@@ -0,0 +1,67 @@
+"""실행 예산 작품 예약 / 요청 기록 테스트"""
+
+import pytest
+
+from utils.run_budget import RunBudget, estimate_tokens, parse_duration
+
+
+def test_parse_duration():
+    assert parse_duration("3600") == 3600
+    assert parse_duration("90m") == 5400
+    assert parse_duration("1h30m") == 5400
+    assert parse_duration("45s") == 45
+    with pytest.raises(ValueError):
+        parse_duration("1d")
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("가나다라") == 2
+
+
+def test_admission_reserves_artwork_requests():
+    budget = RunBudget(max_requests=10, artwork_requests=4)
+    assert budget.try_start_artwork("a")
+    assert budget.try_start_artwork("b")
+    # 진행 중인 두 작품의 예약(8) + 새 작품(4) > 10
+    assert not budget.try_start_artwork("c")
+    assert budget.stop_reason == "요청 예산 부족"
+
+
+def test_recorded_requests_are_not_counted_twice():
+    budget = RunBudget(max_requests=10, artwork_requests=4)
+    assert budget.try_start_artwork("a")
+    for _ in range(3):
+        budget.record_request(artwork_key="a")
+    # 사용 3 + 남은 예약 1 = 4 → 새 작품(4)을 더해도 10 이하
+    assert budget.try_start_artwork("b")
+
+
+def test_finish_releases_remaining_reservation():
+    budget = RunBudget(max_tokens=1000, artwork_requests=2, artwork_tokens=400)
+    assert budget.try_start_artwork("a")
+    budget.record_request(tokens=100, artwork_key="a")
+    budget.finish_artwork("a")
+
+    summary = budget.summary()
+    assert summary["artworks_finished"] == 1
+    # 요청당 실제 100토큰 × 작품당 2요청으로 예상치 갱신
+    assert summary["estimated_tokens_per_artwork"] == 200
+    assert budget.try_start_artwork("b")
+    assert budget.try_start_artwork("c")
+
+
+def test_allow_request_stops_when_exhausted():
+    budget = RunBudget(max_requests=2)
+    budget.record_request()
+    assert budget.allow_request()
+    budget.record_request()
+    assert not budget.allow_request()
+    assert budget.stop_reason == "요청 예산 소진"
+    assert not budget.try_start_artwork("a")
+
+
+def test_unlimited_budget():
+    budget = RunBudget()
+    assert not budget.enabled
+    assert all(budget.try_start_artwork(str(i)) for i in range(100))
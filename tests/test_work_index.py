@@ -0,0 +1,75 @@
+"""작품 작업 색인 (중복 작품 합류 / 보류) 테스트"""
+
+from utils.records import ArtworkRecord
+from utils.work_index import (
+    CLAIM_DEFERRED, CLAIM_DONE, CLAIM_FOLLOWER, CLAIM_LEADER, WorkIndex, normalize_name,
+)
+
+
+def _artwork(item_id=None, artist="김작가", title="바다", fingerprint="v1") -> ArtworkRecord:
+    return ArtworkRecord(artist, title, item_id=item_id, fingerprint=fingerprint)
+
+
+def test_normalize_name():
+    assert normalize_name("  Sea,  Blue! ") == normalize_name("sea blue")
+    assert normalize_name(None) == ""
+
+
+def test_duplicate_joins_in_flight_work():
+    index = WorkIndex()
+    leader = _artwork(item_id="1")
+    duplicate = _artwork(item_id="1", title="바다 ")
+
+    assert index.claim("a", leader, "out.json")[0] == CLAIM_LEADER
+    assert index.claim("b", duplicate, "out2.json")[0] == CLAIM_FOLLOWER
+    assert index.claim("b", duplicate, "out2.json")[0] == CLAIM_FOLLOWER
+    assert index.in_flight() == 1
+
+    followers, deferred = index.complete("a", success=True)
+    assert followers == [("b", duplicate)]
+    assert deferred == []
+    # 완료 후의 중복 요청은 결과를 바로 공유
+    assert index.claim("c", _artwork(title="바다."), "out3.json")[0] == CLAIM_DONE
+
+
+def test_changed_fingerprint_is_deferred():
+    index = WorkIndex()
+    index.claim("a", _artwork(item_id="1"), "out.json")
+
+    status, _ = index.claim("a", _artwork(item_id="1", fingerprint="v2"), "out.json", payload="new")
+    assert status == CLAIM_DEFERRED
+    assert index.complete("a", success=True) == ([], ["new"])
+    # 수정된 버전은 완료된 결과를 공유하지 않고 다시 처리
+    assert index.claim("a", _artwork(item_id="1", fingerprint="v2"), "out.json")[0] == CLAIM_LEADER
+
+
+def test_same_name_different_ids_are_separate_works():
+    index = WorkIndex()
+    index.claim("a", _artwork(item_id="1"), "out.json")
+
+    status, _ = index.claim("b", _artwork(item_id="2"), "out.json", payload="b")
+    assert status == CLAIM_DEFERRED
+    assert index.complete("a", success=True) == ([], ["b"])
+    assert index.claim("b", _artwork(item_id="2"), "out.json")[0] == CLAIM_LEADER
+
+
+def test_failed_work_is_forgotten():
+    index = WorkIndex()
+    index.claim("a", _artwork(item_id="1"), "out.json")
+    index.claim("b", _artwork(item_id="1"), "out.json")
+
+    followers, _ = index.complete("a", success=False)
+    assert [key for key, _ in followers] == ["b"]
+    assert index.claim("b", _artwork(item_id="1"), "out.json")[0] == CLAIM_LEADER
+
+
+def test_placeholder_names_do_not_coalesce():
+    index = WorkIndex()
+    assert index.claim("a", _artwork(artist="Unknown", title="Unknown"), "a.json")[0] == CLAIM_LEADER
+    assert index.claim("b", _artwork(artist="Unknown", title="Unknown"), "b.json")[0] == CLAIM_LEADER
+
+
+def test_mark_done_shares_previous_result():
+    index = WorkIndex()
+    index.mark_done("a", _artwork(item_id="1"), "out.json")
+    assert index.claim("b", _artwork(item_id="1"), "out.json")[0] == CLAIM_DONE
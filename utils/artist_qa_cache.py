@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+작가 관점 Q&A 캐시
+- 큐레이터 작가 관점 프롬프트는 작가 정보(이름/국적/출생/전시/수상)만 사용하므로 작가별로 한 번만 생성
+- 검증을 통과한 작가 관점 Q&A를 작가별로 저장하고 같은 작가의 다른 작품에서 재사용
+- 작가 정보가 바뀌면(작가 지문 불일치) 캐시를 쓰지 않고 새로 생성한 결과로 교체
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.profiler import profiled
+from utils.records import ArtworkRecord, QARecord
+from utils.work_index import normalize_name
+
+ARTIST_PERSPECTIVE = "curator_artist"
+ARTIST_FIELDS = ("artist", "artist_en", "nationality", "birth_year", "exhibitions", "awards")
+
+_PLACEHOLDER_NAMES = {"", "unknown", "n/a"}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def artist_cache_key(artwork: ArtworkRecord) -> Optional[str]:
+    """작가 캐시 키 (정규화한 작가명, 작가명이 없으면 None - 캐시하지 않음)"""
+    name = normalize_name(artwork.artist)
+    return None if name in _PLACEHOLDER_NAMES else name
+
+
+def artist_fingerprint(artwork: ArtworkRecord) -> str:
+    """작가 관점 프롬프트에 쓰이는 작가 필드 지문"""
+    payload = {field: getattr(artwork, field) for field in ARTIST_FIELDS}
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ArtistQACache:
+    """작가별 큐레이터 작가 관점 Q&A (JSON 파일, 스레드 안전)"""
+
+    def __init__(self, path: Path, min_items: int = 20):
+        """
+        Args:
+            path: 캐시 파일 경로
+            min_items: 저장/재사용에 필요한 최소 항목 수 (작가 관점 목표 개수)
+        """
+        self.path = Path(path)
+        self.min_items = min_items
+        self._lock = threading.Lock()
+        self._artists: Dict[str, Dict[str, Any]] = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    self._artists = loaded.get("artists", {})
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"   ⚠️ 작가 Q&A 캐시 로드 실패 - 새로 생성합니다 ({self.path.name}): {e}")
+
+    def get(self, artwork: ArtworkRecord) -> Optional[List[QARecord]]:
+        """작가 정보가 같은 캐시 항목 → 새 레코드 목록 (작품마다 별도 객체, 없으면 None)"""
+        key = artist_cache_key(artwork)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._artists.get(key)
+            if not entry or entry.get("fingerprint") != artist_fingerprint(artwork):
+                return None
+            items = list(entry["items"])
+        records = [
+            QARecord(item["instruction"], item.get("input", ""), item["output"],
+                     ARTIST_PERSPECTIVE, item.get("batch"), item.get("prompt_hash"))
+            for item in items
+        ]
+        return records if len(records) >= self.min_items else None
+
+    def put(self, artwork: ArtworkRecord, records: List[QARecord], source_key: str, save: bool = True) -> bool:
+        """
+        작품의 작가 관점 Q&A 저장 (목표 개수 미만이면 저장하지 않음) → 저장 여부
+
+        save=False면 이 프로세스의 메모리에만 반영 (여러 노드가 같은 파일을 덮어쓰지 않도록)
+        """
+        key = artist_cache_key(artwork)
+        items = [
+            {"instruction": r.instruction, "input": r.input, "output": r.output,
+             "batch": r.batch, "prompt_hash": r.prompt_hash}
+            for r in records if r.perspective == ARTIST_PERSPECTIVE
+        ]
+        if key is None or len(items) < self.min_items:
+            return False
+        with self._lock:
+            self._artists[key] = {
+                "artist": artwork.artist,
+                "fingerprint": artist_fingerprint(artwork),
+                "source_artwork": source_key,
+                "items": items,
+                "updated_at": _now(),
+            }
+            if save:
+                self._save_locked()
+        return True
+
+    @profiled("io.artist_cache_save")
+    def _save_locked(self) -> None:
+        """원자적 저장 (임시 파일 → 교체)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"artists": self._artists}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+카탈로그 감시 유틸리티
+- data 디렉토리의 mtime/size 인덱스로 신규·수정 파일을 저비용 감지
+- 쓰기가 끝날 때까지 디바운스 (지정 시간 동안 mtime/size가 변하지 않아야 준비 완료)
+"""
+
+import fnmatch
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+class CatalogWatcher:
+    """mtime/size 인덱스 기반 카탈로그 파일 감시기"""
+
+    def __init__(self, data_dir: Path, pattern: str = "*.json", debounce_seconds: float = 2.0):
+        """
+        Args:
+            data_dir: 감시할 디렉토리
+            pattern: 파일명 패턴
+            debounce_seconds: 파일이 이 시간 동안 변하지 않아야 처리 대상으로 판단
+        """
+        self.data_dir = Path(data_dir)
+        self.pattern = pattern
+        self.debounce_seconds = debounce_seconds
+
+        self._index: Dict[Path, Tuple[int, int]] = {}             # 처리 완료된 (mtime_ns, size)
+        self._pending: Dict[Path, Tuple[Tuple[int, int], float]] = {}  # 변경 감지 후 안정화 대기
+        self._primed = False
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        """디렉토리 1회 스캔 (파일 내용은 읽지 않음)"""
+        signatures = {}
+        try:
+            with os.scandir(self.data_dir) as entries:
+                for entry in entries:
+                    if not fnmatch.fnmatch(entry.name, self.pattern):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue  # 스캔 중 삭제된 파일
+                    signatures[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+        return signatures
+
+    def poll(self) -> List[Path]:
+        """
+        신규/수정 후 안정화된 파일 목록 반환
+
+        첫 호출에서는 이미 존재하는 파일을 디바운스 없이 바로 반환합니다.
+        """
+        now = time.monotonic()
+        current = self._scan()
+        ready = []
+
+        for path, signature in current.items():
+            if self._index.get(path) == signature:
+                self._pending.pop(path, None)
+                continue
+
+            if not self._primed:
+                # 시작 시점에 이미 있던 파일은 쓰기가 끝난 것으로 간주
+                ready.append(path)
+                self._index[path] = signature
+                continue
+
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != signature:
+                # 새로 감지되었거나 아직 쓰는 중 - 안정화 대기 시작
+                self._pending[path] = (signature, now)
+                continue
+
+            if now - pending[1] >= self.debounce_seconds and signature[1] > 0:
+                ready.append(path)
+                self._index[path] = signature
+                del self._pending[path]
+
+        # 삭제된 파일 정리
+        for path in list(self._index):
+            if path not in current:
+                del self._index[path]
+        for path in list(self._pending):
+            if path not in current:
+                del self._pending[path]
+
+        self._primed = True
+        return sorted(ready)
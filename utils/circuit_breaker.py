@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+회로 차단기 (closed / open / half-open)
+- 최근 요청의 오류율(타임아웃, 서버 오류)이 높으면 open → 모든 작업자가 요청을 멈추고 대기
+- 대기 시간이 지나면 half-open: 요청 하나만 시험으로 보내고 결과에 따라 재개(closed) 또는 다시 open
+"""
+
+import collections
+import threading
+import time
+from typing import Dict, Optional
+
+from utils.logger import setup_logger
+
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 요청을 보내지 않음 (대기 시간 초과)"""
+
+
+class CircuitBreaker:
+    """스레드 공유 회로 차단기"""
+
+    def __init__(self, name: str, window_seconds: float = 60.0, min_requests: int = 4,
+                 error_rate_threshold: float = 0.5, consecutive_failures: int = 3,
+                 open_seconds: float = 30.0, max_open_seconds: float = 300.0):
+        """
+        Args:
+            window_seconds: 오류율을 계산할 최근 구간 (초)
+            min_requests: 오류율로 판단하기 위한 구간 내 최소 요청 수
+            error_rate_threshold: 이 비율 이상 실패하면 open
+            consecutive_failures: 연속 실패가 이 횟수에 도달하면 오류율과 관계없이 open
+            open_seconds: open 후 시험 요청까지 대기 시간 (시험 실패 시 두 배씩 증가)
+            max_open_seconds: 대기 시간 상한
+        """
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.error_rate_threshold = error_rate_threshold
+        self.consecutive_failures = consecutive_failures
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.logger = setup_logger("CircuitBreaker")
+
+        self._cond = threading.Condition()
+        self._state = STATE_CLOSED
+        self._results: "collections.deque[tuple]" = collections.deque()  # (시각, 성공 여부)
+        self._consecutive = 0
+        self._cooldown = open_seconds
+        self._reopen_at = 0.0
+        self._probe_in_flight = False
+        self.open_count = 0
+
+    @property
+    def state(self) -> str:
+        with self._cond:
+            return self._state
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        요청 허가 대기 - closed면 바로 통과, open이면 대기, half-open이면 시험 요청 하나만 통과
+
+        Raises:
+            CircuitOpenError: timeout 안에 허가를 받지 못한 경우
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._state == STATE_CLOSED:
+                    return
+                if self._state == STATE_OPEN and now >= self._reopen_at:
+                    self._state = STATE_HALF_OPEN
+                    self._probe_in_flight = False
+                if self._state == STATE_HALF_OPEN and not self._probe_in_flight:
+                    self._probe_in_flight = True
+                    self.logger.info(f"🔎 [{self.name}] 시험 요청 전송 (half-open)")
+                    return
+
+                # open이면 재시도 시각까지, half-open이면 시험 결과가 나올 때까지 대기
+                wait = self._reopen_at - now if self._state == STATE_OPEN else 1.0
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise CircuitOpenError(f"{self.name} 회로 열림 ({self._state})")
+                    wait = min(wait, remaining)
+                self._cond.wait(timeout=max(wait, 0.01))
+
+    def record_success(self) -> None:
+        """요청 성공 (엔드포인트가 응답한 경우 포함)"""
+        with self._cond:
+            self._record(True)
+            self._consecutive = 0
+            if self._state == STATE_HALF_OPEN:
+                self._state = STATE_CLOSED
+                self._probe_in_flight = False
+                self._cooldown = self.open_seconds
+                self._results.clear()
+                self.logger.info(f"✅ [{self.name}] 회로 닫힘 - 요청 재개")
+                self._cond.notify_all()
+
+    def record_failure(self) -> None:
+        """요청 실패 (타임아웃, 연결 오류, 서버 오류 등 엔드포인트 장애)"""
+        with self._cond:
+            self._record(False)
+            self._consecutive += 1
+            if self._state == STATE_HALF_OPEN:
+                # 시험 실패 - 대기 시간을 늘려 다시 open
+                self._cooldown = min(self._cooldown * 2, self.max_open_seconds)
+                self._open()
+            elif self._state == STATE_CLOSED and self._should_open():
+                self._open()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            self._trim(time.monotonic())
+            failures = sum(1 for _, ok in self._results if not ok)
+            return {
+                "state": self._state,
+                "requests": len(self._results),
+                "failures": failures,
+                "consecutive_failures": self._consecutive,
+                "open_count": self.open_count,
+            }
+
+    # --- 내부 (self._cond 보유 상태에서 호출) ---
+
+    def _record(self, ok: bool) -> None:
+        now = time.monotonic()
+        self._results.append((now, ok))
+        self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        while self._results and now - self._results[0][0] > self.window_seconds:
+            self._results.popleft()
+
+    def _should_open(self) -> bool:
+        if self._consecutive >= self.consecutive_failures:
+            return True
+        total = len(self._results)
+        if total < self.min_requests:
+            return False
+        failures = sum(1 for _, ok in self._results if not ok)
+        return failures / total >= self.error_rate_threshold
+
+    def _open(self) -> None:
+        self._state = STATE_OPEN
+        self._probe_in_flight = False
+        self._reopen_at = time.monotonic() + self._cooldown
+        self.open_count += 1
+        self.logger.warning(
+            f"🚫 [{self.name}] 회로 열림 - {self._cooldown:.0f}초 동안 모든 요청 중지 "
+            f"(연속 실패 {self._consecutive}회)"
+        )
+        self._cond.notify_all()
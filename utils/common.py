@@ -10,17 +10,20 @@ import gc
 import time
 import signal
 import sys
-import psutil
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, Callable, List
 
 from config import (
-    FILE_WAIT_TIMEOUT, FILE_CHECK_INTERVAL, MAX_MODEL_ATTEMPTS
+    FILE_WAIT_TIMEOUT, FILE_CHECK_INTERVAL, MAX_MODEL_ATTEMPTS,
+    MEMORY_CRITICAL_THRESHOLD_GB, MEMORY_WARNING_THRESHOLD_GB
 )
+from utils.profiler import profiled
+from utils.records import json_default
 
 
 def get_memory_info() -> Dict[str, float]:
     """메모리 정보 반환 (GB 단위)"""
+    import psutil  # 생성 실행에서만 필요하므로 지연 로딩
     memory = psutil.virtual_memory()
     return {
         "total": memory.total / (1024**3),
@@ -31,14 +34,14 @@ def get_memory_info() -> Dict[str, float]:
 
 
 def check_memory_safety() -> Tuple[str, float, float]:
-    """메모리 안전성 검사 (간소화)"""
+    """메모리 안전성 검사 (config.MEMORY_*_THRESHOLD_GB 기준)"""
     memory_info = get_memory_info()
     available = memory_info["available"]
     current_usage = memory_info["used"]
     
-    if available < 2.0:  # 2GB 미만
+    if available < MEMORY_CRITICAL_THRESHOLD_GB:
         return "CRITICAL", available, current_usage
-    elif available < 4.0:  # 4GB 미만
+    elif available < MEMORY_WARNING_THRESHOLD_GB:
         return "WARNING", available, current_usage
     else:
         return "SAFE", available, current_usage
@@ -102,6 +105,7 @@ def load_json_safe(file_path: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
+@profiled("io.save_json_safe")
 def save_json_safe(data: Any, file_path: Path) -> bool:
     """안전한 JSON 파일 저장"""
     try:
@@ -114,7 +118,7 @@ def save_json_safe(data: Any, file_path: Path) -> bool:
         else:
             # 객체인 경우
             with open(file_path, "w", encoding="utf-8-sig") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
         
         return True
     except Exception as e:
@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 from utils.common import load_json_safe, save_json_safe
 from utils.logger import log_info, log_err, log_warn
+from utils.records import ArtworkRecord
 
 
 class FileProcessor:
@@ -74,8 +75,8 @@ def load_artwork_items_from_file(file_path: Path) -> Optional[List[Dict[str, Any
 load_artwork_items = load_artwork_items_from_file
 
 
-def convert_raw_item_to_standard_artwork(raw_item: Dict[str, Any]) -> Dict[str, Any]:
-    """API 응답 아이템을 표준 작품 데이터로 변환"""
+def convert_raw_item_to_standard_artwork(raw_item: Dict[str, Any]) -> ArtworkRecord:
+    """API 응답 아이템을 표준 작품 레코드로 변환 (성명/작품명 키로도 조회 가능)"""
     try:
         # artist_info JSON 문자열 파싱
         artist_metadata = {}
@@ -87,49 +88,20 @@ def convert_raw_item_to_standard_artwork(raw_item: Dict[str, Any]) -> Dict[str,
                 item_id = raw_item.get('id', 'Unknown')
                 log_warn(f"artist_info JSON 파싱 실패 (ID: {item_id})")
         
-        # 표준 작품 데이터 형식으로 변환
-        standard_artwork = {
-            # 작가 정보
-            "성명": raw_item.get("artist_name", "Unknown"),
-            "성명_영문": raw_item.get("artist_name_eng", ""),
-            "국적": raw_item.get("nationality", ""),
-            "출생년도": artist_metadata.get("birth", ""),
-            
-            # 작품 정보
-            "작품명": raw_item.get("title", "Unknown"),
-            "작품명_영문": raw_item.get("title_eng", ""),
-            "크기": raw_item.get("size", ""),
-            "무게": raw_item.get("weight", ""),
-            "제작연도": raw_item.get("year", ""),
-            "소재": raw_item.get("materials", ""),
-            
-            # 설명 및 노트
-            "작가노트": raw_item.get("artist_note", ""),
-            "작품설명": raw_item.get("description", ""),
-            
-            # 전시 및 수상 이력
-            "전시이력": artist_metadata.get("exhibits", []),
-            "수상이력": artist_metadata.get("awards", []),
-            
-            # 메타데이터 (디버깅용)
-            "item_id": raw_item.get("id"),
-            "item_no": raw_item.get("no")
-        }
-        
-        return standard_artwork
+        return ArtworkRecord.from_raw(raw_item, artist_metadata)
         
     except Exception as e:
         item_id = raw_item.get("id", "Unknown")
         log_err(f"작품 형식 변환 실패 (ID: {item_id}): {e}")
         
         # 최소 필수 데이터로 폴백
-        return {
-            "성명": raw_item.get("artist_name", "Unknown"),
-            "작품명": raw_item.get("title", "Unknown"), 
-            "소재": raw_item.get("materials", "다양한 재료"),
-            "item_id": raw_item.get("id"),
-            "item_no": raw_item.get("no")
-        }
+        return ArtworkRecord(
+            raw_item.get("artist_name", "Unknown"),
+            raw_item.get("title", "Unknown"),
+            materials=raw_item.get("materials", "다양한 재료"),
+            item_id=raw_item.get("id"),
+            item_no=raw_item.get("no")
+        )
 
 
 # 하위 호환성을 위한 별칭
@@ -158,7 +130,7 @@ def create_jsonl_output(results: List[Dict[str, Any]], output_path: Path) -> boo
         return False
 
 
-def save_final_result(result: List[Dict[str, Any]], artwork: Dict[str, Any], all_results: list, output_dir: Path) -> bool:
+def save_final_result(result: List[Dict[str, Any]], artwork: ArtworkRecord, all_results: list, output_dir: Path) -> bool:
     """최종 결과를 JSON 파일로 저장"""
     try:
         # 작가명과 작품명으로 파일명 생성
@@ -193,7 +165,7 @@ def save_final_result(result: List[Dict[str, Any]], artwork: Dict[str, Any], all
         return False
 
 
-def create_fallback_result(artwork: Dict[str, Any], error: str) -> str:
+def create_fallback_result(artwork: ArtworkRecord, error: str) -> str:
     """폴백 결과 생성 (파싱 실패 시)"""
     artist_name = artwork.get("성명", "Unknown")
     artwork_title = artwork.get("작품명", "Unknown")
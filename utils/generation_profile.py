@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+생성 프로필 (profiles/<이름>.json)
+- 배치 계획, 동시 요청 수/요청 간격, 관점별 토큰 크기와 샘플링, 요청 타임아웃, 재시도 정책을 파일로 정의
+- --gen-profile로 실행 전체 프로필을 고르고, --perspective-profile 관점=이름으로 관점별 생성 설정만 다른 프로필에서 가져옴
+- 생략한 실행 설정(동시성/타임아웃/재시도)은 config 값 사용
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    GENERATION_PROFILES_DIR, PIPELINE_STAGE_WORKERS, PIPELINE_MIN_REQUEST_INTERVAL, REQUEST_TIMEOUT_SECONDS,
+    RETRY_MAX_REQUEST_ATTEMPTS, RETRY_ARTWORK_BUDGET, RETRY_BASE_DELAY, RETRY_MAX_DELAY, MAX_MODEL_ATTEMPTS
+)
+
+PERSPECTIVES = ("visitor", "curator_artwork", "curator_artist")
+
+# 프로필 retry 항목 → RetryPolicy 인자 (기본값은 config)
+RETRY_DEFAULTS = {
+    "max_request_attempts": RETRY_MAX_REQUEST_ATTEMPTS,
+    "artwork_budget": RETRY_ARTWORK_BUDGET,
+    "max_artwork_attempts": MAX_MODEL_ATTEMPTS,
+    "base_delay": RETRY_BASE_DELAY,
+    "max_delay": RETRY_MAX_DELAY,
+}
+
+
+class ProfileError(ValueError):
+    """프로필 파일이 없거나 형식이 잘못됨"""
+
+
+class PerspectiveParams:
+    """관점별 생성 파라미터 (토큰 크기 / 샘플링)"""
+
+    __slots__ = ("max_tokens_per_item", "max_tokens_cap", "temperature", "top_p", "source")
+
+    def __init__(self, max_tokens_per_item: int, max_tokens_cap: int, temperature: float,
+                 top_p: Optional[float] = None, source: str = ""):
+        self.max_tokens_per_item = max_tokens_per_item
+        self.max_tokens_cap = max_tokens_cap
+        self.temperature = temperature
+        self.top_p = top_p
+        self.source = source   # 설정을 가져온 프로필 이름
+
+    def max_tokens(self, batch_size: int) -> int:
+        """배치 크기에 비례한 max_tokens (상한 적용)"""
+        return min(self.max_tokens_cap, batch_size * self.max_tokens_per_item)
+
+
+class GenerationProfile:
+    """생성 프로필 1개 (load_profile로 생성)"""
+
+    __slots__ = ("name", "label", "description", "batch_plan", "generate_workers", "min_request_interval",
+                 "request_timeout", "retry", "perspectives")
+
+    def __init__(self, name: str, label: str, description: str, batch_plan: List[Tuple[str, str, int]],
+                 generate_workers: int, min_request_interval: float, request_timeout: float,
+                 retry: Dict[str, Any], perspectives: Dict[str, PerspectiveParams]):
+        self.name = name
+        self.label = label
+        self.description = description
+        self.batch_plan = batch_plan
+        self.generate_workers = generate_workers
+        self.min_request_interval = min_request_interval
+        self.request_timeout = request_timeout
+        self.retry = retry
+        self.perspectives = perspectives
+
+    @property
+    def mode(self) -> str:
+        """사용량/격리 기록용 이름 (관점별로 다른 프로필을 쓰면 함께 표시)"""
+        overrides = [f"{p}={params.source}" for p, params in self.perspectives.items() if params.source != self.name]
+        return f"{self.name}({','.join(overrides)})" if overrides else self.name
+
+    def params(self, batch_type: str) -> PerspectiveParams:
+        return self.perspectives[batch_type]
+
+    def with_perspectives(self, overrides: Dict[str, "GenerationProfile"]) -> "GenerationProfile":
+        """관점별 생성 파라미터만 다른 프로필에서 가져온 사본"""
+        perspectives = dict(self.perspectives)
+        for perspective, other in overrides.items():
+            perspectives[perspective] = other.params(perspective)
+        return GenerationProfile(
+            self.name, self.label, self.description, self.batch_plan, self.generate_workers,
+            self.min_request_interval, self.request_timeout, self.retry, perspectives
+        )
+
+
+def _is_profile_file(path: Path) -> bool:
+    """프로필 정의 파일 여부 (batch_plan과 perspectives가 있는 JSON 객체 - 다른 JSON 파일은 제외)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return isinstance(data, dict) and "batch_plan" in data and "perspectives" in data
+
+
+def list_profiles(profiles_dir: Path = GENERATION_PROFILES_DIR) -> List[str]:
+    """사용 가능한 프로필 이름"""
+    return sorted(path.stem for path in Path(profiles_dir).glob("*.json") if _is_profile_file(path))
+
+
+def _require(data: Dict, key: str, kind, where: str):
+    value = data.get(key)
+    if isinstance(value, bool) or not isinstance(value, kind):
+        raise ProfileError(f"{where}: '{key}' 항목이 없거나 형식이 잘못됨")
+    return value
+
+
+def _parse_perspective(name: str, perspective: str, data: Any) -> PerspectiveParams:
+    where = f"{name}.perspectives.{perspective}"
+    if not isinstance(data, dict):
+        raise ProfileError(f"{where}: 객체가 아님")
+    top_p = data.get("top_p")
+    if top_p is not None and (isinstance(top_p, bool) or not isinstance(top_p, (int, float))):
+        raise ProfileError(f"{where}: 'top_p' 형식이 잘못됨")
+    return PerspectiveParams(
+        _require(data, "max_tokens_per_item", int, where),
+        _require(data, "max_tokens_cap", int, where),
+        float(_require(data, "temperature", (int, float), where)),
+        top_p,
+        name,
+    )
+
+
+def _parse_batch_plan(name: str, entries: Any) -> List[Tuple[str, str, int]]:
+    if not isinstance(entries, list) or not entries:
+        raise ProfileError(f"{name}: 'batch_plan'이 없거나 비어 있음")
+    plan = []
+    for entry in entries:
+        if (not isinstance(entry, list) or len(entry) != 3 or not isinstance(entry[0], str)
+                or entry[1] not in PERSPECTIVES or isinstance(entry[2], bool) or not isinstance(entry[2], int)
+                or entry[2] <= 0):
+            raise ProfileError(f"{name}: batch_plan 항목은 [배치명, 관점, 배치 크기] 형식이어야 함: {entry}")
+        plan.append((entry[0], entry[1], entry[2]))
+    names = [batch_name for batch_name, _, _ in plan]
+    if len(set(names)) != len(names):
+        raise ProfileError(f"{name}: batch_plan 배치명이 중복됨")
+    return plan
+
+
+def load_profile(name: str, profiles_dir: Path = GENERATION_PROFILES_DIR) -> GenerationProfile:
+    """profiles/<name>.json 로드 및 검증"""
+    path = Path(profiles_dir) / f"{name}.json"
+    if not path.exists():
+        available = ", ".join(list_profiles(profiles_dir)) or "없음"
+        raise ProfileError(f"생성 프로필을 찾을 수 없습니다: {path} (사용 가능: {available})")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ProfileError(f"생성 프로필 로드 실패 ({path.name}): {e}") from e
+    if not isinstance(data, dict):
+        raise ProfileError(f"{name}: 최상위가 객체가 아님")
+
+    perspectives_data = data.get("perspectives")
+    if not isinstance(perspectives_data, dict):
+        raise ProfileError(f"{name}: 'perspectives' 항목이 없음")
+    unknown = set(perspectives_data) - set(PERSPECTIVES)
+    missing = set(PERSPECTIVES) - set(perspectives_data)
+    if unknown or missing:
+        raise ProfileError(f"{name}: perspectives는 {', '.join(PERSPECTIVES)}를 모두 정의해야 함"
+                           f" (누락: {', '.join(sorted(missing)) or '-'}, 알 수 없음: {', '.join(sorted(unknown)) or '-'})")
+    perspectives = {p: _parse_perspective(name, p, perspectives_data[p]) for p in PERSPECTIVES}
+
+    concurrency = data.get("concurrency", {})
+    retry_data = data.get("retry", {})
+    unknown_retry = set(retry_data) - set(RETRY_DEFAULTS)
+    if unknown_retry:
+        raise ProfileError(f"{name}: 알 수 없는 retry 항목: {', '.join(sorted(unknown_retry))}")
+
+    return GenerationProfile(
+        name=name,
+        label=data.get("label", name),
+        description=data.get("description", ""),
+        batch_plan=_parse_batch_plan(name, data.get("batch_plan")),
+        generate_workers=int(concurrency.get("generate_workers", PIPELINE_STAGE_WORKERS["generate"])),
+        min_request_interval=float(concurrency.get("min_request_interval", PIPELINE_MIN_REQUEST_INTERVAL)),
+        request_timeout=float(data.get("request_timeout", REQUEST_TIMEOUT_SECONDS)),
+        retry=dict(RETRY_DEFAULTS, **retry_data),
+        perspectives=perspectives,
+    )
+
+
+def parse_perspective_profile(value: str) -> Tuple[str, str]:
+    """'관점=프로필' → (관점, 프로필 이름)"""
+    perspective, sep, name = value.partition("=")
+    perspective, name = perspective.strip(), name.strip()
+    if not sep or perspective not in PERSPECTIVES or not name:
+        raise ValueError(f"관점=프로필 형식이어야 합니다 (관점: {', '.join(PERSPECTIVES)}): {value}")
+    return perspective, name
+
+
+def resolve_profile(name: str, perspective_profiles: Optional[List[Tuple[str, str]]] = None,
+                    profiles_dir: Path = GENERATION_PROFILES_DIR) -> GenerationProfile:
+    """실행 프로필 + 관점별 프로필 → 최종 프로필"""
+    profile = load_profile(name, profiles_dir)
+    if not perspective_profiles:
+        return profile
+    loaded = {}
+    overrides = {}
+    for perspective, other in perspective_profiles:
+        if other not in loaded:
+            loaded[other] = load_profile(other, profiles_dir)
+        overrides[perspective] = loaded[other]
+    return profile.with_perspectives(overrides)
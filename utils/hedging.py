@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+헤지 요청 지원
+- 최근 요청 지연 시간으로 백분위 임계값 계산
+- 헤지 예산: 전체 요청 대비 헤지 비율 상한 (추가 비용 제한)
+"""
+
+import collections
+import math
+import threading
+from typing import Dict, Optional
+
+
+class LatencyTracker:
+    """최근 N개 요청의 지연 시간 기록"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: "collections.deque[float]" = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p 백분위 지연 시간 (표본이 부족하면 None)"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """헤지 요청 수를 전체 요청의 일정 비율 이하로 제한"""
+
+    def __init__(self, ratio: float = 0.05, burst: int = 2):
+        """
+        Args:
+            ratio: 전체 요청 대비 허용 헤지 비율
+            burst: 요청 수가 적을 때도 허용하는 여유 헤지 수
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_acquire(self) -> bool:
+        """헤지 요청 1회 허가 (예산 초과 시 False)"""
+        with self._lock:
+            if self.hedges + 1 > self.requests * self.ratio + self.burst:
+                return False
+            self.hedges += 1
+            return True
+
+    def record_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"requests": self.requests, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
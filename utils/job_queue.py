@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+공유 작업 큐 (SQLite, 임대 기반)
+- 여러 호스트가 공유 파일시스템의 같은 DB로 한 카탈로그를 나눠 처리
+- 작품 = 작업: 임대 만료, 하트비트, 재시도 횟수, 멱등 완료 처리
+- 완료/실패/건너뜀 기록은 임대를 보유한 노드만 가능 (만료 후 다른 노드가 다시 임대한 작업은 건드리지 않음)
+- 네트워크 파일시스템에서는 WAL을 쓸 수 없으므로 rollback 저널 + 쓰기 잠금(BEGIN IMMEDIATE) 사용
+"""
+
+import json
+import socket
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    fingerprint TEXT,
+    change TEXT NOT NULL DEFAULT 'new',
+    status TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    heartbeat_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    last_error TEXT,
+    completed_by TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    completed_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status_expires ON jobs(status, lease_expires_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_owner ON jobs(lease_owner);
+"""
+
+# 작업 상태
+JOB_PENDING = "pending"
+JOB_LEASED = "leased"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_SKIPPED = "skipped"   # 격리 등으로 이번에 처리하지 않음 (다음 투입 시 다시 대기열로)
+
+
+def default_node_id() -> str:
+    """기본 노드 ID (호스트명-PID)"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class JobQueue:
+    """임대 기반 공유 작업 큐"""
+
+    def __init__(self, db_path: Path, node_id: Optional[str] = None,
+                 lease_seconds: float = 300.0, max_attempts: int = 3):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.node_id = node_id or default_node_id()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        # isolation_level=None: 트랜잭션을 BEGIN IMMEDIATE로 직접 관리
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, func):
+        """쓰기 트랜잭션 (다른 호스트와 BEGIN IMMEDIATE 잠금으로 직렬화)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # --- 투입 ---
+
+    def enqueue(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        작업 투입 (멱등)
+
+        jobs: [{"job_key", "payload"(dict), "fingerprint"}]
+        - 새 작업은 pending으로 추가
+        - 지문이 바뀐 작업은 상태와 관계없이 pending으로 되돌리고 change='changed'
+        - 지문이 같은 작업은 그대로 둠 (완료된 작업 재처리 없음, 건너뛴 작업만 다시 pending)
+
+        Returns:
+            새로 추가되거나 다시 대기열에 들어간 작업 수
+        """
+        now = time.time()
+
+        def _enqueue(conn):
+            queued = 0
+            for job in jobs:
+                row = conn.execute(
+                    "SELECT fingerprint FROM jobs WHERE job_key = ?", (job["job_key"],)
+                ).fetchone()
+                payload = json.dumps(job["payload"], ensure_ascii=False)
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO jobs (job_key, payload, fingerprint, change, status, "
+                        "max_attempts, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (job["job_key"], payload, job.get("fingerprint"), job.get("change", "new"),
+                         JOB_PENDING, self.max_attempts, now, now),
+                    )
+                    queued += 1
+                elif row["fingerprint"] != job.get("fingerprint"):
+                    conn.execute(
+                        "UPDATE jobs SET payload = ?, fingerprint = ?, change = 'changed', "
+                        "status = ?, attempts = 0, lease_owner = NULL, lease_expires_at = NULL, "
+                        "last_error = NULL, updated_at = ? WHERE job_key = ?",
+                        (payload, job.get("fingerprint"), JOB_PENDING, now, job["job_key"]),
+                    )
+                    queued += 1
+                else:
+                    # 건너뛴 작업(격리 등)은 다음 실행에서 격리 여부를 다시 판단
+                    cursor = conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = 0, updated_at = ? WHERE job_key = ? AND status = ?",
+                        (JOB_PENDING, now, job["job_key"], JOB_SKIPPED),
+                    )
+                    queued += cursor.rowcount
+            return queued
+
+        return self._write(_enqueue)
+
+    # --- 임대 ---
+
+    def lease(self, limit: int = 1) -> List[Dict[str, Any]]:
+        """대기 중이거나 임대가 만료된 작업을 최대 limit개 임대"""
+        if limit <= 0:
+            return []
+        now = time.time()
+
+        def _lease(conn):
+            # 마지막 시도 중 노드가 사라진 작업은 실패 처리
+            conn.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, lease_owner = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts",
+                (JOB_FAILED, "임대 만료 (재시도 횟수 소진)", now, JOB_LEASED, now),
+            )
+            rows = conn.execute(
+                """
+                SELECT job_key, payload, fingerprint, change, attempts FROM jobs
+                WHERE attempts < max_attempts
+                  AND (status = ? OR (status = ? AND lease_expires_at < ?))
+                ORDER BY attempts, created_at
+                LIMIT ?
+                """,
+                (JOB_PENDING, JOB_LEASED, now, limit),
+            ).fetchall()
+            for row in rows:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires_at = ?, "
+                    "heartbeat_at = ?, attempts = attempts + 1, updated_at = ? WHERE job_key = ?",
+                    (JOB_LEASED, self.node_id, now + self.lease_seconds, now, now, row["job_key"]),
+                )
+            return [
+                {
+                    "job_key": row["job_key"],
+                    "payload": json.loads(row["payload"]),
+                    "fingerprint": row["fingerprint"],
+                    "change": row["change"],
+                    "attempt": row["attempts"] + 1,
+                }
+                for row in rows
+            ]
+
+        return self._write(_lease)
+
+    def heartbeat(self, job_keys: List[str]) -> int:
+        """보유 중인 작업의 임대 연장 (다른 노드에 넘어간 작업은 제외)"""
+        if not job_keys:
+            return 0
+        now = time.time()
+
+        def _heartbeat(conn):
+            extended = 0
+            for job_key in job_keys:
+                cursor = conn.execute(
+                    "UPDATE jobs SET lease_expires_at = ?, heartbeat_at = ? "
+                    "WHERE job_key = ? AND lease_owner = ? AND status = ?",
+                    (now + self.lease_seconds, now, job_key, self.node_id, JOB_LEASED),
+                )
+                extended += cursor.rowcount
+            return extended
+
+        return self._write(_heartbeat)
+
+    # --- 종료 처리 ---
+
+    def complete(self, job_key: str) -> bool:
+        """작업 완료 (멱등 - 임대를 잃었거나 이미 완료된 작업이면 False)"""
+        now = time.time()
+
+        def _complete(conn):
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, completed_by = ?, completed_at = ?, updated_at = ?, "
+                "lease_owner = NULL, lease_expires_at = NULL WHERE job_key = ? AND lease_owner = ? AND status = ?",
+                (JOB_DONE, self.node_id, now, now, job_key, self.node_id, JOB_LEASED),
+            )
+            return cursor.rowcount > 0
+
+        return self._write(_complete)
+
+    def fail(self, job_key: str, error: str) -> Optional[str]:
+        """작업 실패 - 재시도 횟수가 남았으면 pending, 아니면 failed (임대를 잃었으면 None)"""
+        now = time.time()
+
+        def _fail(conn):
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+                "last_error = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE job_key = ? AND lease_owner = ? AND status = ?",
+                (JOB_FAILED, JOB_PENDING, error[:1000], now, job_key, self.node_id, JOB_LEASED),
+            )
+            if cursor.rowcount == 0:
+                return None
+            return conn.execute("SELECT status FROM jobs WHERE job_key = ?", (job_key,)).fetchone()["status"]
+
+        return self._write(_fail)
+
+    def skip(self, job_key: str, reason: str) -> bool:
+        """작업 건너뜀 (격리 등 - 재시도 횟수를 쓰지 않고 이번 실행에서 다시 임대하지 않음, 임대를 잃었으면 False)"""
+        now = time.time()
+
+        def _skip(conn):
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, lease_owner = NULL, lease_expires_at = NULL, "
+                "updated_at = ? WHERE job_key = ? AND lease_owner = ? AND status = ?",
+                (JOB_SKIPPED, reason[:1000], now, job_key, self.node_id, JOB_LEASED),
+            )
+            return cursor.rowcount > 0
+
+        return self._write(_skip)
+
+    def release_all(self) -> int:
+        """이 노드가 보유한 작업을 모두 반납 (정상 종료 시, 시도 횟수는 되돌림)"""
+        now = time.time()
+
+        def _release(conn):
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires_at = NULL, "
+                "attempts = MAX(attempts - 1, 0), updated_at = ? WHERE lease_owner = ? AND status = ?",
+                (JOB_PENDING, now, self.node_id, JOB_LEASED),
+            )
+            return cursor.rowcount
+
+        return self._write(_release)
+
+    # --- 조회 ---
+
+    def stats(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def remaining(self) -> int:
+        """아직 끝나지 않은 작업 수 (대기 + 임대 중)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (JOB_PENDING, JOB_LEASED)
+            ).fetchone()[0]
@@ -5,8 +5,15 @@
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
+from utils.logger import setup_logger
+from utils.profiler import profiled
+from utils.records import QARecord
+
+logger = setup_logger("JsonParser")
+
+@profiled("parse.clean_json_string")
 def clean_json_string(text: str) -> str:
     """JSON 문자열을 정리하여 파싱 가능하게 만듭니다"""
     
@@ -162,8 +169,17 @@ def _try_basic_json_parse(text: str) -> List[Dict[str, Any]]:
     
     return []
 
-def smart_json_parse(text: str) -> List[Dict[str, Any]]:
-    """스마트 JSON 파싱 - 모든 경우를 처리합니다"""
+def _silent(*args, **kwargs) -> None:
+    """디버그 출력 비활성화용"""
+    return None
+
+@profiled("parse.smart_json_parse")
+def smart_json_parse(text: str, verbose: bool = True, stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """스마트 JSON 파싱 - 모든 경우를 처리합니다 (stats를 주면 성공한 단계 기록)"""
+    debug = logger.info if verbose else _silent
+    if stats is None:
+        stats = {}
+    stats["stage"] = "failed"
     
     if not text or not text.strip():
         return []
@@ -172,9 +188,10 @@ def smart_json_parse(text: str) -> List[Dict[str, Any]]:
     try:
         result = _try_basic_json_parse(text)
         if result:
+            stats["stage"] = "basic"
             return result
     except (json.JSONDecodeError, ValueError, KeyError) as e:
-        print(f"🔍 1단계 파싱 실패: {e}")
+        debug(f"🔍 1단계 파싱 실패: {e}")
     
     # 2단계: 불완전한 JSON 수정 후 재시도
     try:
@@ -191,9 +208,10 @@ def smart_json_parse(text: str) -> List[Dict[str, Any]]:
                     has_question = 'question' in item and 'answer' in item
                     if has_instruction or has_question:
                         valid_items.append(item)
+            stats["stage"] = "repaired"
             return valid_items
     except (json.JSONDecodeError, ValueError) as e:
-        print(f"🔍 2단계 파싱 실패: {e}")
+        debug(f"🔍 2단계 파싱 실패: {e}")
     
     # 3단계: 완전한 객체들만 추출
     try:
@@ -201,9 +219,10 @@ def smart_json_parse(text: str) -> List[Dict[str, Any]]:
         if object_strings:
             array_text = '[' + ','.join(object_strings) + ']'
             parsed = json.loads(array_text)
+            stats["stage"] = "objects"
             return parsed
     except (json.JSONDecodeError, ValueError) as e:
-        print(f"🔍 3단계 파싱 실패: {e}")
+        debug(f"🔍 3단계 파싱 실패: {e}")
     
     # 4단계: 정규식으로 필드별 추출
     try:
@@ -252,11 +271,13 @@ def smart_json_parse(text: str) -> List[Dict[str, Any]]:
             if results:
                 break
         
-        print(f"🔍 4단계 정규식 파싱 결과: {len(results)}개 항목 추출")
+        debug(f"🔍 4단계 정규식 파싱 결과: {len(results)}개 항목 추출")
+        if results:
+            stats["stage"] = "regex"
         return results[:10]  # 최대 10개로 제한
     
     except (re.error, ValueError, IndexError) as e:
-        print(f"🔍 4단계 파싱 실패: {e}")
+        debug(f"🔍 4단계 파싱 실패: {e}")
     
     return []
 
@@ -284,61 +305,68 @@ def remove_incomplete_last_object(text: str) -> str:
     except (ValueError, IndexError):
         return text
 
-def parse_model_output(text: str, model_name: str = "Unknown") -> List[Dict[str, Any]]:
-    """모델 출력을 안전하게 파싱하는 메인 함수"""
+@profiled("parse.parse_model_output")
+def parse_model_output(text: str, model_name: str = "Unknown", verbose: bool = True,
+                       stats: Optional[Dict[str, Any]] = None) -> List[QARecord]:
+    """
+    모델 출력을 안전하게 파싱하는 메인 함수 (verbose=False면 디버그 출력/미리보기 생략)
+    파싱한 dict의 문자열을 그대로 참조하는 QARecord 목록 반환
+
+    stats를 주면 성공한 파싱 단계(stage)와 파싱된 항목 수(parsed)를 기록합니다.
+    """
+    debug = logger.info if verbose else _silent
+    if stats is None:
+        stats = {}
+    stats.update(stage="empty", parsed=0)
 
-    print(f"🔄 {model_name} 출력 파싱 시작...")
+    debug(f"🔄 {model_name} 출력 파싱 시작...")
     
     if not text:
-        print(f"❌ {model_name}: 빈 출력")
+        logger.warning(f"❌ {model_name}: 빈 출력")
         return []
     
     # 디버깅: 원본 텍스트 정보
-    print(f"🔍 원본 텍스트 길이: {len(text)} 문자")
-    print(f"🔍 코드 블록 여부: {'```' in text}")
-    print(f"🔍 JSON 배열 여부: '[' in text and ']' in text = {('[' in text and ']' in text)}")
+    if verbose:
+        debug(f"🔍 원본 텍스트 길이: {len(text)} 문자")
+        debug(f"🔍 코드 블록 여부: {'```' in text}")
+        debug(f"🔍 JSON 배열 여부: '[' in text and ']' in text = {('[' in text and ']' in text)}")
     
     # 스마트 파싱 실행
-    parsed_items = smart_json_parse(text)
+    parsed_items = smart_json_parse(text, verbose, stats)
     
     if not parsed_items:
-        print(f"❌ {model_name}: 파싱 실패")
-        print(f"🔍 정리된 텍스트 미리보기:")
-        cleaned = clean_json_string(text)
-        print(f"   정리 후: {cleaned[:300]}...")
+        logger.warning(f"❌ {model_name}: 파싱 실패")
+        if verbose:
+            debug(f"🔍 정리된 텍스트 미리보기:")
+            cleaned = clean_json_string(text)
+            debug(f"   정리 후: {cleaned[:300]}...")
         return []
     
-    # 검증 및 수정
+    # 레코드로 변환 (question/answer 형식은 instruction/output으로)
     final_items = []
     for item in parsed_items:
-        # Gemma의 question/answer 형식도 처리
         if isinstance(item, dict):
-            if 'question' in item and 'answer' in item:
-                # question/answer를 instruction/output으로 변환
-                final_items.append({
-                    'instruction': item['question'],
-                    'input': '',
-                    'output': item['answer']
-                })
-            elif 'instruction' in item and 'output' in item:
-                if 'input' not in item:
-                    item['input'] = ""
-                final_items.append(item)
+            record = QARecord.from_dict(item)
+            if record is not None:
+                final_items.append(record)
 
     if not final_items:
-        print(f"❌ {model_name}: 유효한 항목 없음 (필수 필드 누락)")
-        print(f"🔍 파싱된 항목 형식 확인:")
-        for i, item in enumerate(parsed_items[:3]):
-            keys = list(item.keys()) if isinstance(item, dict) else ["invalid_type"]
-            print(f"   항목 {i+1}: {keys}")
+        logger.warning(f"❌ {model_name}: 유효한 항목 없음 (필수 필드 누락)")
+        if verbose:
+            debug(f"🔍 파싱된 항목 형식 확인:")
+            for i, item in enumerate(parsed_items[:3]):
+                keys = list(item.keys()) if isinstance(item, dict) else ["invalid_type"]
+                debug(f"   항목 {i+1}: {keys}")
         return []
     
-    print(f"✅ {model_name}: {len(final_items)}개 항목 파싱 성공")
+    stats["parsed"] = len(final_items)
+    debug(f"✅ {model_name}: {len(final_items)}개 항목 파싱 성공")
     
     # 결과 요약 출력
-    for i, item in enumerate(final_items[:3]):  # 처음 3개만 미리보기
-        word_count = len(item['output'].split())
-        print(f"   항목 {i+1}: {item['instruction'][:30]}... ({word_count}단어)")
+    if verbose:
+        for i, item in enumerate(final_items[:3]):  # 처음 3개만 미리보기
+            word_count = len(str(item.output).split())
+            debug(f"   항목 {i+1}: {str(item.instruction)[:30]}... ({word_count}단어)")
     
     return final_items
 
@@ -1,28 +1,87 @@
 #!/usr/bin/env python3
 """
 공통 로깅 유틸리티 (A.X 4.0 API 전용)
+- text(기본) / json(한 줄에 하나의 JSON 객체) 형식
+- configure_logging()으로 이미 만든 로거까지 형식/레벨 변경
 """
 
+import json
 import logging
+import threading
 from typing import Optional
 
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
-def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
-    """로거 설정 및 반환"""
+# 표준 LogRecord 속성 (나머지는 extra로 넘긴 구조화 필드)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_settings = {"format": "text", "level": "INFO"}
+_loggers = {}
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON 한 줄 형식 (logger.info(msg, extra={...})의 필드 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _make_handler() -> logging.Handler:
+    handler = logging.StreamHandler()
+    if _settings["format"] == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
+    """로거 설정 및 반환 (level을 주지 않으면 configure_logging 설정을 따름)"""
     logger = logging.getLogger(name)
-    
-    if not logger.handlers:  # 중복 핸들러 방지
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(getattr(logging, level.upper()))
-    
+
+    with _lock:
+        if not logger.handlers:  # 중복 핸들러 방지
+            logger.addHandler(_make_handler())
+            logger.setLevel(getattr(logging, (level or _settings["level"]).upper()))
+            logger.propagate = False
+            _loggers[name] = level
+
     return logger
 
 
+def configure_logging(fmt: Optional[str] = None, level: Optional[str] = None) -> None:
+    """
+    로그 형식/레벨 변경 (이미 만든 로거에도 적용)
+
+    Args:
+        fmt: "text" 또는 "json"
+        level: DEBUG / INFO / WARNING / ERROR
+    """
+    with _lock:
+        if fmt:
+            _settings["format"] = fmt
+        if level:
+            _settings["level"] = level.upper()
+        for name, fixed_level in _loggers.items():
+            logger = logging.getLogger(name)
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+            logger.addHandler(_make_handler())
+            logger.setLevel(getattr(logging, (fixed_level or _settings["level"]).upper()))
+
+
 def log_info(msg: str) -> None:
     """정보 로그 출력"""
     print(f"ℹ️ {msg}")
@@ -40,4 +99,4 @@ def log_err(msg: str) -> None:
 
 def log_success(msg: str) -> None:
     """성공 로그 출력"""
-    print(f"✅ {msg}")
\ No newline at end of file
+    print(f"✅ {msg}")
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+실행 지표 (카운터 / 게이지 / 히스토그램)
+- 요청 지연, 첫 토큰까지 시간, 재시도, 파싱 단계, 호출당 항목 수, 검증 탈락, 큐 깊이
+- Prometheus textfile(node_exporter textfile collector)과 JSON으로 내보내기
+- 내보낼 때마다 등록된 수집 함수 실행 (큐 깊이처럼 그 시점 값을 읽는 게이지용)
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import setup_logger
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 8, 10, 15, 20, 30)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, object] = {}
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """누적 증가 값"""
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount <= 0:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def to_prometheus(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return self._header() + [f"{self.name}{_format_labels(k)} {v}" for k, v in sorted(values.items())]
+
+    def to_json(self) -> List[Dict]:
+        with self._lock:
+            return [{"labels": dict(k), "value": v} for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """현재 값 (설정/증감)"""
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    """구간별 관측 수 + 합계 (Prometheus 누적 버킷 형식)"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    def _snapshot(self) -> Dict[LabelKey, Dict]:
+        with self._lock:
+            return {k: {"counts": list(s["counts"]), "sum": s["sum"], "count": s["count"]}
+                    for k, s in self._values.items()}
+
+    def to_prometheus(self) -> List[str]:
+        lines = self._header()
+        for key, state in sorted(self._snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', str(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {state['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {round(state['sum'], 6)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {state['count']}")
+        return lines
+
+    def to_json(self) -> List[Dict]:
+        result = []
+        for key, state in sorted(self._snapshot().items()):
+            result.append({
+                "labels": dict(key),
+                "count": state["count"],
+                "sum": round(state["sum"], 6),
+                "mean": round(state["sum"] / state["count"], 6) if state["count"] else None,
+                "p50": self._quantile(state, 0.5),
+                "p95": self._quantile(state, 0.95),
+                "buckets": {str(b): c for b, c in zip(self.buckets, state["counts"])},
+            })
+        return result
+
+    def _quantile(self, state: Dict, q: float) -> Optional[float]:
+        """버킷 상한 기준 근사 백분위 (마지막 버킷을 넘으면 None)"""
+        if not state["count"]:
+            return None
+        target = q * state["count"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, state["counts"]):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return None
+
+
+class MetricsRegistry:
+    """지표 등록부 + 내보내기"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register(Gauge(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """내보내기 직전에 실행할 수집 함수 등록"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]) -> None:
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def collect(self) -> None:
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception:
+                pass  # 수집 실패가 지표 내보내기를 막지 않도록 함
+
+    def to_prometheus(self) -> str:
+        self.collect()
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.to_prometheus())
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> Dict:
+        self.collect()
+        return {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "metrics": {
+                name: {"type": metric.kind, "help": metric.help, "values": metric.to_json()}
+                for name, metric in self._metrics.items()
+            },
+            "derived": self._derived(),
+        }
+
+    def write_textfile(self, path: Path) -> None:
+        """Prometheus textfile 저장 (수집기가 쓰다 만 파일을 읽지 않도록 교체 방식)"""
+        _atomic_write(path, self.to_prometheus())
+
+    def write_json(self, path: Path) -> None:
+        _atomic_write(path, json.dumps(self.to_json(), ensure_ascii=False, indent=2))
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def _derived(self) -> Dict:
+        """자주 보는 비율 (검증 탈락률, 재시도율)"""
+        parsed = QA_ITEMS.value(result="parsed")
+        requests = sum(v["value"] for v in REQUESTS.to_json())
+        return {
+            "validation_drop_rate": round(QA_ITEMS.value(result="dropped_validation") / parsed, 4) if parsed else None,
+            "duplicate_drop_rate": round(QA_ITEMS.value(result="dropped_duplicate") / parsed, 4) if parsed else None,
+            "request_retry_rate": round(RETRIES.value(level="request") / requests, 4) if requests else None,
+        }
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+# --- 공용 지표 ---
+REQUEST_SECONDS = REGISTRY.histogram("ax4_request_seconds", "A.X API 요청 지연 시간 (초, 결과별)")
+FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "ax4_time_to_first_token_seconds",
+    "첫 토큰까지 시간 (초, mode=stream: 스트리밍 첫 토큰 / mode=response: 비스트리밍 요청은 전체 응답 도착 시각)"
+)
+REQUESTS = REGISTRY.counter("ax4_requests_total", "A.X API 요청 수 (결과별)")
+RETRIES = REGISTRY.counter("ax4_retries_total", "재시도 수 (request / batch / artwork)")
+TOKENS = REGISTRY.counter("ax4_tokens_total", "토큰 사용량 (prompt / completion)")
+PARSE_STAGES = REGISTRY.counter("ax4_parse_stage_total", "응답 파싱에 성공한 단계 (basic / repaired / objects / regex / failed)")
+ITEMS_PER_CALL = REGISTRY.histogram("ax4_items_per_call", "응답 하나에서 파싱된 Q&A 수", COUNT_BUCKETS)
+QA_ITEMS = REGISTRY.counter("ax4_qa_items_total", "Q&A 항목 수 (parsed / dropped_validation / dropped_duplicate / accepted / repaired / cached)")
+RULE_FAILURES = REGISTRY.counter("ax4_qa_rule_failures_total", "Q&A 규칙 위반 수 (사유별, 한 항목이 여러 사유로 집계될 수 있음)")
+CONCEPT_CHARS = REGISTRY.counter("ax4_concept_chars_total", "프롬프트 작품 개념 글자 수 (source / prompt, 작품마다 한 번)")
+ARTWORKS = REGISTRY.counter("ax4_artworks_total", "작품 처리 결과 수")
+QUEUE_DEPTH = REGISTRY.gauge("ax4_pipeline_queue_depth", "파이프라인 단계별 대기 작업 수")
+STAGE_BUSY = REGISTRY.gauge("ax4_pipeline_stage_busy", "파이프라인 단계별 작업 중인 작업자 수")
+STAGE_WORKERS = REGISTRY.gauge("ax4_pipeline_stage_workers", "파이프라인 단계별 허용 작업자 수 (동시성 조절 반영)")
+MEMORY_AVAILABLE = REGISTRY.gauge("ax4_memory_available_gb", "사용 가능 메모리 (GB)")
+CPU_PERCENT = REGISTRY.gauge("ax4_cpu_percent", "시스템 CPU 사용률 (%)")
+PROCESS_RSS = REGISTRY.gauge("ax4_process_rss_gb", "프로세스 상주 메모리 (GB)")
+
+
+def observe_parse(stats: Dict) -> None:
+    """파싱 결과 통계 기록 (parse_and_validate가 반환한 stats)"""
+    PARSE_STAGES.inc(stage=stats.get("stage", "unknown"))
+    parsed = stats.get("parsed", 0)
+    ITEMS_PER_CALL.observe(parsed)
+    QA_ITEMS.inc(parsed, result="parsed")
+    QA_ITEMS.inc(parsed - stats.get("valid", parsed), result="dropped_validation")
+    observe_rule_failures(stats.get("rule_failures", {}))
+
+
+def observe_rule_failures(reason_counts: Dict[str, int]) -> None:
+    """규칙 위반 사유별 개수 기록"""
+    for reason, count in reason_counts.items():
+        RULE_FAILURES.inc(count, reason=reason)
+
+
+class MetricsExporter:
+    """주기적으로 지표 파일 저장 (중지 시 마지막으로 한 번 더 저장)"""
+
+    def __init__(self, textfile_path: Optional[Path], json_path: Optional[Path],
+                 interval: float = 15.0, registry: MetricsRegistry = REGISTRY):
+        self.textfile_path = textfile_path
+        self.json_path = json_path
+        self.interval = interval
+        self.registry = registry
+        self.logger = setup_logger("Metrics")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.textfile_path or self.json_path)
+
+    def start(self) -> None:
+        if not self.enabled or self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.export()
+
+    def export(self) -> None:
+        try:
+            if self.textfile_path:
+                self.registry.write_textfile(self.textfile_path)
+            if self.json_path:
+                self.registry.write_json(self.json_path)
+        except OSError as e:
+            self.logger.warning(f"⚠️ 지표 파일 저장 실패: {e}")  # 처리는 계속
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.export()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+출력 매니페스트 - 입력 지문 기반 증분 재생성
+- 프롬프트에 들어가는 원본 필드로 작품별 지문(fingerprint) 계산
+- final_output 옆에 지문/상태를 기록하여 신규·변경 작품만 재생성
+- 카탈로그에서 사라진 작품의 출력은 orphaned로 표시
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.profiler import profiled
+from utils.records import ArtworkRecord
+
+
+# 프롬프트 생성에 사용되는 원본 필드 (이 필드가 바뀌면 Q&A 재생성)
+FINGERPRINT_FIELDS = (
+    "artist_name",
+    "artist_name_eng",
+    "nationality",
+    "artist_info",
+    "title",
+    "title_eng",
+    "size",
+    "weight",
+    "year",
+    "materials",
+    "artist_note",
+    "description",
+)
+
+# 작품 상태
+STATUS_COMPLETE = "complete"
+STATUS_FAILED = "failed"
+STATUS_ORPHANED = "orphaned"
+
+
+def compute_item_fingerprint(raw_item: Dict[str, Any]) -> str:
+    """원본 아이템의 프롬프트 입력 필드 지문 계산"""
+    payload = {field: raw_item.get(field) for field in FINGERPRINT_FIELDS}
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class OutputManifest:
+    """작품별 지문/출력 파일/상태를 기록하는 JSON 매니페스트"""
+
+    def __init__(self, manifest_path: Path):
+        self.path = Path(manifest_path)
+        self._lock = threading.Lock()
+        self._data = {"artworks": {}, "orphaned_outputs": []}
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    self._data["artworks"] = loaded.get("artworks", {})
+                    self._data["orphaned_outputs"] = loaded.get("orphaned_outputs", [])
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"   ⚠️ 매니페스트 로드 실패 - 새로 생성합니다 ({self.path.name}): {e}")
+
+    def get(self, artwork_key: str) -> Optional[Dict[str, Any]]:
+        """작품 기록 조회"""
+        with self._lock:
+            entry = self._data["artworks"].get(artwork_key)
+            return dict(entry) if entry else None
+
+    def classify(self, artwork_key: str, fingerprint: str) -> str:
+        """작품 변경 여부 분류: new / changed / unchanged / incomplete"""
+        entry = self.get(artwork_key)
+        if entry is None or entry.get("status") == STATUS_ORPHANED:
+            return "new"
+        if entry.get("fingerprint") != fingerprint:
+            return "changed"
+        if entry.get("status") != STATUS_COMPLETE:
+            return "incomplete"
+        return "unchanged"
+
+    def record(self, artwork_key: str, artwork: ArtworkRecord, output_file: str,
+               status: str = STATUS_COMPLETE, qa_count: Optional[int] = None,
+               usage: Optional[Dict[str, Any]] = None) -> None:
+        """작품 처리 결과 기록 (출력 파일명이 바뀌면 이전 파일을 orphaned로 표시, usage는 선택)"""
+        with self._lock:
+            previous = self._data["artworks"].get(artwork_key)
+            if previous and previous.get("output_file") not in (None, output_file):
+                self._add_orphaned_output(artwork_key, previous["output_file"], "renamed")
+
+            self._data["artworks"][artwork_key] = {
+                "artwork_id": artwork.item_id,
+                "artist": artwork.artist,
+                "title": artwork.title,
+                "fingerprint": artwork.fingerprint,
+                "source_updated_at": artwork.updated_at,
+                "output_file": output_file,
+                "status": status,
+                "qa_count": qa_count,
+                "updated_at": _now(),
+            }
+            if usage:
+                self._data["artworks"][artwork_key]["usage"] = usage
+            self._save_locked()
+
+    def mark_orphaned(self, active_keys: Iterable[str]) -> List[Dict[str, Any]]:
+        """현재 카탈로그에 없는 작품을 orphaned로 표시하고 목록 반환"""
+        active = set(active_keys)
+        orphaned = []
+        with self._lock:
+            for key, entry in self._data["artworks"].items():
+                if key in active or entry.get("status") == STATUS_ORPHANED:
+                    continue
+                entry["status"] = STATUS_ORPHANED
+                entry["updated_at"] = _now()
+                self._add_orphaned_output(key, entry.get("output_file"), "removed_from_catalog")
+                orphaned.append(dict(entry, artwork_key=key))
+            if orphaned:
+                self._save_locked()
+        return orphaned
+
+    def _add_orphaned_output(self, artwork_key: str, output_file: Optional[str], reason: str) -> None:
+        if not output_file:
+            return
+        if any(o["output_file"] == output_file for o in self._data["orphaned_outputs"]):
+            return
+        self._data["orphaned_outputs"].append({
+            "artwork_key": artwork_key,
+            "output_file": output_file,
+            "reason": reason,
+            "marked_at": _now(),
+        })
+
+    @profiled("io.manifest_save")
+    def _save_locked(self) -> None:
+        """원자적 저장 (임시 파일 → 교체)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
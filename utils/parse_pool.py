@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+파싱/검증 프로세스 풀
+- 정규식 기반 파싱(parse_model_output)과 규칙 검증(validate_qna), 중복 비교용 정규화를
+  별도 프로세스에서 실행하여 네트워크 I/O 스레드가 GIL을 기다리지 않도록 함
+- 결과는 요청 순서대로 반환
+"""
+
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.json_parser import parse_model_output
+from utils.qna_validator import validate_qna, normalize_instruction
+from utils.qna_rules import QnARules, count_reasons
+from utils.records import QARecord
+
+Rejected = List[Tuple[QARecord, List[str]]]
+ParseResult = Tuple[List[QARecord], List[str], Dict[str, Any], Rejected]
+
+
+def parse_and_validate(response: str, parser_name: str = "Unknown", verbose: bool = False,
+                       rules: Optional[QnARules] = None, perspective: Optional[str] = None) -> ParseResult:
+    """
+    응답 파싱 → 규칙 검증 → 중복 비교 키 계산 (프로세스 풀 작업 단위)
+
+    Returns:
+        (검증된 Q&A 목록, 정규화된 질문 키 목록, 파싱 통계, [(위반 항목, 사유 목록)])
+        파싱 통계: 성공한 파싱 단계(stage), 파싱된 수(parsed), 검증 통과 수(valid), 사유별 위반 수(rule_failures)
+        - 지표는 작업 프로세스가 아닌 호출한 쪽에서 기록
+    """
+    stats: Dict[str, Any] = {}
+    if not response:
+        return [], [], {"stage": "empty", "parsed": 0, "valid": 0}, []
+    parsed = parse_model_output(response, parser_name, verbose=verbose, stats=stats) or []
+    rejected: Rejected = []
+    valid_items = validate_qna(parsed, rules, perspective, rejected)
+    keys = [normalize_instruction(item.instruction) for item in valid_items]
+    stats["valid"] = len(valid_items)
+    stats["rule_failures"] = count_reasons(rejected)
+    return valid_items, keys, stats, rejected
+
+
+class ParsePool:
+    """파싱/검증 작업용 프로세스 풀 (workers=0이면 현재 프로세스에서 바로 실행)"""
+
+    def __init__(self, workers: int = 0, verbose: bool = False):
+        self.workers = workers
+        self.verbose = verbose
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        if workers > 0:
+            # 스레드가 있는 프로세스에서 fork하지 않도록 spawn 사용
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+    @property
+    def enabled(self) -> bool:
+        return self._executor is not None
+
+    def submit(self, response: str, parser_name: str = "Unknown", rules: Optional[QnARules] = None,
+               perspective: Optional[str] = None) -> Future:
+        """파싱 작업 제출 (Future 반환)"""
+        if self._executor is None:
+            future: Future = Future()
+            try:
+                future.set_result(parse_and_validate(response, parser_name, self.verbose, rules, perspective))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._executor.submit(parse_and_validate, response, parser_name, self.verbose, rules, perspective)
+
+    def process(self, response: str, parser_name: str = "Unknown", rules: Optional[QnARules] = None,
+                perspective: Optional[str] = None) -> ParseResult:
+        """파싱 작업 실행 후 결과 대기"""
+        return self.submit(response, parser_name, rules, perspective).result()
+
+    def map(self, responses: Iterable[Tuple[str, str]]) -> List[ParseResult]:
+        """여러 응답을 병렬 파싱 (입력 순서대로 결과 반환)"""
+        futures = [self.submit(response, parser_name) for response, parser_name in responses]
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+단계별 생산자/소비자 파이프라인
+- 단계마다 독립 작업자 스레드와 크기 제한 큐 (가득 차면 이전 단계가 대기 = 역압)
+- 큐 깊이/처리 수/작업 중 수로 병목 단계 확인
+- 실행 중 단계별 작업자 수/큐 크기 조절 (set_workers / set_queue_size)
+"""
+
+import collections
+import contextlib
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import setup_logger
+from utils.profiler import get_profiler, profile_section
+
+
+class Stage:
+    """파이프라인 단계 (핸들러 + 작업자 수 + 입력 큐)"""
+
+    def __init__(self, name: str, handler: Callable[[Any, Callable[[Any], None]], None],
+                 workers: int = 1, queue_size: int = 0, max_workers: int = 0):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)                     # 현재 허용 작업자 수
+        self.max_workers = max(self.workers, max_workers)  # 미리 만들어 두는 작업자 스레드 수
+        self.base_queue_size = queue_size
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self.gate = threading.Condition()   # 허용 수를 넘는 작업자가 대기
+        # 하류 단계에서 되돌려 보내는 작업 (재시도) - 순환 대기를 피하기 위해 크기 제한 없음
+        self.overflow: "collections.deque[Any]" = collections.deque()
+        self.lock = threading.Lock()   # processed / busy 갱신과 조회 (여러 작업자 스레드가 갱신)
+        self.processed = 0
+        self.busy = 0
+        self.threads: List[threading.Thread] = []
+
+    def depth(self) -> int:
+        return self.queue.qsize() + len(self.overflow)
+
+
+class StagedPipeline:
+    """크기 제한 큐로 연결된 단계별 파이프라인"""
+
+    def __init__(self, name: str = "pipeline", monitor_interval: float = 0.0):
+        self.name = name
+        self.monitor_interval = monitor_interval
+        self.logger = setup_logger(f"{name}")
+        self.stages: List[Stage] = []
+        self._stage_index: Dict[str, int] = {}
+
+        self._stop = threading.Event()
+        self._cond = threading.Condition()
+        self._outstanding = 0
+        self._started = False
+
+    def add_stage(self, name: str, handler: Callable[[Any, Callable[[Any], None]], None],
+                  workers: int = 1, queue_size: int = 0, max_workers: int = 0) -> "StagedPipeline":
+        """
+        단계 추가 (추가한 순서대로 연결)
+
+        handler(item, emit): emit(결과)을 호출하면 다음 단계 큐에 들어갑니다.
+        max_workers: set_workers로 올릴 수 있는 최대 작업자 수 (기본: workers)
+        """
+        self._stage_index[name] = len(self.stages)
+        self.stages.append(Stage(name, handler, workers, queue_size, max_workers))
+        return self
+
+    def stage(self, name: str) -> Stage:
+        return self.stages[self._stage_index[name]]
+
+    # --- 실행 중 조절 ---
+
+    def set_workers(self, name: str, workers: int) -> int:
+        """
+        단계의 허용 작업자 수 변경 (1 ~ max_workers, 적용된 값 반환)
+
+        줄이면 초과 작업자는 처리 중인 작업을 마친 뒤 대기합니다.
+        """
+        stage = self.stage(name)
+        workers = min(max(1, workers), stage.max_workers)
+        with stage.gate:
+            stage.workers = workers
+            stage.gate.notify_all()
+        return workers
+
+    def set_queue_size(self, name: str, size: int) -> int:
+        """
+        단계 입력 큐 크기 변경 (적용된 값 반환, 크기 제한이 없는 큐는 그대로)
+
+        줄여도 이미 들어간 작업은 유지되고, 큐가 새 크기 아래로 줄 때까지 이전 단계가 대기합니다.
+        """
+        stage = self.stage(name)
+        if stage.base_queue_size <= 0:
+            return 0
+        size = max(1, size)
+        with stage.queue.mutex:
+            stage.queue.maxsize = size
+            stage.queue.not_full.notify_all()
+        return size
+
+    # --- 작업 투입 ---
+
+    def submit(self, item: Any, stage: Optional[str] = None) -> None:
+        """작업 투입 (기본: 첫 단계, 큐가 가득 차면 대기)"""
+        index = 0 if stage is None else self._stage_index[stage]
+        self._put(index, item)
+
+    def requeue(self, stage: str, item: Any) -> None:
+        """하류에서 상류 단계로 작업 되돌리기 (대기 없음)"""
+        index = self._stage_index[stage]
+        with self._cond:
+            self._outstanding += 1
+        self.stages[index].overflow.append(item)
+
+    def _put(self, index: int, item: Any) -> None:
+        with self._cond:
+            self._outstanding += 1
+        self.stages[index].queue.put(item)
+
+    def _done(self) -> None:
+        with self._cond:
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._cond.notify_all()
+
+    # --- 실행 ---
+
+    def start(self) -> None:
+        """모든 단계의 작업자 시작"""
+        if self._started:
+            return
+        self._started = True
+        self._stop.clear()
+
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.max_workers):
+                thread = threading.Thread(
+                    target=self._worker, args=(index, n),
+                    name=f"{self.name}-{stage.name}-{n}", daemon=True,
+                )
+                thread.start()
+                stage.threads.append(thread)
+
+        if self.monitor_interval > 0:
+            threading.Thread(target=self._monitor, name=f"{self.name}-monitor", daemon=True).start()
+
+    def _worker(self, index: int, slot: int) -> None:
+        stage = self.stages[index]
+        if index + 1 < len(self.stages):
+            emit = lambda result: self._put(index + 1, result)
+        else:
+            emit = lambda result: None
+
+        # --profile 실행 시 작업자 스레드도 cProfile 수집, 단계 처리 시간은 구간별로 기록
+        profiler = get_profiler()
+        with profiler.thread_profile() if profiler else contextlib.nullcontext():
+            self._work_loop(stage, slot, emit)
+
+    def _work_loop(self, stage: Stage, slot: int, emit: Callable[[Any], None]) -> None:
+        section = f"stage.{stage.name}"
+        while not self._stop.is_set():
+            if slot >= stage.workers:
+                # 허용 작업자 수 밖의 작업자는 늘어날 때까지 대기
+                with stage.gate:
+                    stage.gate.wait(timeout=0.5)
+                continue
+            try:
+                item = stage.overflow.popleft()
+            except IndexError:
+                try:
+                    item = stage.queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+            with stage.lock:
+                stage.busy += 1
+            try:
+                with profile_section(section):
+                    stage.handler(item, emit)
+            except Exception as e:
+                self.logger.error(f"❌ [{stage.name}] 단계 처리 실패: {e}")
+            finally:
+                with stage.lock:
+                    stage.busy -= 1
+                    stage.processed += 1
+                self._done()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """투입된 작업이 모두 끝날 때까지 대기 (완료 시 True)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._outstanding > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(timeout=remaining if remaining is not None else 1.0)
+        return True
+
+    def stop(self) -> None:
+        """작업자 종료 (남은 작업은 버림)"""
+        self._stop.set()
+        for stage in self.stages:
+            with stage.gate:
+                stage.gate.notify_all()
+            for thread in stage.threads:
+                thread.join(timeout=5)
+            stage.threads.clear()
+        self._started = False
+
+    # --- 관측 ---
+
+    def queue_depths(self) -> Dict[str, int]:
+        """단계별 대기 작업 수"""
+        return {stage.name: stage.depth() for stage in self.stages}
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """단계별 대기/작업 중/처리 완료 수"""
+        stats = {}
+        for stage in self.stages:
+            with stage.lock:
+                busy, processed = stage.busy, stage.processed
+            stats[stage.name] = {
+                "queued": stage.depth(),
+                "busy": busy,
+                "workers": stage.workers,
+                "queue_size": stage.queue.maxsize,
+                "processed": processed,
+            }
+        return stats
+
+    def _monitor(self) -> None:
+        while not self._stop.wait(self.monitor_interval):
+            if self._outstanding == 0:
+                continue
+            summary = " | ".join(
+                f"{name} {s['queued']}q/{s['busy']}w" for name, s in self.stats().items()
+            )
+            self.logger.info(f"📈 큐 깊이: {summary}")
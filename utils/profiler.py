@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+실행 프로파일링 (--profile)
+- 구간별 wall/CPU 시간 (@profiled 데코레이터, profile_section 컨텍스트)
+- 스택 샘플링: 모든 스레드의 현재 스택을 주기적으로 수집하여 많이 머문 위치 순위
+- 선택: cProfile (메인 스레드 + 파이프라인 작업자 스레드 합산), tracemalloc 메모리 스냅샷
+- 실행 종료 시 순위 보고서(텍스트 + JSON) 저장
+
+프로파일러가 꺼져 있으면 계측 지점은 전역 변수 확인 한 번만 하고 바로 실행
+"""
+
+import collections
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+_active: Optional["RunProfiler"] = None
+
+# 작업 대기 중인 스레드 (스택 샘플 순위에서 제외)
+_IDLE_FRAMES = ("threading.py:", "queue.py:")
+
+
+class _SectionStats:
+    __slots__ = ("calls", "wall", "cpu", "max_wall")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.max_wall = 0.0
+
+
+class RunProfiler:
+    """실행 단위 프로파일러"""
+
+    def __init__(self, output_dir: Path, use_cprofile: bool = False, use_tracemalloc: bool = False,
+                 sample_interval: float = 0.05, top_n: int = 30):
+        """
+        Args:
+            output_dir: 보고서 저장 디렉토리
+            use_cprofile: cProfile 사용 (오버헤드 큼)
+            use_tracemalloc: tracemalloc 메모리 스냅샷 사용
+            sample_interval: 스택 샘플링 간격 (초, 0이면 끔)
+            top_n: 보고서 순위 항목 수
+        """
+        self.output_dir = output_dir
+        self.use_cprofile = use_cprofile
+        self.use_tracemalloc = use_tracemalloc
+        self.sample_interval = sample_interval
+        self.top_n = top_n
+
+        self._lock = threading.Lock()
+        self._sections: Dict[str, _SectionStats] = {}
+        self._samples: "collections.Counter[tuple]" = collections.Counter()
+        self._sample_count = 0
+        self._idle_samples = 0   # 큐/이벤트 대기 중인 스레드 샘플 (순위에서 제외)
+        self._profiles: List[cProfile.Profile] = []
+        self._main_profile: Optional[cProfile.Profile] = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        self._cpu_started_at = 0.0
+        self._memory_snapshots: List[tuple] = []   # (라벨, tracemalloc 스냅샷)
+        self._memory_peak: Optional[int] = None
+
+    # --- 시작 / 종료 ---
+
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+        self._cpu_started_at = time.process_time()
+        if self.use_tracemalloc:
+            tracemalloc.start(10)
+            self.snapshot_memory("시작")
+        if self.use_cprofile:
+            self._main_profile = cProfile.Profile()
+            self._profiles.append(self._main_profile)
+            self._main_profile.enable()
+        if self.sample_interval > 0:
+            self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=5)
+        if self._main_profile is not None:
+            self._main_profile.disable()
+        if self.use_tracemalloc and tracemalloc.is_tracing():
+            self.snapshot_memory("종료")
+            self._memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    # --- 계측 ---
+
+    @contextlib.contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            with self._lock:
+                stats = self._sections.get(name)
+                if stats is None:
+                    stats = self._sections[name] = _SectionStats()
+                stats.calls += 1
+                stats.wall += wall
+                stats.cpu += cpu
+                stats.max_wall = max(stats.max_wall, wall)
+
+    @contextlib.contextmanager
+    def thread_profile(self) -> Iterator[None]:
+        """현재 스레드에서 cProfile 수집 (종료 시 보고서에 합산)"""
+        if not self.use_cprofile:
+            yield
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: 메인 스레드의 프로파일러가 이미 모든 스레드를 수집 중
+            yield
+            return
+        with self._lock:
+            self._profiles.append(profile)
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def snapshot_memory(self, label: str) -> None:
+        if self.use_tracemalloc and tracemalloc.is_tracing():
+            self._memory_snapshots.append((label, tracemalloc.take_snapshot()))
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.sample_interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            frames = sys._current_frames()
+            with self._lock:
+                self._sample_count += 1
+                for ident, frame in frames.items():
+                    if ident == own:
+                        continue
+                    stack = []
+                    while frame is not None and len(stack) < 6:
+                        code = frame.f_code
+                        stack.append(f"{Path(code.co_filename).name}:{code.co_name}:{frame.f_lineno}")
+                        frame = frame.f_back
+                    if stack and stack[0].startswith(_IDLE_FRAMES):
+                        self._idle_samples += 1
+                        continue
+                    thread_group = names.get(ident, "?").rsplit("-", 1)[0]
+                    self._samples[(thread_group, tuple(stack))] += 1
+
+    # --- 보고서 ---
+
+    def report(self) -> Dict:
+        wall_total = time.perf_counter() - self._started_at
+        with self._lock:
+            sections = sorted(self._sections.items(), key=lambda kv: kv[1].wall, reverse=True)
+            samples = self._samples.most_common(self.top_n)
+            sample_count = self._sample_count
+            idle_samples = self._idle_samples
+
+        report = {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "wall_seconds": round(wall_total, 3),
+            "process_cpu_seconds": round(time.process_time() - self._cpu_started_at, 3),
+            "sections": [
+                {
+                    "name": name,
+                    "calls": s.calls,
+                    "wall_seconds": round(s.wall, 4),
+                    "cpu_seconds": round(s.cpu, 4),
+                    "cpu_ratio": round(s.cpu / s.wall, 3) if s.wall else None,
+                    "mean_wall_ms": round(s.wall / s.calls * 1000, 3) if s.calls else None,
+                    "max_wall_ms": round(s.max_wall * 1000, 3),
+                }
+                for name, s in sections
+            ],
+            "stack_samples": {
+                "interval_seconds": self.sample_interval,
+                "samples": sample_count,
+                "idle_thread_samples": idle_samples,
+                "top": [
+                    {"thread": thread, "share": round(count / sample_count, 4) if sample_count else None,
+                     "count": count, "stack": list(stack)}
+                    for (thread, stack), count in samples
+                ],
+            },
+        }
+        if self._memory_snapshots:
+            report["memory"] = self._memory_report()
+        return report
+
+    def write_report(self) -> Dict[str, Path]:
+        """보고서 저장 - 텍스트(순위) / JSON / cProfile(.pstats)"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        report = self.report()
+        paths = {
+            "json": self.output_dir / f"profile_{stamp}.json",
+            "text": self.output_dir / f"profile_{stamp}.txt",
+        }
+
+        cprofile_text = ""
+        if self._profiles:
+            import pstats  # 보고서 저장 때만 필요 (CLI 시작 시간 단축)
+            stats = pstats.Stats(self._profiles[0])
+            for profile in self._profiles[1:]:
+                stats.add(profile)
+            paths["pstats"] = self.output_dir / f"profile_{stamp}.pstats"
+            stats.dump_stats(str(paths["pstats"]))
+            buffer = io.StringIO()
+            pstats.Stats(str(paths["pstats"]), stream=buffer).sort_stats("cumulative").print_stats(self.top_n)
+            cprofile_text = buffer.getvalue()
+
+        with open(paths["json"], "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        with open(paths["text"], "w", encoding="utf-8") as f:
+            f.write(self._format_text(report, cprofile_text))
+        return paths
+
+    def _memory_report(self) -> Dict:
+        label, last = self._memory_snapshots[-1]
+        top = last.statistics("lineno")[:self.top_n]
+        result = {
+            "snapshot": label,
+            "peak_bytes": self._memory_peak,
+            "top_allocations": [
+                {"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 "size_bytes": stat.size, "count": stat.count}
+                for stat in top
+            ],
+        }
+        if len(self._memory_snapshots) > 1:
+            first_label, first = self._memory_snapshots[0]
+            result["growth_since"] = first_label
+            result["top_growth"] = [
+                {"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 "size_diff_bytes": stat.size_diff, "count_diff": stat.count_diff}
+                for stat in last.compare_to(first, "lineno")[:self.top_n]
+            ]
+        return result
+
+    def _format_text(self, report: Dict, cprofile_text: str) -> str:
+        lines = [
+            f"프로파일 보고서 ({report['generated_at']})",
+            f"실행 시간 {report['wall_seconds']}초, 프로세스 CPU {report['process_cpu_seconds']}초",
+            "",
+            "== 구간별 시간 (wall 합계 순) ==",
+            f"{'구간':<36}{'호출':>8}{'wall(s)':>12}{'cpu(s)':>12}{'cpu/wall':>10}{'평균(ms)':>12}{'최대(ms)':>12}",
+        ]
+        for s in report["sections"]:
+            lines.append(
+                f"{s['name']:<36}{s['calls']:>8}{s['wall_seconds']:>12.3f}{s['cpu_seconds']:>12.3f}"
+                f"{(s['cpu_ratio'] or 0):>10.2f}{(s['mean_wall_ms'] or 0):>12.2f}{s['max_wall_ms']:>12.2f}"
+            )
+
+        samples = report["stack_samples"]
+        lines += ["", f"== 스택 샘플 상위 ({samples['samples']}회 샘플, {samples['interval_seconds']}초 간격) =="]
+        for entry in samples["top"]:
+            lines.append(f"{(entry['share'] or 0) * 100:6.1f}%  [{entry['thread']}]  " + " <- ".join(entry["stack"]))
+
+        memory = report.get("memory")
+        if memory:
+            lines += ["", f"== 메모리 할당 상위 ({memory['snapshot']}, 최대 {memory['peak_bytes']} bytes) =="]
+            for entry in memory["top_allocations"]:
+                lines.append(f"{entry['size_bytes']:>14,} B  {entry['count']:>8}개  {entry['location']}")
+            for entry in memory.get("top_growth", []):
+                lines.append(f"  증가 {entry['size_diff_bytes']:>+14,} B  {entry['location']}")
+
+        if cprofile_text:
+            lines += ["", "== cProfile (누적 시간 순) ==", cprofile_text]
+        return "\n".join(lines) + "\n"
+
+
+# --- 전역 프로파일러 ---
+
+def start_profiler(profiler: RunProfiler) -> RunProfiler:
+    """프로파일러 시작 및 전역 등록 (계측 지점이 이 프로파일러에 기록)"""
+    global _active
+    _active = profiler
+    profiler.start()
+    return profiler
+
+
+def stop_profiler() -> Optional[Dict[str, Path]]:
+    """프로파일러 종료 후 보고서 저장 (실행 중이 아니면 None)"""
+    global _active
+    profiler, _active = _active, None
+    if profiler is None:
+        return None
+    profiler.stop()
+    return profiler.write_report()
+
+
+def get_profiler() -> Optional[RunProfiler]:
+    return _active
+
+
+def profile_section(name: str):
+    """구간 계측 컨텍스트 (프로파일러가 꺼져 있으면 아무것도 하지 않음)"""
+    profiler = _active
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.section(name)
+
+
+def profiled(name: str) -> Callable:
+    """함수 구간 계측 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
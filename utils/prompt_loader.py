@@ -2,19 +2,45 @@
 """
 프롬프트 로더 유틸리티
 - 외부 프롬프트 파일을 읽어서 템플릿 변수를 치환
+- 긴 작품 설명/작가노트는 작품마다 한 번 요약하여 모든 배치 프롬프트에서 재사용
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any
+from typing import List, Optional, Tuple
+
+from utils.profiler import profiled
+from utils.qna_rules import REASON_HINTS, title_required
+from utils.records import ArtworkRecord, QARecord
+from utils.text_condenser import condense_text
+from utils.metrics import CONCEPT_CHARS
+from config import CONCEPT_CONDENSE_ENABLED, CONCEPT_MAX_CHARS, CONCEPT_CACHE_SIZE
 
 
 class PromptLoader:
     """프롬프트 템플릿 로더"""
     
-    def __init__(self, prompts_dir: str = "prompts"):
+    def __init__(self, prompts_dir: str = "prompts", concept_max_chars: Optional[int] = None,
+                 concept_cache_size: int = CONCEPT_CACHE_SIZE):
+        """
+        Args:
+            prompts_dir: 프롬프트 파일 디렉토리
+            concept_max_chars: 작품 개념 최대 글자 수 (0이면 요약하지 않음, None이면 config 값)
+            concept_cache_size: 원문 해시별 작품 개념 캐시 크기
+        """
         self.prompts_dir = Path(prompts_dir)
         self._cache = {}  # 프롬프트 캐싱
         
+        # 작품 개념 (원문 해시 → 요약/수치 필터링 결과, 같은 작품의 배치/재시도에서 재사용)
+        if concept_max_chars is None:
+            concept_max_chars = CONCEPT_MAX_CHARS if CONCEPT_CONDENSE_ENABLED else 0
+        self.concept_max_chars = concept_max_chars
+        self._concept_cache_size = concept_cache_size
+        self._concepts: "OrderedDict[str, str]" = OrderedDict()
+        self._concept_lock = threading.Lock()
+        
         # 공통 템플릿 정의 (수치 정보 추상화)
         self.artwork_info_template = """**작품 기본 정보:**
 - 작품명: {artwork_title}
@@ -80,6 +106,7 @@ class PromptLoader:
         self._cache[prompt_name] = content
         return content
     
+    @profiled("prompt.filter_numerical_content")
     def _filter_numerical_content(self, text: str) -> str:
         """텍스트에서 구체적인 수치 정보 제거"""
         if not text:
@@ -130,34 +157,48 @@ class PromptLoader:
             content_str = content_str[:200] + "..."
         return content_str
 
-    def _format_artwork_info(self, artwork: Dict[str, Any]) -> str:
+    def _format_artwork_info(self, artwork: ArtworkRecord) -> str:
         """작품 정보 포맷팅 (수치 추상화)"""
-        # 크기 정보를 추상화된 표현으로 변환 (여러 키 확인)
-        size_raw = artwork.get("크기") or artwork.get("사이즈") or artwork.get("size", "")
-        size_description = self._abstract_size_info(size_raw)
-        
-        # 재료 정보 (여러 키 확인)
-        materials = artwork.get("재료") or artwork.get("소재") or artwork.get("소재 번역") or artwork.get("materials", "N/A")
+        # 크기 정보를 추상화된 표현으로 변환
+        size_description = self._abstract_size_info(artwork.size)
         
-        # 작품 개념 필터링 (작가 노트나 설명에서 수치 제거)
-        artist_note = artwork.get("작가노트", "")
-        description = artwork.get("작품설명", "")
+        # 재료 정보
+        materials = artwork.materials or "N/A"
         
-        # 작가 노트와 설명 합치고 수치 필터링
-        concept_text = f"{description}\n\n{artist_note}".strip()
-        filtered_concept = self._filter_numerical_content(concept_text)
+        # 작가 노트와 설명 합치고 요약/수치 필터링 (작품마다 한 번)
+        concept_text = f"{artwork.description}\n\n{artwork.artist_note}".strip()
+        filtered_concept = self._concept(concept_text, (artwork.title, artwork.materials))
         
         return self.artwork_info_template.format(
-            artwork_title=artwork.get("제목", artwork.get("작품명", "N/A")),
-            artist_name=artwork.get("작가", artwork.get("성명", "N/A")),
-            nationality=artwork.get("국적", "N/A"),
-            creation_year=artwork.get("제작년도", artwork.get("제작연도", "N/A")),
+            artwork_title=artwork.title,
+            artist_name=artwork.artist,
+            nationality=artwork.nationality,
+            creation_year=artwork.year,
             size_description=size_description,
             materials=materials,
-            technique=artwork.get("기법", "현대공예"),
+            technique="현대공예",
             filtered_concept=filtered_concept
         )
     
+    def _concept(self, concept_text: str, keywords: Tuple) -> str:
+        """작품 개념 (긴 원문은 핵심 문장만 추출 후 수치 필터링) - 원문 해시로 캐시"""
+        key = hashlib.sha256(f"{self.concept_max_chars}\0{concept_text}".encode("utf-8")).hexdigest()
+        with self._concept_lock:
+            concept = self._concepts.get(key)
+            if concept is not None:
+                self._concepts.move_to_end(key)
+                return concept
+        
+        condensed = condense_text(concept_text, self.concept_max_chars, keywords)
+        concept = self._filter_numerical_content(condensed)
+        CONCEPT_CHARS.inc(len(concept_text), kind="source")
+        CONCEPT_CHARS.inc(len(concept), kind="prompt")
+        with self._concept_lock:
+            self._concepts[key] = concept
+            while len(self._concepts) > self._concept_cache_size:
+                self._concepts.popitem(last=False)
+        return concept
+    
     def _abstract_size_info(self, size_str: str) -> str:
         """크기 정보를 추상적 표현으로 변환 (수치 완전 제거)"""
         if not size_str or size_str in ["", "N/A"]:
@@ -191,14 +232,14 @@ class PromptLoader:
             else:
                 return "적절한 규모"
     
-    def format_visitor_prompt(self, artwork: Dict[str, Any], exclude_instructions: set = None) -> str:
+    def format_visitor_prompt(self, artwork: ArtworkRecord, exclude_instructions: set = None) -> str:
         """일반 관람객 관점 프롬프트 생성 (기존 질문 제외)"""
         template = self.load_prompt("visitor_questions")
         artwork_info = self._format_artwork_info(artwork)
         
         # 작가명과 작품명 정보 추출
-        artist_name = artwork.get("작가", artwork.get("성명", "N/A"))
-        artwork_title = artwork.get("제목", artwork.get("작품명", "N/A"))
+        artist_name = artwork.artist
+        artwork_title = artwork.title
         
         # 동적 예시 생성
         customized_format = self.json_output_format.format(
@@ -226,14 +267,14 @@ class PromptLoader:
         
         return base_prompt
     
-    def format_curator_artwork_prompt(self, artwork: Dict[str, Any], exclude_instructions: set = None) -> str:
+    def format_curator_artwork_prompt(self, artwork: ArtworkRecord, exclude_instructions: set = None) -> str:
         """큐레이터 관점 작품 프롬프트 생성"""
         template = self.load_prompt("curator_artwork_questions")
         artwork_info = self._format_artwork_info(artwork)
         
         # 작가명과 작품명 정보 추출
-        artist_name = artwork.get("작가", artwork.get("성명", "N/A"))
-        artwork_title = artwork.get("제목", artwork.get("작품명", "N/A"))
+        artist_name = artwork.artist
+        artwork_title = artwork.title
         
         # 동적 예시 생성
         customized_format = self.json_output_format.format(
@@ -261,32 +302,32 @@ class PromptLoader:
         
         return base_prompt
     
-    def format_curator_artist_prompt(self, artwork: Dict[str, Any], exclude_instructions: set = None) -> str:
+    def format_curator_artist_prompt(self, artwork: ArtworkRecord, exclude_instructions: set = None) -> str:
         """큐레이터 관점 작가 프롬프트 생성"""
         template = self.load_prompt("curator_artist_questions")
         
         # 작가명 추출
-        artist_name = artwork.get("작가", artwork.get("성명", "N/A"))
+        artist_name = artwork.artist
         
-        # 작가 정보 필드 가져오기 (전시/수상 이력에서 수치 제거)
-        education = artwork.get("학력", "N/A")
-        exhibitions_raw = artwork.get("전시이력", []) or artwork.get("주요전시경력", "N/A")
-        awards_raw = artwork.get("수상이력", []) or artwork.get("수상경력", "N/A")
+        # 작가 정보 필드 가져오기 (전시/수상 이력에서 수치 제거, 학력은 원본 데이터에 없음)
+        education = "N/A"
+        exhibitions_raw = artwork.exhibitions or "N/A"
+        awards_raw = artwork.awards or "N/A"
         
         # 전시/수상 이력 필터링 (연도는 보존, 구체적 수치만 제거)
         exhibitions = self._filter_exhibition_awards_content(exhibitions_raw)
         awards = self._filter_exhibition_awards_content(awards_raw)
         
         # 작가 활동 정보 구성
-        activities = f"주요 작업 분야: {artwork.get('기법', 'N/A')}\n"
-        materials = artwork.get('재료') or artwork.get('소재') or artwork.get('소재 번역', 'N/A')
+        activities = "주요 작업 분야: N/A\n"
+        materials = artwork.materials or "N/A"
         activities += f"대표 소재: {materials}"
         
         # 작가 정보 포맷
         artist_info = self.artist_info_template.format(
             artist_name=artist_name,
-            nationality=artwork.get("국적", "N/A"),
-            birth_year=artwork.get("출생년도", "N/A"),
+            nationality=artwork.nationality,
+            birth_year=artwork.birth_year,
             education=education,
             major_exhibitions=exhibitions,
             awards=awards,
@@ -317,10 +358,31 @@ class PromptLoader:
             return base_prompt + exclusion_note
         
         return base_prompt
-    
+
+    def format_repair_prompt(self, artwork: ArtworkRecord, items: List[Tuple[QARecord, List[str]]]) -> str:
+        """규칙 위반 항목 수정 프롬프트 생성 (작가명/작품명과 고칠 항목만 포함)"""
+        template = self.load_prompt("repair_items")
+
+        lines = []
+        for number, (item, reasons) in enumerate(items, 1):
+            problems = ", ".join(REASON_HINTS.get(reason, reason) for reason in reasons)
+            title_note = " (작품명 필요)" if title_required(item.perspective) else ""
+            lines.append(f"{number}. 문제: {problems}{title_note}")
+            lines.append(f"   질문: {item.instruction}")
+            lines.append(f"   답변: {item.output}")
+
+        return template.format(
+            count=len(items),
+            artist_name=artwork.artist,
+            artwork_title=artwork.title,
+            items="\n".join(lines)
+        )
+
     def clear_cache(self):
-        """프롬프트 캐시 초기화"""
+        """프롬프트/작품 개념 캐시 초기화"""
         self._cache.clear()
+        with self._concept_lock:
+            self._concepts.clear()
     
     def reload_prompt(self, prompt_name: str):
         """특정 프롬프트 다시 로드"""
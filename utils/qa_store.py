@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Q&A 저장소 (SQLite)
+- 검증된 Q&A를 작품 ID, 작가, 제목, 관점, 배치, 프롬프트 해시와 함께 기록
+- 상태 조회/이어서 생성/내보내기를 디렉토리 스캔 대신 인덱스 쿼리로 처리
+- 저장소 도입 이전 출력 파일에서 가져온 Q&A는 관점을 알 수 없어 legacy 관점으로 기록하고,
+  목표 달성 판단에서는 관점별 부족분 합계를 legacy 개수로 채울 수 있는 것으로 봄
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.records import ArtworkRecord, QARecord
+
+LEGACY_PERSPECTIVE = "legacy"   # 관점 정보 없이 가져온 기존 출력 파일의 Q&A
+
+
+def quota_deficits(counts: Dict[str, int], quotas: Dict[str, int]) -> Dict[str, int]:
+    """관점별 부족분 (legacy Q&A 개수가 부족분 합계 이상이면 목표 달성으로 보고 빈 dict)"""
+    deficits = {p: q - counts.get(p, 0) for p, q in quotas.items() if counts.get(p, 0) < q}
+    if sum(deficits.values()) <= counts.get(LEGACY_PERSPECTIVE, 0):
+        return {}
+    return deficits
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artworks (
+    artwork_key TEXT PRIMARY KEY,
+    artwork_id TEXT,
+    artwork_no TEXT,
+    artist TEXT NOT NULL,
+    title TEXT NOT NULL,
+    output_file TEXT,
+    source_updated_at TEXT,
+    fingerprint TEXT,
+    status TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS qa_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    artwork_key TEXT NOT NULL REFERENCES artworks(artwork_key),
+    artwork_id TEXT,
+    artist TEXT NOT NULL,
+    title TEXT NOT NULL,
+    perspective TEXT NOT NULL,
+    batch TEXT,
+    prompt_hash TEXT,
+    instruction TEXT NOT NULL,
+    input TEXT NOT NULL DEFAULT '',
+    output TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_artworks_artwork_id ON artworks(artwork_id);
+CREATE INDEX IF NOT EXISTS idx_artworks_artist ON artworks(artist);
+CREATE INDEX IF NOT EXISTS idx_artworks_title ON artworks(title);
+CREATE INDEX IF NOT EXISTS idx_artworks_fingerprint ON artworks(fingerprint);
+CREATE INDEX IF NOT EXISTS idx_artworks_status ON artworks(status);
+
+CREATE INDEX IF NOT EXISTS idx_qa_artwork_perspective ON qa_items(artwork_key, perspective);
+CREATE INDEX IF NOT EXISTS idx_qa_artwork_id ON qa_items(artwork_id);
+CREATE INDEX IF NOT EXISTS idx_qa_artist_perspective ON qa_items(artist, perspective);
+CREATE INDEX IF NOT EXISTS idx_qa_title ON qa_items(title);
+CREATE INDEX IF NOT EXISTS idx_qa_batch ON qa_items(batch);
+CREATE INDEX IF NOT EXISTS idx_qa_prompt_hash ON qa_items(prompt_hash);
+CREATE INDEX IF NOT EXISTS idx_qa_created_at ON qa_items(created_at);
+"""
+
+# 이전 버전 DB에 추가해야 하는 컬럼 (테이블, 컬럼, 타입)
+_MIGRATIONS = (
+    ("artworks", "fingerprint", "TEXT"),
+    ("artworks", "status", "TEXT"),
+)
+
+
+def _now() -> str:
+    """UTC 타임스탬프 (ISO 8601)"""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def make_artwork_key(artwork: ArtworkRecord, output_filename: str) -> str:
+    """작품 식별 키 생성 (원본 id 우선, 없으면 출력 파일명)"""
+    item_id = artwork.item_id
+    if item_id is not None and str(item_id).strip():
+        return f"id:{item_id}"
+    return f"file:{output_filename}"
+
+
+class QAStore:
+    """인덱스된 SQLite Q&A 저장소"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 여러 스레드에서 공유하므로 단일 연결 + 락으로 직렬화
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _migrate(self) -> None:
+        """기존 DB에 누락된 컬럼 추가"""
+        for table, column, col_type in _MIGRATIONS:
+            columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if columns and column not in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+
+    def close(self) -> None:
+        """연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+    # --- 쓰기 ---
+
+    def upsert_artwork(self, artwork_key: str, artwork: ArtworkRecord,
+                       output_file: Optional[str] = None, status: Optional[str] = None) -> None:
+        """작품 메타데이터 등록/갱신 (지문/상태 포함)"""
+        now = _now()
+        item_id = artwork.item_id
+        item_no = artwork.item_no
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO artworks (artwork_key, artwork_id, artwork_no, artist, title,
+                                      output_file, source_updated_at, fingerprint, status,
+                                      created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(artwork_key) DO UPDATE SET
+                    artwork_id = excluded.artwork_id,
+                    artwork_no = excluded.artwork_no,
+                    artist = excluded.artist,
+                    title = excluded.title,
+                    output_file = COALESCE(excluded.output_file, artworks.output_file),
+                    source_updated_at = excluded.source_updated_at,
+                    fingerprint = COALESCE(excluded.fingerprint, artworks.fingerprint),
+                    status = COALESCE(excluded.status, artworks.status),
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    artwork_key,
+                    None if item_id is None else str(item_id),
+                    None if item_no is None else str(item_no),
+                    artwork.artist,
+                    artwork.title,
+                    output_file,
+                    artwork.updated_at,
+                    artwork.fingerprint,
+                    status,
+                    now,
+                    now,
+                ),
+            )
+
+    def delete_qa_items(self, artwork_key: str) -> int:
+        """작품의 Q&A 삭제 (입력 변경으로 재생성할 때)"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM qa_items WHERE artwork_key = ?", (artwork_key,)
+            )
+        return cursor.rowcount
+
+    def mark_orphaned(self, active_keys: List[str]) -> int:
+        """현재 카탈로그에 없는 작품을 orphaned로 표시"""
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS _active_keys (k TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM _active_keys")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO _active_keys (k) VALUES (?)", [(k,) for k in active_keys]
+            )
+            cursor = self._conn.execute(
+                "UPDATE artworks SET status = 'orphaned', updated_at = ? "
+                "WHERE artwork_key NOT IN (SELECT k FROM _active_keys) "
+                "AND COALESCE(status, '') != 'orphaned'",
+                (now,),
+            )
+        return cursor.rowcount
+
+    def add_qa_items(self, artwork_key: str, artwork: ArtworkRecord,
+                     records: List[QARecord]) -> int:
+        """검증된 Q&A 기록 추가 (perspective/batch/prompt_hash 메타 포함)"""
+        if not records:
+            return 0
+
+        now = _now()
+        item_id = artwork.item_id
+        artist = artwork.artist
+        title = artwork.title
+        rows = [
+            (
+                artwork_key,
+                None if item_id is None else str(item_id),
+                artist,
+                title,
+                record.perspective or "unknown",
+                record.batch,
+                record.prompt_hash,
+                record.instruction,
+                record.input,
+                record.output,
+                now,
+                now,
+            )
+            for record in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO qa_items (artwork_key, artwork_id, artist, title, perspective,
+                                      batch, prompt_hash, instruction, input, output,
+                                      created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        return len(rows)
+
+    # --- 조회 ---
+
+    def get_qa_items(self, artwork_key: str) -> List[QARecord]:
+        """작품의 Q&A 레코드 목록 (출력 파일과 같은 순서)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT instruction, input, output FROM qa_items "
+                "WHERE artwork_key = ? ORDER BY id",
+                (artwork_key,),
+            ).fetchall()
+        return [QARecord(row["instruction"], row["input"], row["output"]) for row in rows]
+
+    def count_by_perspective(self, artwork_key: str) -> Dict[str, int]:
+        """작품의 관점별 Q&A 개수"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT perspective, COUNT(*) AS n FROM qa_items "
+                "WHERE artwork_key = ? GROUP BY perspective",
+                (artwork_key,),
+            ).fetchall()
+        return {row["perspective"]: row["n"] for row in rows}
+
+    def is_complete(self, artwork_key: str, quotas: Dict[str, int]) -> bool:
+        """관점별 목표 개수를 모두 채웠는지 확인 (legacy Q&A는 부족분 합계를 채우는 데 사용)"""
+        return not quota_deficits(self.count_by_perspective(artwork_key), quotas)
+
+    def count_items(self, artist: Optional[str] = None,
+                    perspective: Optional[str] = None) -> int:
+        """조건별 Q&A 개수 (예: 작가 X의 큐레이터 작가 관점 개수)"""
+        query = "SELECT COUNT(*) FROM qa_items WHERE 1=1"
+        params: List[Any] = []
+        if artist is not None:
+            query += " AND artist = ?"
+            params.append(artist)
+        if perspective is not None:
+            query += " AND perspective = ?"
+            params.append(perspective)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def perspective_counts(self) -> Dict[str, Dict[str, int]]:
+        """전체 작품의 관점별 개수 {artwork_key: {perspective: n}} (단일 쿼리)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT artwork_key, perspective, COUNT(*) AS n FROM qa_items "
+                "GROUP BY artwork_key, perspective"
+            ).fetchall()
+        counts: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            counts.setdefault(row["artwork_key"], {})[row["perspective"]] = row["n"]
+        return counts
+
+    def artworks_below_quota(self, quotas: Dict[str, int]) -> List[Dict[str, Any]]:
+        """목표 개수에 미달한 작품 목록 (관점별 부족분 포함)"""
+        sums = ", ".join(
+            f"SUM(CASE WHEN q.perspective = '{p}' THEN 1 ELSE 0 END) AS \"{p}\""
+            for p in list(quotas) + [LEGACY_PERSPECTIVE]
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT a.artwork_key, a.artwork_id, a.artist, a.title, a.output_file, {sums}
+                FROM artworks a LEFT JOIN qa_items q ON q.artwork_key = a.artwork_key
+                WHERE COALESCE(a.status, '') != 'orphaned'
+                GROUP BY a.artwork_key
+                """
+            ).fetchall()
+
+        below = []
+        for row in rows:
+            counts = {p: row[p] or 0 for p in quotas}
+            legacy = row[LEGACY_PERSPECTIVE] or 0
+            if legacy:
+                counts[LEGACY_PERSPECTIVE] = legacy
+            deficits = quota_deficits(counts, quotas)
+            if deficits:
+                below.append({
+                    "artwork_key": row["artwork_key"],
+                    "artwork_id": row["artwork_id"],
+                    "artist": row["artist"],
+                    "title": row["title"],
+                    "output_file": row["output_file"],
+                    "counts": counts,
+                    "deficits": deficits,
+                })
+        return below
+
+    def status_summary(self) -> Dict[str, Any]:
+        """저장소 전체 요약 (작품 수, 관점별 Q&A 수)"""
+        with self._lock:
+            artwork_count = self._conn.execute("SELECT COUNT(*) FROM artworks").fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT perspective, COUNT(*) AS n FROM qa_items GROUP BY perspective"
+            ).fetchall()
+        by_perspective = {row["perspective"]: row["n"] for row in rows}
+        return {
+            "artworks": artwork_count,
+            "qa_items": sum(by_perspective.values()),
+            "by_perspective": by_perspective,
+        }
+
+    # --- 내보내기 ---
+
+    def iter_export(self, include_meta: bool = False) -> Iterator[Dict[str, Any]]:
+        """내보내기용 Q&A 순회 (작품 → 입력 순서)"""
+        columns = "instruction, input, output"
+        if include_meta:
+            columns += ", artwork_key, artwork_id, artist, title, perspective, batch, prompt_hash, created_at"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM qa_items ORDER BY artwork_key, id"
+            ).fetchall()
+        for row in rows:
+            yield dict(row)
+
+    def export_json_files(self, output_dir: Path) -> int:
+        """작품별 JSON 파일로 내보내기 (final_output과 동일한 형식)"""
+        from utils.common import save_json_safe
+
+        with self._lock:
+            artworks = self._conn.execute(
+                "SELECT artwork_key, output_file FROM artworks WHERE output_file IS NOT NULL"
+            ).fetchall()
+
+        written = 0
+        for row in artworks:
+            items = self.get_qa_items(row["artwork_key"])
+            if items and save_json_safe(items, Path(output_dir) / row["output_file"]):
+                written += 1
+        return written
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Q&A 규칙 검증
+- 프롬프트의 필수 규칙을 배치 단위로 한 번에 확인하고 항목별 위반 사유를 반환
+  - 필드 형식 / 질문·답변 길이 범위
+  - 작가명(+ 영문명), 작품명(+ 영문 제목, 괄호 제외 제목) 포함 여부
+  - 구체적인 치수·무게 등 수치 노출 (연도는 허용)
+- 작품별 규칙은 정규식을 한 번만 컴파일하여 캐시 (같은 작품의 배치/재시도에서 재사용)
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.records import ArtworkRecord, QARecord
+from config import (
+    QNA_MIN_INSTRUCTION_CHARS, QNA_MAX_INSTRUCTION_CHARS,
+    QNA_MIN_OUTPUT_CHARS, QNA_MAX_OUTPUT_CHARS, QNA_TITLE_REQUIRED_PERSPECTIVES
+)
+
+# 위반 사유
+REASON_FIELDS = "invalid_fields"
+REASON_INSTRUCTION_SHORT = "instruction_too_short"
+REASON_INSTRUCTION_LONG = "instruction_too_long"
+REASON_OUTPUT_SHORT = "output_too_short"
+REASON_OUTPUT_LONG = "output_too_long"
+REASON_MISSING_ARTIST = "missing_artist"
+REASON_MISSING_TITLE = "missing_title"
+REASON_NUMERIC_LEAK = "numeric_leak"
+
+# 수정 요청 프롬프트에 쓰는 사유 설명
+REASON_HINTS = {
+    REASON_FIELDS: "형식 오류",
+    REASON_INSTRUCTION_SHORT: "질문이 너무 짧음",
+    REASON_INSTRUCTION_LONG: "질문이 너무 김",
+    REASON_OUTPUT_SHORT: "답변이 너무 짧음",
+    REASON_OUTPUT_LONG: "답변이 너무 김",
+    REASON_MISSING_ARTIST: "작가명 누락",
+    REASON_MISSING_TITLE: "작품명 누락",
+    REASON_NUMERIC_LEAK: "구체적인 수치(치수/무게) 포함",
+}
+
+# 치수/무게 노출 패턴 (연도·회차 같은 단순 숫자는 통과)
+_NUMERIC_LEAK = re.compile(
+    r"\d+(?:[.,]\d+)?\s*(?:mm|cm|m|km|kg|g|MM|CM|KG|㎜|㎝|㎏|inch(?:es)?)(?![A-Za-z])"
+    r"|\d+(?:[.,]\d+)?\s*(?:밀리미터|밀리|센티미터|센티|미터|킬로그램|킬로|그램|톤|인치)"
+    r"|\d+(?:\.\d+)?\s*[x×X*]\s*\d+"
+    r"|(?:가로|세로|높이|너비|폭|지름|직경|두께|무게|중량)\s*(?:[:：]|[은는이가]\s)?\s*(?:약\s*)?\d"
+)
+
+_PLACEHOLDER_NAMES = {"", "unknown", "n/a"}
+_BRACKETED = re.compile(r"\s*[(\[（【][^)\]）】]*[)\]）】]")
+_NAME_SEPARATOR = re.compile(r"[\s_]+")
+
+
+def _alias_pattern(aliases: Iterable[str]) -> Optional["re.Pattern"]:
+    """별칭 목록 → 하나의 정규식 (공백/밑줄/문장부호 차이 허용, 대소문자 무시)"""
+    parts = []
+    for alias in aliases:
+        tokens = [re.escape(token) for token in _NAME_SEPARATOR.split(alias.strip()) if token]
+        if tokens:
+            parts.append(r"[\W_]*".join(tokens))
+    if not parts:
+        return None
+    # 긴 별칭부터 시도
+    parts.sort(key=len, reverse=True)
+    return re.compile("|".join(parts), re.IGNORECASE)
+
+
+def _usable_names(*names) -> List[str]:
+    """자리표시 값(Unknown/N/A/빈 값)을 뺀 이름 목록 (괄호 부분을 뺀 형태도 포함)"""
+    usable = []
+    for name in names:
+        if not isinstance(name, str) or name.strip().lower() in _PLACEHOLDER_NAMES:
+            continue
+        usable.append(name)
+        short = _BRACKETED.sub("", name).strip()
+        if short and short != name and short.lower() not in _PLACEHOLDER_NAMES:
+            usable.append(short)
+    return usable
+
+
+class QnARules:
+    """작품별 Q&A 규칙 (컴파일된 정규식 보관)"""
+
+    __slots__ = ("artist_pattern", "title_pattern", "names_have_digits")
+
+    def __init__(self, artist_names: List[str], title_names: List[str]):
+        self.artist_pattern = _alias_pattern(artist_names)
+        self.title_pattern = _alias_pattern(title_names)
+        # 이름에 숫자가 있으면 수치 검사 전에 이름을 지움 (예: "Inner No.2")
+        self.names_have_digits = any(ch.isdigit() for name in artist_names + title_names for ch in name)
+
+    def check(self, item: QARecord, require_title: bool = True) -> List[str]:
+        """단일 항목 검사 → 위반 사유 목록 (빈 목록이면 통과, 통과 시 필드 공백 정리)"""
+        if not isinstance(item, QARecord) or not all(
+            isinstance(v, str) for v in (item.instruction, item.input, item.output)
+        ):
+            return [REASON_FIELDS]
+
+        instruction = item.instruction.strip()
+        output = item.output.strip()
+        reasons = []
+
+        if len(instruction) < QNA_MIN_INSTRUCTION_CHARS:
+            reasons.append(REASON_INSTRUCTION_SHORT)
+        elif len(instruction) > QNA_MAX_INSTRUCTION_CHARS:
+            reasons.append(REASON_INSTRUCTION_LONG)
+        if len(output) < QNA_MIN_OUTPUT_CHARS:
+            reasons.append(REASON_OUTPUT_SHORT)
+        elif len(output) > QNA_MAX_OUTPUT_CHARS:
+            reasons.append(REASON_OUTPUT_LONG)
+
+        text = f"{instruction}\n{output}"
+        if self.artist_pattern is not None and not self.artist_pattern.search(text):
+            reasons.append(REASON_MISSING_ARTIST)
+        if require_title and self.title_pattern is not None and not self.title_pattern.search(text):
+            reasons.append(REASON_MISSING_TITLE)
+
+        if self.names_have_digits:
+            for pattern in (self.artist_pattern, self.title_pattern):
+                if pattern is not None:
+                    text = pattern.sub(" ", text)
+        if _NUMERIC_LEAK.search(text):
+            reasons.append(REASON_NUMERIC_LEAK)
+
+        if not reasons:
+            item.instruction = instruction
+            item.output = output
+            item.input = item.input.strip()
+        return reasons
+
+    def check_batch(self, items: List[QARecord], perspective: Optional[str] = None
+                    ) -> Tuple[List[QARecord], List[Tuple[QARecord, List[str]]]]:
+        """
+        배치 검사 (한 번 순회)
+
+        Returns:
+            (통과한 항목, [(위반 항목, 사유 목록)])
+        """
+        require_title = title_required(perspective)
+        passed = []
+        rejected = []
+        for item in items:
+            reasons = self.check(item, require_title)
+            if reasons:
+                rejected.append((item, reasons))
+            else:
+                passed.append(item)
+        return passed, rejected
+
+
+def title_required(perspective: Optional[str]) -> bool:
+    """관점별 작품명 포함 필요 여부 (관점을 모르면 필요한 것으로 봄)"""
+    return perspective is None or perspective in QNA_TITLE_REQUIRED_PERSPECTIVES
+
+
+# 작품 정보 없이 쓰는 기본 규칙 (필드 형식 / 길이만 확인)
+BASE_RULES = QnARules([], [])
+
+
+@lru_cache(maxsize=256)
+def _compile_rules(artist: str, artist_en: str, title: str, title_en: str) -> QnARules:
+    return QnARules(_usable_names(artist, artist_en), _usable_names(title, title_en))
+
+
+def rules_for_artwork(artwork: ArtworkRecord) -> QnARules:
+    """작품 → 규칙 (같은 이름 조합이면 캐시된 규칙 재사용)"""
+    return _compile_rules(artwork.artist, artwork.artist_en, artwork.title, artwork.title_en)
+
+
+def count_reasons(rejected: List[Tuple[QARecord, List[str]]]) -> Dict[str, int]:
+    """위반 사유별 개수"""
+    return dict(Counter(reason for _, reasons in rejected for reason in reasons))
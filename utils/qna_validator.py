@@ -1,58 +1,61 @@
 #!/usr/bin/env python3
 """
 Q&A 데이터 검증 유틸리티
+- QARecord를 제자리에서 정리 (항목마다 새 dict를 만들지 않음)
+- 규칙 검사는 utils/qna_rules.py (작품 규칙이 없으면 필드 형식/길이만 확인)
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Optional, Set, Tuple
 
-def validate_qna(qna_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Q&A 데이터 검증 및 정리"""
+from utils.profiler import profiled
+from utils.qna_rules import BASE_RULES, QnARules
+from utils.records import QARecord
+
+
+@profiled("validate.validate_qna")
+def validate_qna(qna_list: List[QARecord], rules: Optional[QnARules] = None,
+                 perspective: Optional[str] = None,
+                 rejected: Optional[List[Tuple[QARecord, List[str]]]] = None) -> List[QARecord]:
+    """
+    Q&A 데이터 검증 및 정리 (통과한 레코드는 앞뒤 공백을 제거한 채 그대로 반환)
+
+    rules: 작품 규칙 (rules_for_artwork), 없으면 기본 규칙
+    perspective: 관점 (작품명 포함 필요 여부 판단)
+    rejected 목록을 주면 (위반 항목, 사유 목록)을 추가합니다.
+    """
     if not qna_list:
         return []
     
-    valid_items = []
-    
-    for item in qna_list:
-        # 기본 유형 및 필드 검증
-        if (not isinstance(item, dict) or 
-            not item.get('instruction', '').strip() or 
-            not item.get('output', '').strip()):
-            continue
-        
-        instruction = item.get('instruction', '').strip()
-        output = item.get('output', '').strip()
-        
-        # 최소 길이 검증
-        if len(instruction) < 5 or len(output) < 10:
-            continue
-        
-        # 유효한 항목 추가
-        valid_items.append({
-            'instruction': instruction,
-            'input': item.get('input', '').strip(),
-            'output': output
-        })
-    
+    valid_items, failed = (rules or BASE_RULES).check_batch(qna_list, perspective)
+    if rejected is not None:
+        rejected.extend(failed)
     return valid_items
 
-def validate_single_qna(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """단일 Q&A 항목 검증"""
-    # 기본 유형 및 필드 검증
-    if (not isinstance(item, dict) or 
-        not item.get('instruction', '').strip() or 
-        not item.get('output', '').strip()):
-        return None
+def normalize_instruction(instruction: str) -> str:
+    """중복 비교용 질문 정규화 (소문자, 공백 정리)"""
+    return " ".join((instruction or "").lower().split())
+
+@profiled("validate.dedup_qna")
+def dedup_qna(qna_list: List[QARecord], seen: Optional[Set[str]] = None,
+              keys: Optional[List[str]] = None) -> List[QARecord]:
+    """질문 기준 중복 제거 (seen에 이미 있는 질문 제외, 통과한 질문은 seen에 추가)
     
-    instruction = item.get('instruction', '').strip()
-    output = item.get('output', '').strip()
+    keys: 미리 계산된 정규화 질문 목록 (프로세스 풀에서 계산한 경우)
+    """
+    if seen is None:
+        seen = set()
+    if keys is None:
+        keys = [normalize_instruction(item.instruction) for item in qna_list]
     
-    # 최소 길이 검증
-    if len(instruction) < 5 or len(output) < 10:
-        return None
+    unique_items = []
+    for item, key in zip(qna_list, keys):
+        if key in seen:
+            continue
+        seen.add(key)
+        unique_items.append(item)
     
-    # 유효한 항목 반환
-    return {
-        'instruction': instruction,
-        'input': item.get('input', '').strip(),
-        'output': output
-    }
\ No newline at end of file
+    return unique_items
+
+def validate_single_qna(item: QARecord) -> Optional[QARecord]:
+    """단일 Q&A 항목 검증 (통과하면 공백을 정리한 같은 레코드, 아니면 None)"""
+    return None if BASE_RULES.check(item, require_title=False) else item
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+격리 목록 - 매번 실패하는 작품(poison item) 기록
+- 실패 유형/횟수/마지막 원본 응답을 실행 간에 유지
+- 같은 입력으로 정해진 횟수 이상 실패한 작품은 다음 실행부터 건너뜀
+- 입력이 바뀌거나 생성에 성공하면 격리 해제
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.profiler import profiled
+from utils.records import ArtworkRecord
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class Quarantine:
+    """작품별 실패 기록과 격리 여부를 관리하는 JSON 목록"""
+
+    def __init__(self, path: Path, threshold: int = 2, max_raw_chars: int = 4000):
+        """
+        Args:
+            path: 격리 목록 파일 경로
+            threshold: 같은 입력 지문으로 이 횟수만큼 실패하면 격리
+            max_raw_chars: 기록할 마지막 원본 응답 최대 길이
+        """
+        self.path = Path(path)
+        self.threshold = threshold
+        self.max_raw_chars = max_raw_chars
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    self._entries = loaded.get("artworks", {})
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"   ⚠️ 격리 목록 로드 실패 - 새로 생성합니다 ({self.path.name}): {e}")
+
+    def get(self, artwork_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(artwork_key)
+            return dict(entry) if entry else None
+
+    def is_quarantined(self, artwork_key: str, fingerprint: Optional[str]) -> bool:
+        """격리 여부 (입력 지문이 바뀌었으면 격리되지 않은 것으로 판단)"""
+        entry = self.get(artwork_key)
+        return bool(entry and entry.get("quarantined") and entry.get("fingerprint") == fingerprint)
+
+    def record_failure(self, artwork_key: str, artwork: ArtworkRecord, failure_class: str,
+                       error: str = "", raw_response: Optional[str] = None,
+                       mode: Optional[str] = None) -> Dict[str, Any]:
+        """작품 실패 기록 (임계값 도달 시 격리) 후 기록 반환"""
+        with self._lock:
+            entry = self._entries.get(artwork_key)
+            if entry is None or entry.get("fingerprint") != artwork.fingerprint:
+                # 처음 실패했거나 입력이 바뀐 뒤 다시 실패 - 횟수 초기화
+                entry = {"failures": 0, "failure_counts": {}, "first_failed_at": _now()}
+
+            entry["failures"] += 1
+            entry["failure_counts"][failure_class] = entry["failure_counts"].get(failure_class, 0) + 1
+            entry.update({
+                "artwork_id": artwork.item_id,
+                "artist": artwork.artist,
+                "title": artwork.title,
+                "fingerprint": artwork.fingerprint,
+                "failure_class": failure_class,
+                "last_error": error[:500],
+                "last_raw_response": (raw_response or "")[:self.max_raw_chars],
+                "input_warnings": artwork.input_warnings,
+                "mode": mode,
+                "quarantined": entry["failures"] >= self.threshold,
+                "last_failed_at": _now(),
+            })
+            self._entries[artwork_key] = entry
+            self._save_locked()
+            return dict(entry)
+
+    def clear(self, artwork_key: str) -> bool:
+        """생성 성공 시 기록 삭제"""
+        with self._lock:
+            if self._entries.pop(artwork_key, None) is None:
+                return False
+            self._save_locked()
+            return True
+
+    def list_entries(self, quarantined_only: bool = True) -> List[Dict[str, Any]]:
+        """기록 목록 (작품 키 포함)"""
+        with self._lock:
+            return [
+                dict(entry, artwork_key=key)
+                for key, entry in self._entries.items()
+                if entry.get("quarantined") or not quarantined_only
+            ]
+
+    @profiled("io.quarantine_save")
+    def _save_locked(self) -> None:
+        """원자적 저장 (임시 파일 → 교체)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"artworks": self._entries}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+작품 / Q&A 레코드 (슬롯 클래스)
+- 파싱 → 검증 → 저장까지 dict 대신 슬롯 객체 하나를 그대로 전달 (항목마다 dict를 다시 만들지 않음)
+- 작가/제목처럼 반복되는 문자열은 intern하여 대량 카탈로그에서 메모리 절약
+- 작품 키 체계 통합: AX4Processor의 작가/제목 키와 file_processor의 성명/작품명 키 모두 같은 속성으로 조회
+- JSON 경계: 읽을 때는 dict의 문자열 객체를 그대로 참조, 쓸 때는 json_default로 바로 직렬화
+"""
+
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class ArtworkRecord:
+    """작품 정보 (원본 카탈로그 아이템에서 변환)"""
+
+    __slots__ = (
+        "artist", "artist_en", "nationality", "birth_year",
+        "title", "title_en", "size", "weight", "year", "materials",
+        "artist_note", "description", "exhibitions", "awards",
+        "item_id", "item_no", "updated_at", "fingerprint", "input_warnings",
+    )
+
+    # 출력/호환용 키 → 속성 (작가/제목 키 체계 기준, 성명/작품명 키도 같은 속성으로)
+    KEYS = {
+        "작가": "artist", "영문작가명": "artist_en", "국적": "nationality", "출생년도": "birth_year",
+        "제목": "title", "영문제목": "title_en", "크기": "size", "무게": "weight",
+        "제작년도": "year", "재료": "materials", "작가노트": "artist_note", "작품설명": "description",
+        "전시이력": "exhibitions", "수상이력": "awards",
+        "item_id": "item_id", "item_no": "item_no", "updated_at": "updated_at",
+        "fingerprint": "fingerprint", "input_warnings": "input_warnings",
+    }
+    ALIASES = dict(KEYS, **{
+        "성명": "artist", "성명_영문": "artist_en", "작품명": "title", "작품명_영문": "title_en",
+        "제작연도": "year", "소재": "materials",
+    })
+
+    def __init__(self, artist: str = "Unknown", title: str = "Unknown", *,
+                 artist_en: str = "", nationality: str = "", birth_year: Any = "",
+                 title_en: str = "", size: str = "", weight: str = "", year: Any = "",
+                 materials: str = "", artist_note: str = "", description: str = "",
+                 exhibitions: Any = None, awards: Any = None,
+                 item_id: Any = None, item_no: Any = None, updated_at: Optional[str] = None,
+                 fingerprint: Optional[str] = None, input_warnings: Optional[List[str]] = None):
+        self.artist = _intern(artist)
+        self.artist_en = _intern(artist_en)
+        self.nationality = _intern(nationality)
+        self.birth_year = _intern(birth_year)
+        self.title = _intern(title)
+        self.title_en = title_en
+        self.size = size
+        self.weight = weight
+        self.year = _intern(year)
+        self.materials = _intern(materials)
+        self.artist_note = artist_note
+        self.description = description
+        self.exhibitions = exhibitions if exhibitions is not None else []
+        self.awards = awards if awards is not None else []
+        self.item_id = item_id
+        self.item_no = item_no
+        self.updated_at = updated_at
+        self.fingerprint = fingerprint
+        self.input_warnings = input_warnings if input_warnings is not None else []
+
+    @classmethod
+    def from_raw(cls, raw_item: Dict[str, Any], artist_metadata: Optional[Dict[str, Any]] = None,
+                 fingerprint: Optional[str] = None,
+                 input_warnings: Optional[List[str]] = None) -> "ArtworkRecord":
+        """
+        원본 카탈로그 아이템(API 응답 형식) → 작품 레코드
+
+        artist_metadata: artist_info JSON 문자열을 파싱한 결과 (birth / exhibits / awards)
+        """
+        metadata = artist_metadata or {}
+        return cls(
+            raw_item.get("artist_name", "Unknown"),
+            raw_item.get("title", "Unknown"),
+            artist_en=raw_item.get("artist_name_eng", ""),
+            nationality=raw_item.get("nationality", ""),
+            birth_year=metadata.get("birth", ""),
+            title_en=raw_item.get("title_eng", ""),
+            size=raw_item.get("size", ""),
+            weight=raw_item.get("weight", ""),
+            year=raw_item.get("year", ""),
+            materials=raw_item.get("materials", ""),
+            artist_note=raw_item.get("artist_note", ""),
+            description=raw_item.get("description", ""),
+            exhibitions=metadata.get("exhibits", []),
+            awards=metadata.get("awards", []),
+            item_id=raw_item.get("id"),
+            item_no=raw_item.get("no"),
+            updated_at=raw_item.get("updated_at"),
+            fingerprint=fingerprint,
+            input_warnings=input_warnings,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ArtworkRecord":
+        """작가/제목(또는 성명/작품명) 키 dict → 작품 레코드 (이전 dict 형식 호환)"""
+        values = {}
+        for key, value in data.items():
+            attr = cls.ALIASES.get(key)
+            if attr is not None and attr not in values:
+                values[attr] = value
+        return cls(values.pop("artist", "Unknown"), values.pop("title", "Unknown"), **values)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """키로 조회 (작가/제목, 성명/작품명 키 모두 지원, 없는 키는 default)"""
+        attr = self.ALIASES.get(key)
+        return default if attr is None else getattr(self, attr)
+
+    def __getitem__(self, key: str) -> Any:
+        attr = self.ALIASES.get(key)
+        if attr is None:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """작가/제목 키 체계의 dict (JSON 저장용)"""
+        return {key: getattr(self, attr) for key, attr in self.KEYS.items()}
+
+    @property
+    def label(self) -> str:
+        return f"{self.artist} - {self.title}"
+
+    def __repr__(self) -> str:
+        return f"ArtworkRecord({self.artist!r}, {self.title!r}, item_id={self.item_id!r})"
+
+
+class QARecord:
+    """Q&A 항목 (+ 생성 메타: 관점 / 배치 / 프롬프트 해시)"""
+
+    __slots__ = ("instruction", "input", "output", "perspective", "batch", "prompt_hash", "raw")
+
+    def __init__(self, instruction: str, input: str, output: str, perspective: Optional[str] = None,
+                 batch: Optional[str] = None, prompt_hash: Optional[str] = None,
+                 raw: Optional[Dict[str, Any]] = None):
+        self.instruction = instruction
+        self.input = _intern(input)
+        self.output = output
+        self.perspective = perspective
+        self.batch = batch
+        self.prompt_hash = prompt_hash
+        self.raw = raw   # 출력 형식과 다른 기존 항목의 원본 dict (저장 시 그대로 기록)
+
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any]) -> Optional["QARecord"]:
+        """
+        dict → 레코드 (문자열은 복사하지 않고 그대로 참조)
+
+        instruction/output 또는 question/answer 형식이 아니면 None
+        """
+        if "instruction" in item and "output" in item:
+            return cls(item["instruction"], item.get("input", ""), item["output"],
+                       item.get("perspective"), item.get("batch"), item.get("prompt_hash"))
+        if "question" in item and "answer" in item:
+            return cls(item["question"], "", item["answer"])
+        return None
+
+    def set_meta(self, perspective: str, batch: str, prompt_hash: str) -> "QARecord":
+        """생성 메타 부착 (관점/배치명은 반복되므로 intern)"""
+        self.perspective = _intern(perspective)
+        self.batch = _intern(batch)
+        self.prompt_hash = prompt_hash
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """출력 형식 dict (메타 제외, 원본 dict가 있으면 그대로)"""
+        if self.raw is not None:
+            return self.raw
+        return {"instruction": self.instruction, "input": self.input, "output": self.output}
+
+    def __repr__(self) -> str:
+        return f"QARecord({str(self.instruction)[:30]!r}, perspective={self.perspective!r})"
+
+
+def qa_records_from_dicts(items: Iterable[Any]) -> List[QARecord]:
+    """dict 목록(기존 출력 파일 / 저장소) → 레코드 목록 (형식이 맞지 않는 항목은 제외)"""
+    records = []
+    for item in items:
+        if isinstance(item, QARecord):
+            records.append(item)
+        elif isinstance(item, dict):
+            record = QARecord.from_dict(item)
+            if record is not None:
+                records.append(record)
+    return records
+
+
+_OUTPUT_KEYS = {"instruction", "input", "output"}
+
+
+def split_output_items(items: Iterable[Any]) -> Tuple[List[QARecord], List[Any]]:
+    """
+    기존 출력 파일 항목 → (Q&A 레코드, Q&A가 아닌 항목)
+
+    - 추가 키가 있거나 question/answer 형식인 항목은 레코드에 원본 dict를 보관해 다시 저장할 때 바꾸지 않음
+    - Q&A 형식이 아닌 항목은 레코드로 만들지 않고 그대로 돌려줌 (저장 시 함께 기록)
+    """
+    records = []
+    passthrough = []
+    for item in items:
+        record = QARecord.from_dict(item) if isinstance(item, dict) else None
+        if record is None:
+            passthrough.append(item)
+            continue
+        if set(item) != _OUTPUT_KEYS:
+            record.raw = item
+        records.append(record)
+    return records, passthrough
+
+
+def json_default(obj: Any) -> Any:
+    """json.dump(default=...)용 - 레코드를 출력 형식으로 직렬화"""
+    if isinstance(obj, (QARecord, ArtworkRecord)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+자원 감시 / 동시성 조절
+- ResourceMonitor: 백그라운드 스레드가 메모리/CPU를 주기적으로 샘플링 (처리 경로에서는 마지막 값만 읽음)
+- ConcurrencyGovernor: 샘플마다 파이프라인 단계별 작업자 수와 큐 크기를 설정 범위 안에서 조절
+  - critical: 모든 조절 대상 단계를 최소로, 큐를 최소 배율로 (진입 시 gc 한 번)
+  - warning: 한 단계씩 줄임
+  - safe + CPU 여유: 대기 작업이 있는 단계만 한 단계씩 늘림
+"""
+
+import gc
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.logger import setup_logger
+from utils import metrics
+from config import (
+    MEMORY_CRITICAL_THRESHOLD_GB, MEMORY_WARNING_THRESHOLD_GB, MEMORY_SAFE_THRESHOLD_GB,
+    RESOURCE_MONITOR_INTERVAL, RESOURCE_CPU_HIGH_PERCENT, GOVERNOR_QUEUE_SCALE
+)
+
+LEVEL_CRITICAL = "critical"
+LEVEL_WARNING = "warning"
+LEVEL_NORMAL = "normal"
+LEVEL_SAFE = "safe"
+
+
+def memory_level(available_gb: float) -> str:
+    """사용 가능 메모리 → 상태 (config.MEMORY_*_THRESHOLD_GB 기준)"""
+    if available_gb < MEMORY_CRITICAL_THRESHOLD_GB:
+        return LEVEL_CRITICAL
+    if available_gb < MEMORY_WARNING_THRESHOLD_GB:
+        return LEVEL_WARNING
+    if available_gb >= MEMORY_SAFE_THRESHOLD_GB:
+        return LEVEL_SAFE
+    return LEVEL_NORMAL
+
+
+class ResourceMonitor:
+    """메모리/CPU 주기 샘플링"""
+
+    def __init__(self, interval: float = RESOURCE_MONITOR_INTERVAL):
+        self.interval = interval
+        self.logger = setup_logger("ResourceMonitor")
+        self.snapshot: Optional[Dict] = None   # 마지막 샘플 (통째로 교체하므로 잠금 없이 읽음)
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = None
+
+    @property
+    def level(self) -> str:
+        snapshot = self.snapshot
+        return snapshot["level"] if snapshot else LEVEL_NORMAL
+
+    def add_listener(self, listener: Callable[[Dict], None]) -> None:
+        """샘플마다 호출할 함수 등록 (감시 스레드에서 실행)"""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        import psutil  # 생성 실행에서만 필요하므로 지연 로딩
+        self._process = psutil.Process()
+        psutil.cpu_percent(interval=None)   # 첫 호출은 기준점 (0.0 반환)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def sample(self) -> Dict:
+        """지금 샘플링하고 등록된 함수에 전달"""
+        import psutil
+        memory = psutil.virtual_memory()
+        available_gb = memory.available / (1024**3)
+        snapshot = {
+            "sampled_at": time.time(),
+            "available_gb": round(available_gb, 2),
+            "memory_percent": memory.percent,
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "process_rss_gb": round(self._process.memory_info().rss / (1024**3), 3) if self._process else None,
+            "level": memory_level(available_gb),
+        }
+        self.snapshot = snapshot
+
+        metrics.MEMORY_AVAILABLE.set(snapshot["available_gb"])
+        metrics.CPU_PERCENT.set(snapshot["cpu_percent"])
+        if snapshot["process_rss_gb"] is not None:
+            metrics.PROCESS_RSS.set(snapshot["process_rss_gb"])
+
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                self.logger.error(f"❌ 자원 샘플 처리 실패: {e}")
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.warning(f"⚠️ 자원 샘플링 실패: {e}")
+            self._stop.wait(self.interval)
+
+
+class ConcurrencyGovernor:
+    """자원 상태에 따라 파이프라인 동시성 조절"""
+
+    def __init__(self, pipeline, stage_limits: Dict[str, Tuple[int, int]],
+                 queue_scale: Tuple[float, float] = GOVERNOR_QUEUE_SCALE,
+                 cpu_high_percent: float = RESOURCE_CPU_HIGH_PERCENT):
+        """
+        Args:
+            pipeline: StagedPipeline
+            stage_limits: 조절 대상 단계 → (최소, 최대) 작업자 수
+            queue_scale: 설정 큐 크기 대비 (최소, 최대) 배율
+            cpu_high_percent: CPU 사용률이 이 이상이면 늘리지 않음
+        """
+        self.pipeline = pipeline
+        self.stage_limits = stage_limits
+        self.min_scale, self.max_scale = queue_scale
+        self.cpu_high_percent = cpu_high_percent
+        self.queue_scale = 1.0
+        self.last_level: Optional[str] = None
+        self.adjustments = 0
+        self.logger = setup_logger("ConcurrencyGovernor")
+
+    def on_sample(self, snapshot: Dict) -> None:
+        level = snapshot["level"]
+        if level != self.last_level:
+            self._log_level(level, snapshot)
+            if level == LEVEL_CRITICAL:
+                gc.collect()   # 위험 상태에 들어설 때만 한 번
+            self.last_level = level
+
+        changes = []
+        if level == LEVEL_CRITICAL:
+            changes += self._set_all(lambda stage, low: low)
+            changes += self._scale_queues(self.min_scale)
+        elif level == LEVEL_WARNING:
+            changes += self._set_all(lambda stage, low: stage.workers - 1)
+            changes += self._scale_queues(max(self.min_scale, self.queue_scale / 2))
+        elif level == LEVEL_SAFE and snapshot["cpu_percent"] < self.cpu_high_percent:
+            # 대기 작업이 쌓인 단계만 늘림 (쉬는 단계에 작업자를 더해도 소용없음)
+            changes += self._set_all(
+                lambda stage, low: stage.workers + 1 if stage.depth() > 0 else stage.workers
+            )
+            changes += self._scale_queues(min(self.max_scale, self.queue_scale * 2))
+
+        if changes:
+            self.adjustments += 1
+            self.logger.info(
+                f"🎛️ 동시성 조절 ({level}, 사용가능 {snapshot['available_gb']:.1f}GB, "
+                f"CPU {snapshot['cpu_percent']:.0f}%): {', '.join(changes)}"
+            )
+
+    def _set_all(self, target: Callable) -> List[str]:
+        changes = []
+        for name, (low, high) in self.stage_limits.items():
+            stage = self.pipeline.stage(name)
+            before = stage.workers
+            wanted = min(max(low, target(stage, low)), high)
+            after = self.pipeline.set_workers(name, wanted)
+            if after != before:
+                changes.append(f"{name} {before}→{after}")
+        return changes
+
+    def _scale_queues(self, scale: float) -> List[str]:
+        if scale == self.queue_scale:
+            return []
+        self.queue_scale = scale
+        for stage in self.pipeline.stages:
+            if stage.base_queue_size > 0:
+                self.pipeline.set_queue_size(stage.name, round(stage.base_queue_size * scale))
+        return [f"큐 x{scale:g}"]
+
+    def _log_level(self, level: str, snapshot: Dict) -> None:
+        message = f"메모리 상태 {level} (사용가능 {snapshot['available_gb']:.1f}GB, CPU {snapshot['cpu_percent']:.0f}%)"
+        if level == LEVEL_CRITICAL:
+            self.logger.warning(f"⛔ {message} - 동시성을 최소로 낮춤")
+        elif level == LEVEL_WARNING:
+            self.logger.warning(f"⚠️ {message} - 동시성을 줄임")
+        elif self.last_level is not None:
+            self.logger.info(f"✅ {message}")
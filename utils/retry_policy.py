@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+통합 재시도 정책
+- 오류 유형별 예외 클래스 (timeout / throttled / server / client / parse)
+- 작품별·실행별 재시도 예산: 요청 재시도, 배치 재시도, 작품 재시도가 모두 같은 예산을 사용
+- 작품당 최악의 요청 수 = 배치 수 + 작품별 예산
+"""
+
+import random
+import threading
+from typing import Optional
+
+from utils.logger import setup_logger
+
+
+class AX4Error(Exception):
+    """A.X 4.0 생성 오류 (유형별 재시도 판단 기준)"""
+    kind = "unknown"
+    retryable = True
+    endpoint_failure = False  # 회로 차단기 집계 대상 여부
+
+    def __init__(self, message: str, retry_after: Optional[float] = None,
+                 raw_response: Optional[str] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.raw_response = raw_response  # 파싱 실패 시 원본 응답 (격리 기록용)
+
+
+class AX4TimeoutError(AX4Error):
+    """요청 타임아웃 / 연결 실패"""
+    kind = "timeout"
+    endpoint_failure = True
+
+
+class AX4ThrottledError(AX4Error):
+    """요청 한도 초과 (429)"""
+    kind = "throttled"
+    endpoint_failure = True
+
+
+class AX4ServerError(AX4Error):
+    """서버 오류 (5xx)"""
+    kind = "server"
+    endpoint_failure = True
+
+
+class AX4ClientError(AX4Error):
+    """클라이언트 오류 (400/401/403 등) - 재시도해도 같은 결과"""
+    kind = "client"
+    retryable = False
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class AX4ParseError(AX4Error):
+    """응답은 받았지만 Q&A를 추출하지 못함 (빈 응답, 파싱 실패) - 배치 재시도 대상"""
+    kind = "parse"
+
+
+class AX4BudgetError(AX4Error):
+    """실행 예산(시간/요청/토큰) 소진으로 요청하지 않음"""
+    kind = "budget"
+    retryable = False
+
+
+class RetryBudget:
+    """작품별 재시도 예산 (배치가 동시에 실행되어도 안전)"""
+
+    def __init__(self, policy: "RetryPolicy", limit: int, artwork_key: Optional[str] = None):
+        self.policy = policy
+        self.limit = limit
+        self.artwork_key = artwork_key   # 실행 예산 예약과 요청 사용량을 연결하는 작품 키
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return self.limit - self.used
+
+    def take(self, n: int = 1) -> bool:
+        """재시도 n회분 사용 (작품 예산과 실행 예산이 모두 남아 있어야 성공)"""
+        with self._lock:
+            if self.used + n > self.limit:
+                return False
+            if not self.policy._take_run(n):
+                return False
+            self.used += n
+            return True
+
+
+class RetryPolicy:
+    """요청/배치/작품 재시도 판단과 백오프 계산"""
+
+    def __init__(self, max_request_attempts: int = 3, artwork_budget: int = 8,
+                 run_budget: int = 500, max_artwork_attempts: int = 3,
+                 base_delay: float = 2.0, max_delay: float = 30.0):
+        """
+        Args:
+            max_request_attempts: 같은 요청의 최대 시도 횟수 (타임아웃/서버 오류)
+            artwork_budget: 작품 하나에 허용하는 재시도 요청 수
+            run_budget: 실행 전체에 허용하는 재시도 요청 수
+            max_artwork_attempts: 작품 전체 재생성 포함 최대 시도 횟수
+            base_delay / max_delay: 지수 백오프 기준/상한 (초)
+        """
+        self.max_request_attempts = max_request_attempts
+        self.artwork_budget = artwork_budget
+        self.run_budget = run_budget
+        self.max_artwork_attempts = max_artwork_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.logger = setup_logger("RetryPolicy")
+
+        self._lock = threading.Lock()
+        self._run_used = 0
+        self._run_exhausted_logged = False
+
+    def new_budget(self, artwork_key: Optional[str] = None) -> RetryBudget:
+        """작품 하나의 재시도 예산 생성"""
+        return RetryBudget(self, self.artwork_budget, artwork_key)
+
+    def max_requests_per_artwork(self, batch_count: int) -> int:
+        """작품당 최악의 요청 수 (재시도와 규칙 위반 수정 요청은 작품 예산에서 사용)"""
+        return batch_count + self.artwork_budget
+
+    @property
+    def run_remaining(self) -> int:
+        with self._lock:
+            return self.run_budget - self._run_used
+
+    def _take_run(self, n: int) -> bool:
+        with self._lock:
+            if self._run_used + n > self.run_budget:
+                if not self._run_exhausted_logged:
+                    self._run_exhausted_logged = True
+                    self.logger.warning(f"⚠️ 실행 전체 재시도 예산 소진 ({self.run_budget}회) - 이후 재시도 없음")
+                return False
+            self._run_used += n
+            return True
+
+    # --- 재시도 판단 ---
+
+    def should_retry_request(self, error: AX4Error, attempt: int, budget: Optional[RetryBudget]) -> bool:
+        """같은 요청을 다시 보낼지 (전송 단계 오류만, attempt는 방금 실패한 시도 번호)"""
+        if not error.retryable or isinstance(error, AX4ParseError):
+            return False
+        if attempt >= self.max_request_attempts:
+            return False
+        return budget.take() if budget is not None else self._take_run(1)
+
+    def should_retry_batch(self, error: Optional[AX4Error], budget: Optional[RetryBudget]) -> bool:
+        """실패한 배치 하나만 다시 생성할지 (요청 재시도를 소진했거나 응답 파싱에 실패한 경우)"""
+        if error is not None and not error.retryable:
+            return False
+        return budget.take() if budget is not None else self._take_run(1)
+
+    def allow_repair(self, budget: Optional[RetryBudget]) -> bool:
+        """규칙 위반 수정 요청 1회분을 작품 재시도 예산에서 사용 (작품당 최대 요청 수에 포함되도록)"""
+        return budget.take() if budget is not None else self._take_run(1)
+
+    def should_retry_artwork(self, attempt: int, budget: Optional[RetryBudget], batch_count: int) -> bool:
+        """작품 전체를 다시 생성할지 (배치를 모두 다시 보낼 예산이 있어야 함)"""
+        if attempt >= self.max_artwork_attempts:
+            return False
+        return budget.take(batch_count) if budget is not None else self._take_run(batch_count)
+
+    def backoff(self, attempt: int, error: Optional[AX4Error] = None) -> float:
+        """다음 시도까지 대기 시간 (지수 백오프 + 지터, 429는 Retry-After 우선)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** max(0, attempt - 1)))
+        delay = random.uniform(delay / 2, delay)
+        if error is not None and error.retry_after:
+            delay = max(delay, min(error.retry_after, self.max_delay))
+        return delay
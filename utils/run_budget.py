@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+실행 예산 (시간 / 요청 수 / 토큰 수)
+- 요청마다 사용량 기록, 예산을 넘기면 더 이상 요청하지 않음
+- 작품 시작 전 예상 사용량을 예약하여 끝낼 수 없는 작품은 시작하지 않음
+  (작품의 요청이 기록될 때마다 그 작품의 남은 예약을 줄여 같은 사용량을 두 번 세지 않음)
+- 작품별 실제 토큰/소요 시간 평균으로 예상치를 갱신
+"""
+
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+
+def parse_duration(text: str) -> float:
+    """기간 문자열을 초로 변환 ("3600", "90m", "2h", "1h30m", "45s")"""
+    value = text.strip().lower()
+    if re.fullmatch(r"\d+(\.\d+)?", value):
+        return float(value)
+    parts = re.findall(r"(\d+(?:\.\d+)?)\s*([hms])", value)
+    if not parts or "".join(n + u for n, u in parts) != value.replace(" ", ""):
+        raise ValueError(f"잘못된 기간 형식: {text} (예: 3600, 90m, 2h, 1h30m)")
+    units = {"h": 3600, "m": 60, "s": 1}
+    return sum(float(n) * units[u] for n, u in parts)
+
+
+def estimate_tokens(text: str) -> int:
+    """사용량 정보가 없을 때의 토큰 추정 (한국어 기준 약 2자당 1토큰)"""
+    return max(1, len(text or "") // 2)
+
+
+class RunBudget:
+    """실행 전체 예산과 작품 단위 예약"""
+
+    def __init__(self, time_seconds: Optional[float] = None, max_requests: Optional[int] = None,
+                 max_tokens: Optional[int] = None, artwork_requests: int = 8,
+                 artwork_tokens: int = 30000):
+        """
+        Args:
+            time_seconds / max_requests / max_tokens: 예산 (None이면 제한 없음)
+            artwork_requests: 작품 하나의 예상 요청 수 (배치 수)
+            artwork_tokens: 실제 사용량이 쌓이기 전 작품 하나의 예상 토큰 수
+        """
+        self.time_seconds = time_seconds
+        self.max_requests = max_requests
+        self.max_tokens = max_tokens
+        self.artwork_requests = artwork_requests
+        self._artwork_tokens = float(artwork_tokens)
+        self._artwork_seconds: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self.requests = 0
+        self.tokens = 0
+        self.artworks_started = 0
+        self.artworks_finished = 0
+        self._reserved_requests = 0
+        self._reserved_tokens = 0
+        self._reservations: Dict[str, list] = {}   # 작품 키 → [남은 예약 요청, 남은 예약 토큰, 시작 시각]
+        self.stop_reason: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return any(v is not None for v in (self.time_seconds, self.max_requests, self.max_tokens))
+
+    def start(self) -> None:
+        with self._lock:
+            self._started_at = time.monotonic()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started_at
+
+    def remaining_seconds(self) -> Optional[float]:
+        if self.time_seconds is None:
+            return None
+        return self.time_seconds - self.elapsed()
+
+    # --- 요청 단위 ---
+
+    def allow_request(self) -> bool:
+        """요청 전 확인 (시간/요청/토큰 예산 중 하나라도 소진되면 False)"""
+        with self._lock:
+            reason = self._exhausted_reason_locked()
+            if reason and not self.stop_reason:
+                self.stop_reason = reason
+            return reason is None
+
+    def record_request(self, tokens: int = 0, artwork_key: Optional[str] = None) -> None:
+        """요청 완료 후 사용량 기록 (작품 키를 주면 그 작품의 남은 예약에서 차감)"""
+        with self._lock:
+            self.requests += 1
+            self.tokens += tokens
+            reservation = self._reservations.get(artwork_key) if artwork_key is not None else None
+            if reservation is not None:
+                used_requests = min(1, reservation[0])
+                used_tokens = min(tokens, reservation[1])
+                reservation[0] -= used_requests
+                reservation[1] -= used_tokens
+                self._reserved_requests -= used_requests
+                self._reserved_tokens -= used_tokens
+
+    # --- 작품 단위 ---
+
+    def try_start_artwork(self, artwork_key: str) -> bool:
+        """
+        작품 시작 가능 여부 확인 후 예상 사용량 예약
+
+        진행 중인 작품의 남은 예약분까지 포함해 남은 예산으로 끝낼 수 있을 때만 True
+        """
+        with self._lock:
+            reason = self._exhausted_reason_locked()
+            if reason is None:
+                est_tokens = int(self._artwork_tokens)
+                if self.max_requests is not None and \
+                        self.requests + self._reserved_requests + self.artwork_requests > self.max_requests:
+                    reason = "요청 예산 부족"
+                elif self.max_tokens is not None and \
+                        self.tokens + self._reserved_tokens + est_tokens > self.max_tokens:
+                    reason = "토큰 예산 부족"
+                elif self.time_seconds is not None and self._artwork_seconds is not None and \
+                        self.time_seconds - self.elapsed() < self._artwork_seconds:
+                    reason = "시간 예산 부족"
+            if reason:
+                if not self.stop_reason:
+                    self.stop_reason = reason
+                return False
+
+            self._reserved_requests += self.artwork_requests
+            self._reserved_tokens += est_tokens
+            self._reservations[artwork_key] = [self.artwork_requests, est_tokens, time.monotonic()]
+            self.artworks_started += 1
+            return True
+
+    def finish_artwork(self, artwork_key: str) -> None:
+        """작품 종료 - 예약 해제, 작품당 토큰/소요 시간 평균 갱신"""
+        with self._lock:
+            reservation = self._reservations.pop(artwork_key, None)
+            if reservation is None:
+                return
+            requests, est_tokens, started_at = reservation
+            self._reserved_requests -= requests
+            self._reserved_tokens -= est_tokens
+            self.artworks_finished += 1
+
+            # 소요 시간은 지수 이동 평균, 토큰은 요청당 평균 × 작품당 요청 수
+            duration = time.monotonic() - started_at
+            self._artwork_seconds = duration if self._artwork_seconds is None else \
+                0.7 * self._artwork_seconds + 0.3 * duration
+            if self.requests:
+                self._artwork_tokens = self.tokens / self.requests * self.artwork_requests
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                "elapsed_seconds": round(self.elapsed(), 1),
+                "time_budget_seconds": self.time_seconds,
+                "requests": self.requests,
+                "request_budget": self.max_requests,
+                "tokens": self.tokens,
+                "token_budget": self.max_tokens,
+                "artworks_started": self.artworks_started,
+                "artworks_finished": self.artworks_finished,
+                "estimated_tokens_per_artwork": int(self._artwork_tokens),
+                "estimated_seconds_per_artwork": round(self._artwork_seconds, 1) if self._artwork_seconds else None,
+                "stop_reason": self.stop_reason,
+            }
+
+    def _exhausted_reason_locked(self) -> Optional[str]:
+        if self.time_seconds is not None and self.elapsed() >= self.time_seconds:
+            return "시간 예산 소진"
+        if self.max_requests is not None and self.requests >= self.max_requests:
+            return "요청 예산 소진"
+        if self.max_tokens is not None and self.tokens >= self.max_tokens:
+            return "토큰 예산 소진"
+        return None
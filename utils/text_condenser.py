@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+작품 개념 요약 (추출식, API 호출 없음)
+- 작품 설명 + 작가노트가 글자 수 예산을 넘으면 문장 단위로 점수를 매겨 핵심 문장만 남김
+- 점수: 본문 전체에서 반복되는 단어를 많이 담은 문장 우선, 문단 첫 문장과 작품명/소재를 언급한 문장에 가산점
+- 남긴 문장은 원래 순서대로 이어 붙임 (문단 구분 유지)
+"""
+
+import re
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n|\n")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?。！？…])\s+")
+_WORD = re.compile(r"\w{2,}")
+
+LEAD_BONUS = 1.5      # 문단 첫 문장 (주제문인 경우가 많음)
+KEYWORD_BONUS = 1.3   # 작품명/소재 언급 문장
+ELLIPSIS = "…"
+
+
+def split_sentences(text: str) -> List[List[str]]:
+    """본문 → 문단별 문장 목록 (빈 문단 제외)"""
+    paragraphs = []
+    for block in _PARAGRAPH_BREAK.split(text):
+        sentences = [s.strip() for s in _SENTENCE_BREAK.split(block.strip()) if s.strip()]
+        if sentences:
+            paragraphs.append(sentences)
+    return paragraphs
+
+
+def _keyword_words(keywords: Iterable[str]) -> set:
+    return {word for keyword in keywords if keyword for word in _WORD.findall(str(keyword).lower())}
+
+
+def score_sentences(paragraphs: List[List[str]], keywords: Iterable[str] = ()) -> List[Tuple[float, int, int]]:
+    """문장별 점수 → [(점수, 문단 번호, 문장 번호)] (반복 단어 빈도 합 / 문장 길이의 제곱근)"""
+    words = [[_WORD.findall(sentence.lower()) for sentence in sentences] for sentences in paragraphs]
+    frequency = Counter(word for sentences in words for sentence in sentences for word in set(sentence))
+    keyword_words = _keyword_words(keywords)
+
+    scored = []
+    for p, sentences in enumerate(words):
+        for s, sentence in enumerate(sentences):
+            distinct = set(sentence)
+            score = sum(frequency[w] - 1 for w in distinct) / (len(sentence) ** 0.5 if sentence else 1)
+            if s == 0:
+                score *= LEAD_BONUS
+            if keyword_words & distinct:
+                score *= KEYWORD_BONUS
+            scored.append((score, p, s))
+    return scored
+
+
+def condense_text(text: str, max_chars: int, keywords: Iterable[str] = ()) -> str:
+    """
+    글자 수 예산 안에서 핵심 문장만 추출 (예산 이하이거나 max_chars가 0이면 원문 그대로)
+
+    Args:
+        text: 작품 설명 + 작가노트
+        max_chars: 결과 최대 글자 수
+        keywords: 가산점을 줄 단어 (작품명, 소재 등)
+    """
+    text = (text or "").strip()
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+
+    paragraphs = split_sentences(text)
+    selected = set()
+    used = 0
+    for _, p, s in sorted(score_sentences(paragraphs, keywords), key=lambda x: (-x[0], x[1], x[2])):
+        cost = len(paragraphs[p][s]) + 1   # 구분자 포함
+        if used + cost <= max_chars:
+            selected.add((p, s))
+            used += cost
+
+    if not selected:
+        # 예산보다 긴 문장 하나뿐이면 첫 문장을 잘라서 사용
+        return paragraphs[0][0][:max_chars - len(ELLIPSIS)].rstrip() + ELLIPSIS
+
+    blocks = []
+    for p, sentences in enumerate(paragraphs):
+        kept = [sentence for s, sentence in enumerate(sentences) if (p, s) in selected]
+        if kept:
+            blocks.append(" ".join(kept))
+    return "\n\n".join(blocks)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+토큰 사용량 / 비용 집계
+- 요청마다 response.usage를 기록 (usage가 없는 응답은 문자 수로 추정하고 표시)
+- 배치 / 작품 / 관점 / 모드 / 실행 전체 단위로 합산
+- 실행 종료 시 사용량 보고서(JSON) 저장
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+USAGE_FIELDS = ("requests", "prompt_tokens", "completion_tokens", "total_tokens", "estimated_requests")
+
+
+def empty_usage() -> Dict[str, int]:
+    """사용량 합계 초기값"""
+    return {field: 0 for field in USAGE_FIELDS}
+
+
+def add_usage(total: Dict[str, int], usage: Optional[Dict]) -> Dict[str, int]:
+    """
+    사용량 합산 (total을 직접 갱신)
+
+    usage가 요청 1회의 사용량(estimated 플래그 포함)이면 요청 수도 1 증가
+    """
+    if not usage:
+        return total
+    if "requests" in usage:
+        for field in USAGE_FIELDS:
+            total[field] = total.get(field, 0) + usage.get(field, 0)
+        return total
+    total["requests"] = total.get("requests", 0) + 1
+    for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        total[field] = total.get(field, 0) + usage.get(field, 0)
+    if usage.get("estimated"):
+        total["estimated_requests"] = total.get("estimated_requests", 0) + 1
+    return total
+
+
+class UsageTracker:
+    """실행 전체 사용량 집계기 (스레드 안전)"""
+
+    def __init__(self, cost_per_1k_prompt: float = 0.0, cost_per_1k_completion: float = 0.0,
+                 currency: str = "KRW"):
+        """
+        Args:
+            cost_per_1k_prompt / cost_per_1k_completion: 1천 토큰당 입력/출력 단가 (0이면 비용 미표시)
+            currency: 비용 통화 표기
+        """
+        self.cost_per_1k_prompt = cost_per_1k_prompt
+        self.cost_per_1k_completion = cost_per_1k_completion
+        self.currency = currency
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._lock = threading.Lock()
+        self._run = empty_usage()
+        self._by_perspective: Dict[str, Dict[str, int]] = {}
+        self._by_mode: Dict[str, Dict[str, int]] = {}
+        self._by_artwork: Dict[str, Dict] = {}   # 작품 키 → {"total": 합계, "batches": {배치명: 합계}}
+
+    def record(self, usage: Optional[Dict], artwork_key: Optional[str] = None,
+               perspective: Optional[str] = None, batch: Optional[str] = None,
+               mode: Optional[str] = None) -> None:
+        """배치 하나(재시도 포함)의 사용량 기록"""
+        if not usage:
+            return
+        with self._lock:
+            add_usage(self._run, usage)
+            if perspective:
+                add_usage(self._by_perspective.setdefault(perspective, empty_usage()), usage)
+            if mode:
+                add_usage(self._by_mode.setdefault(mode, empty_usage()), usage)
+            if artwork_key:
+                artwork = self._by_artwork.setdefault(artwork_key, {"total": empty_usage(), "batches": {}})
+                add_usage(artwork["total"], usage)
+                if batch:
+                    add_usage(artwork["batches"].setdefault(batch, empty_usage()), usage)
+
+    def cost(self, usage: Dict[str, int]) -> Optional[float]:
+        """사용량의 예상 비용 (단가 미설정 시 None)"""
+        if not (self.cost_per_1k_prompt or self.cost_per_1k_completion):
+            return None
+        return round(
+            usage.get("prompt_tokens", 0) / 1000 * self.cost_per_1k_prompt
+            + usage.get("completion_tokens", 0) / 1000 * self.cost_per_1k_completion, 4
+        )
+
+    def artwork_usage(self, artwork_key: str) -> Optional[Dict]:
+        """작품 하나의 사용량 합계 (비용 포함, 기록이 없으면 None)"""
+        with self._lock:
+            artwork = self._by_artwork.get(artwork_key)
+            total = dict(artwork["total"]) if artwork else None
+        if total is None:
+            return None
+        return self._with_cost(total)
+
+    def totals(self) -> Dict:
+        with self._lock:
+            total = dict(self._run)
+        return self._with_cost(total)
+
+    def report(self) -> Dict:
+        """실행 보고서 (실행 전체 / 관점 / 모드 / 작품별 배치 사용량)"""
+        with self._lock:
+            by_perspective = {k: dict(v) for k, v in self._by_perspective.items()}
+            by_mode = {k: dict(v) for k, v in self._by_mode.items()}
+            by_artwork = {
+                key: {"total": dict(a["total"]), "batches": {b: dict(u) for b, u in a["batches"].items()}}
+                for key, a in self._by_artwork.items()
+            }
+        artworks = len(by_artwork)
+        run = self.totals()
+        return {
+            "started_at": self.started_at,
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "currency": self.currency if run.get("cost") is not None else None,
+            "run": run,
+            "per_artwork_average": {
+                field: round(run[field] / artworks, 1) for field in USAGE_FIELDS
+            } if artworks else None,
+            "by_perspective": {k: self._with_cost(v) for k, v in by_perspective.items()},
+            "by_mode": {k: self._with_cost(v) for k, v in by_mode.items()},
+            "by_artwork": {
+                key: dict(self._with_cost(a["total"]), batches=a["batches"]) for key, a in by_artwork.items()
+            },
+        }
+
+    def write_report(self, report_dir: Path) -> Optional[Path]:
+        """보고서를 report_dir/usage_<시작 시각>.json으로 저장 (기록이 없으면 저장하지 않음)"""
+        report = self.report()
+        if not report["run"]["requests"]:
+            return None
+        report_dir.mkdir(parents=True, exist_ok=True)
+        path = report_dir / f"usage_{self.started_at.replace(':', '').replace('-', '')}.json"
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+    def _with_cost(self, usage: Dict[str, int]) -> Dict:
+        cost = self.cost(usage)
+        return dict(usage, cost=cost) if cost is not None else dict(usage)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+실행 전체 작품 작업 색인 (single-flight)
+- 같은 작품이 여러 카탈로그 파일(예: sample.json과 날짜별 내보내기)에 있어도 한 번만 생성
+- 원본 id 또는 정규화한 작가명/작품명이 같으면 같은 작품으로 보고, 처리 중인 작업에 합류시켜 결과를 공유
+- 같은 작품 키로 지문이 바뀐 항목(처리 중 수정)은 앞 작업이 끝난 뒤 다시 처리
+  (여러 파일에 같은 키가 다른 내용으로 있는 경우는 AX4Processor.scan_catalog_versions가 대표 버전 하나만 남김)
+- id가 서로 다른데 이름만 같은 작품은 별개 작품으로 보되, 같은 출력 파일에 동시에 쓰지 않도록 앞 작업이 끝난 뒤 처리
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.records import ArtworkRecord
+
+# claim 결과
+CLAIM_LEADER = "leader"       # 새 작업 - 호출자가 처리
+CLAIM_FOLLOWER = "follower"   # 같은 작품이 처리 중 - 끝나면 결과 공유
+CLAIM_DONE = "done"           # 이번 실행에서 이미 완료 - 결과 바로 공유
+CLAIM_DEFERRED = "deferred"   # 수정 전 버전 또는 같은 이름의 다른 작품이 처리 중 - 끝난 뒤 다시 투입
+
+_PLACEHOLDER_NAMES = {"", "unknown", "n/a"}
+_NAME_NOISE = re.compile(r"[\W_]+")
+
+
+def normalize_name(value: Any) -> str:
+    """이름 비교용 정규화 (NFKC, 대소문자/공백/문장부호 차이 무시)"""
+    text = unicodedata.normalize("NFKC", str(value or "")).casefold()
+    return " ".join(_NAME_NOISE.sub(" ", text).split())
+
+
+def work_identity(artwork: ArtworkRecord) -> Tuple[Optional[str], Optional[str]]:
+    """작품 → (원본 id, 정규화한 '작가|작품명') - 없거나 자리표시 값이면 None"""
+    item_id = str(artwork.item_id).strip() if artwork.item_id is not None else ""
+    artist = normalize_name(artwork.artist)
+    title = normalize_name(artwork.title)
+    name_key = f"{artist}|{title}" if artist not in _PLACEHOLDER_NAMES and title not in _PLACEHOLDER_NAMES else None
+    return item_id or None, name_key
+
+
+class WorkEntry:
+    """작품 작업 1건 (대표 요청 + 합류한 중복 요청)"""
+
+    __slots__ = ("key", "item_id", "name_key", "fingerprint", "output_filename",
+                 "followers", "deferred", "done")
+
+    def __init__(self, key: str, item_id: Optional[str], name_key: Optional[str],
+                 fingerprint: Optional[str], output_filename: str):
+        self.key = key
+        self.item_id = item_id
+        self.name_key = name_key
+        self.fingerprint = fingerprint
+        self.output_filename = output_filename
+        self.followers: List[Tuple[str, ArtworkRecord]] = []   # (작품 키, 작품) - 결과 공유 대상
+        self.deferred: Dict[str, Any] = {}   # 작품 키 → 끝난 뒤 다시 투입할 항목 (키별 최신 버전만)
+        self.done = False
+
+
+class WorkIndex:
+    """원본 id / 정규화한 작가·작품명 → 처리 중이거나 이번 실행에서 완료된 작업 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id: Dict[str, WorkEntry] = {}
+        self._by_name: Dict[str, WorkEntry] = {}
+        self._leaders: Dict[str, WorkEntry] = {}   # 처리 중인 대표 작품 키 → 작업
+
+    def claim(self, artwork_key: str, artwork: ArtworkRecord, output_filename: str,
+              payload: Any = None) -> Tuple[str, WorkEntry]:
+        """
+        작품 처리 요청 등록
+
+        Args:
+            payload: CLAIM_DEFERRED일 때 보관했다가 complete()에서 돌려줄 항목
+
+        Returns:
+            (CLAIM_* 결과, 대상 작업)
+        """
+        item_id, name_key = work_identity(artwork)
+        with self._lock:
+            entry = self._by_id.get(item_id) if item_id else None
+            same_work = entry is not None
+            if entry is None and name_key:
+                entry = self._by_name.get(name_key)
+                # 이름은 같아도 id가 서로 다르면 다른 작품 (같은 출력 파일만 공유)
+                same_work = entry is not None and not (item_id and entry.item_id and item_id != entry.item_id)
+
+            # 같은 키의 지문 변경은 입력 수정, 다른 키(다른 카탈로그 항목)는 표기만 다른 중복으로 봄
+            shared = same_work and (artwork_key != entry.key or entry.fingerprint == artwork.fingerprint)
+            if entry is not None and not entry.done:
+                if shared:
+                    if artwork_key != entry.key and all(key != artwork_key for key, _ in entry.followers):
+                        entry.followers.append((artwork_key, artwork))
+                    return CLAIM_FOLLOWER, entry
+                entry.deferred[artwork_key] = payload
+                return CLAIM_DEFERRED, entry
+
+            if shared:
+                return CLAIM_DONE, entry
+
+            entry = WorkEntry(artwork_key, item_id, name_key, artwork.fingerprint, output_filename)
+            if item_id:
+                self._by_id[item_id] = entry
+            if name_key:
+                self._by_name[name_key] = entry
+            self._leaders[artwork_key] = entry
+            return CLAIM_LEADER, entry
+
+    def complete(self, artwork_key: str, success: bool) -> Tuple[List[Tuple[str, ArtworkRecord]], List[Any]]:
+        """
+        대표 작업 종료 - 성공한 작업은 이번 실행의 이후 중복 요청과 결과를 공유하고, 실패하면 색인에서 제거
+
+        Returns:
+            (결과를 공유할 중복 요청, 다시 투입할 보류 항목)
+        """
+        with self._lock:
+            entry = self._leaders.pop(artwork_key, None)
+            if entry is None:
+                return [], []
+            if success:
+                entry.done = True
+            else:
+                self._forget(entry)
+            followers, entry.followers = entry.followers, []
+            deferred, entry.deferred = list(entry.deferred.values()), {}
+        return followers, deferred
+
+    def mark_done(self, artwork_key: str, artwork: ArtworkRecord, output_filename: str) -> None:
+        """이미 완료된 작품(입력 변경 없음) 등록 - 이번 실행의 중복 요청이 그 결과를 공유"""
+        item_id, name_key = work_identity(artwork)
+        entry = WorkEntry(artwork_key, item_id, name_key, artwork.fingerprint, output_filename)
+        entry.done = True
+        with self._lock:
+            # 처리 중인 작업이 차지한 자리는 덮어쓰지 않음
+            if item_id and getattr(self._by_id.get(item_id), "done", True):
+                self._by_id[item_id] = entry
+            if name_key and getattr(self._by_name.get(name_key), "done", True):
+                self._by_name[name_key] = entry
+
+    def abandon(self, artwork_key: str) -> None:
+        """시작하지 않은 대표 작업 등록 취소 (합류한 요청이 없을 때만 호출)"""
+        with self._lock:
+            entry = self._leaders.pop(artwork_key, None)
+            if entry is not None:
+                self._forget(entry)
+
+    def in_flight(self) -> int:
+        """처리 중인 대표 작업 수"""
+        with self._lock:
+            return len(self._leaders)
+
+    def _forget(self, entry: WorkEntry) -> None:
+        if entry.item_id and self._by_id.get(entry.item_id) is entry:
+            del self._by_id[entry.item_id]
+        if entry.name_key and self._by_name.get(entry.name_key) is entry:
+            del self._by_name[entry.name_key]